@@ -0,0 +1,65 @@
+import argparse
+import time
+
+import src.object.environment as environment
+from src.evaluator.evaluator import evaluate
+from src.lexer.lexer import Lexer
+from src.object.environment import Environment, new_environment
+from src.parser.parser import Parser
+
+SOURCE = """
+let sq = fn(x) { x * x };
+let add = fn(a, b) { a + b };
+let total = 0;
+let i = 0;
+while (i < %d) {
+  total = add(total, sq(i));
+  i = i + 1;
+}
+total;
+"""
+CALLS_PER_ITERATION = 2
+
+
+def run(source: str, pool_size: int) -> tuple[float, int]:
+    environment.FRAME_POOL_SIZE = pool_size
+    environment.frame_pool.clear()
+
+    start = time.perf_counter()
+    evaluate(Parser(Lexer(source)).parse_program(), new_environment())
+    elapsed = time.perf_counter() - start
+
+    # second run just to count the frames built; wrapping the constructor slows it down
+    created = 0
+    init = Environment.__init__
+
+    def counting_init(self, outer=None):
+        nonlocal created
+        created += 1
+        init(self, outer)
+
+    environment.frame_pool.clear()
+    Environment.__init__ = counting_init  # type: ignore
+    try:
+        evaluate(Parser(Lexer(source)).parse_program(), new_environment())
+    finally:
+        Environment.__init__ = init  # type: ignore
+    return elapsed, created
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-call environment allocation with and without frame pooling")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    source = SOURCE % args.iterations
+    calls = args.iterations * CALLS_PER_ITERATION
+    default_size = environment.FRAME_POOL_SIZE
+    for name, size in (("fresh", 0), ("pooled", default_size)):
+        elapsed, created = run(source, size)
+        print(f"{name:<7} {elapsed:7.3f}s  environments {created:8d}  per call {created / calls:.3f}")
+    environment.FRAME_POOL_SIZE = default_size
+
+
+if __name__ == "__main__":
+    main()
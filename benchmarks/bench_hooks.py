@@ -0,0 +1,65 @@
+import argparse
+import statistics
+import time
+
+from src.ast.ast import Node, Program
+from src.evaluator import evaluator, hooks
+from src.evaluator.hooks import Hooks
+from src.lexer.lexer import Lexer
+from src.object.environment import new_environment
+from src.object.object import Object
+from src.parser.parser import Parser
+
+SOURCE = """
+let sq = fn(x) { x * x };
+let total = 0;
+let i = 0;
+while (i < %d) {
+  total = total + sq(i);
+  i = i + 1;
+}
+total;
+"""
+
+
+class NoOpNodeHook(Hooks):
+    def on_node(self, node: Node, result: Object):
+        pass
+
+
+def timed(program: Program, repeats: int) -> list[float]:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        evaluator.evaluate(program, new_environment())
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluation time with hooks never used, unregistered and active")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--repeats", type=int, default=7)
+    args = parser.parse_args()
+
+    program = Parser(Lexer(SOURCE % args.iterations)).parse_program()
+    # runs alternate so drift in machine load hits every variant alike
+    results: dict[str, list[float]] = {"never registered": [], "unregistered": [], "no-op on_node": []}
+    hook = NoOpNodeHook()
+    for _ in range(args.repeats):
+        results["never registered"] += timed(program, 1)
+        hooks.register(hook)
+        results["no-op on_node"] += timed(program, 1)
+        hooks.unregister(hook)
+        results["unregistered"] += timed(program, 1)
+
+    baseline = min(results["never registered"])
+    spread = statistics.stdev(results["never registered"]) / statistics.mean(results["never registered"])
+    print(f"run-to-run spread of the baseline: {spread:.1%}")
+    for name, times in results.items():
+        best = min(times)
+        print(f"{name:<17} best {best:7.3f}s  median {statistics.median(times):7.3f}s  {best / baseline:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import time
+
+from src.ast.ast import Program
+from src.evaluator.evaluator import evaluate
+from src.lexer.lexer import Lexer
+from src.object.environment import new_environment
+from src.optimizer.inliner import INLINE_MAX_SIZE, inline_functions
+from src.parser.parser import Parser
+
+SOURCE = """
+let add = fn(a, b) { a + b };
+let sq = fn(a) { a * a };
+let clamp = fn(a, hi) { if (a > hi) { hi } else { a } };
+let step = fn(acc, i) { clamp(add(acc, sq(i)), 1000000) };
+let run = fn(n) {
+  let acc = 0;
+  let i = 0;
+  while (i < n) {
+    acc = step(acc, i);
+    i = add(i, 1);
+  }
+  acc
+};
+run(%d);
+"""
+
+
+def parse(source: str) -> Program:
+    return Parser(Lexer(source)).parse_program()
+
+
+def timed(program: Program) -> float:
+    start = time.perf_counter()
+    evaluate(program, new_environment())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Helper-heavy loop with and without inlining")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--max-size", type=int, default=INLINE_MAX_SIZE)
+    args = parser.parse_args()
+
+    source = SOURCE % args.iterations
+    baseline = timed(parse(source))
+
+    program = parse(source)
+    report = inline_functions(program, max_size=args.max_size)
+    inlined = timed(program)
+
+    for line in report:
+        print(line)
+    print(f"baseline {baseline:.3f}s  inlined {inlined:.3f}s  speedup {baseline / inlined:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import sys
+import time
+import tracemalloc
+
+import src.object.object as objects
+from src.evaluator.evaluator import evaluate
+from src.lexer.lexer import Lexer
+from src.object.environment import new_environment
+from src.parser.parser import Parser
+
+SOURCE = """
+let xs = collect(range(%d));
+let ys = scale(xs, 3);
+let total = sum(add(xs, ys));
+dot(xs, ys) + total + argmax(ys);
+"""
+
+
+def run(source: str, threshold: int):
+    objects.INT_ARRAY_THRESHOLD = threshold
+    start = time.perf_counter()
+    result = evaluate(Parser(Lexer(source)).parse_program(), new_environment())
+    elapsed = time.perf_counter() - start
+
+    # measured in a second run as tracing slows everything down
+    tracemalloc.start()
+    evaluate(Parser(Lexer(source)).parse_program(), new_environment())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result.inspect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Integer array builtins on compact and boxed storage")
+    parser.add_argument("--size", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    source = SOURCE % args.size
+    default_threshold = objects.INT_ARRAY_THRESHOLD
+    for name, threshold in (("boxed", sys.maxsize), ("compact", default_threshold)):
+        elapsed, peak, result = run(source, threshold)
+        per_element = peak / args.size
+        print(f"{name:<8} {elapsed:7.3f}s  peak {peak / 2**20:8.1f} MiB  {per_element:6.1f} B/element  = {result}")
+    objects.INT_ARRAY_THRESHOLD = default_threshold
+
+
+if __name__ == "__main__":
+    main()
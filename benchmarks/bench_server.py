@@ -0,0 +1,94 @@
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.evaluator.parallel import default_workers
+from src.server.client import Client
+from src.server.server import Server
+
+LIBRARY = """
+let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+let total = fn(xs) { reduce(xs, 0, fn(acc, x) { acc + x }) };
+"""
+
+SCRIPT = LIBRARY + "total(map(collect(range(0, 20)), fn(x) { fib(x / 4) }))"
+
+
+def percentile(times: list[float], p: int) -> float:
+    return statistics.quantiles(times, n=100, method="inclusive")[p - 1] if len(times) > 1 else times[0]
+
+
+def report(name: str, times: list[float], elapsed: float):
+    print(
+        f"{name:<22} {len(times) / elapsed:8.1f} req/s  p50 {percentile(times, 50) * 1000:7.2f}ms  "
+        f"p95 {percentile(times, 95) * 1000:7.2f}ms  p99 {percentile(times, 99) * 1000:7.2f}ms"
+    )
+
+
+def process_per_job(jobs: int) -> tuple[list[float], float]:
+    # the baseline: a fresh interpreter process per script, paying imports and parsing every time
+    times = []
+    start = time.perf_counter()
+    for _ in range(jobs):
+        job_start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "src.main", "run", "-"], input=SCRIPT, text=True, check=True)
+        times.append(time.perf_counter() - job_start)
+    return times, time.perf_counter() - start
+
+
+async def load(client: Client, requests: int, kind: str, times: list[float]):
+    for i in range(requests):
+        start = time.perf_counter()
+        if kind == "eval":
+            reply = await client.eval(SCRIPT)
+        else:
+            reply = await client.call(LIBRARY, "fib", [5 + i % 5])
+        times.append(time.perf_counter() - start)
+        assert reply["ok"], reply
+
+
+async def served(path: str, kind: str, connections: int, requests: int) -> tuple[list[float], float]:
+    clients = [await Client.connect_unix(path) for _ in range(connections)]
+    times: list[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(load(client, requests // connections, kind, times) for client in clients))
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        await client.close()
+    return times, elapsed
+
+
+async def run_server(args: argparse.Namespace):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "monkey.sock")
+        server = Server(args.workers)
+        await server.start_unix(path)
+        try:
+            for kind in ("eval", "call"):
+                times, elapsed = await served(path, kind, args.connections, args.requests)
+                report(f"server {kind}", times, elapsed)
+            print(f"server stats: {server.stats.snapshot()}")
+        finally:
+            await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and latency of the evaluation server under load")
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--connections", type=int, default=8, help="concurrent clients, each sending in turn")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--baseline-jobs", type=int, default=20, help="scripts run as one process each")
+    args = parser.parse_args()
+
+    times, elapsed = process_per_job(args.baseline_jobs)
+    report("process per job", times, elapsed)
+    asyncio.run(run_server(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import time
+import tracemalloc
+from typing import Callable
+
+from src.evaluator.evaluator import evaluate
+from src.lexer.lexer import Lexer
+from src.object.environment import new_environment
+from src.object.object import String
+from src.parser.parser import Parser
+
+
+def flat_concat(left: String, right: String) -> String:
+    return String(left.value + right.value)
+
+
+def build(concat: Callable[[String, String], String], total_bytes: int, piece_bytes: int) -> String:
+    piece = String("x" * piece_bytes)
+    s = String("")
+    for _ in range(total_bytes // piece_bytes):
+        s = concat(s, piece)
+    return s
+
+
+def measure(name: str, fn: Callable[[], String]):
+    tracemalloc.start()
+    start = time.perf_counter()
+    s = fn()
+    built = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    length = len(s.value)
+    flattened = time.perf_counter() - start
+    print(f"{name:<8} build {built:8.3f}s  flatten {flattened:6.3f}s  peak {peak / 2**20:8.1f} MiB  len {length}")
+
+
+def run_monkey(total_bytes: int, piece_bytes: int):
+    source = f"""
+let piece = "{"x" * piece_bytes}";
+let s = "";
+let i = 0;
+while (i < {total_bytes // piece_bytes}) {{
+    s = s + piece;
+    i = i + 1;
+}};
+len(s);
+"""
+    program = Parser(Lexer(source)).parse_program()
+    start = time.perf_counter()
+    result = evaluate(program, new_environment())
+    print(f"monkey   build {time.perf_counter() - start:8.3f}s  len {result.inspect()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a large string piece by piece")
+    parser.add_argument("--total-bytes", type=int, default=10 * 2**20)
+    parser.add_argument("--piece-bytes", type=int, default=100)
+    parser.add_argument("--skip-flat", action="store_true", help="skip the quadratic flat baseline")
+    args = parser.parse_args()
+
+    measure("rope", lambda: build(String.concat, args.total_bytes, args.piece_bytes))
+    if not args.skip_flat:
+        measure("flat", lambda: build(flat_concat, args.total_bytes, args.piece_bytes))
+    run_monkey(args.total_bytes, args.piece_bytes)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from src.tokens.tokens import Token
 
+if TYPE_CHECKING:
+    from src.object.object import Shape
+    from src.optimizer.free_variables import ScopeInfo
+
 
 class Node(ABC):
     @abstractmethod
@@ -73,6 +77,21 @@ class IntegerLiteral(Expression):
         return str(self.value)
 
 
+class FloatLiteral(Expression):
+    def __init__(self, token: Token, value: float):
+        self.token = token
+        self.value = value
+
+    def expression_node(self):
+        pass
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+
 class PrefixExpression(Expression):
     def __init__(self, token: Token, operator: str, right: Expression):
         self.token = token
@@ -95,6 +114,8 @@ class InfixExpression(Expression):
         self.left = left
         self.operator = operator
         self.right = right
+        # set by type inference when both operands are proven to be integers
+        self.int_operands = False
 
     def expression_node(self):
         pass
@@ -152,11 +173,48 @@ class IfExpression(Expression):
         return "".join(out)
 
 
+class WhileExpression(Expression):
+    def __init__(self, token: Token, condition: Expression, body: "BlockStatement"):
+        self.token = token
+        self.condition = condition
+        self.body = body
+
+    def expression_node(self):
+        pass
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    def __str__(self) -> str:
+        return f"while{str(self.condition)} {str(self.body)}"
+
+
+class ForExpression(Expression):
+    def __init__(self, token: Token, variable: "Identifier", iterable: Expression, body: "BlockStatement"):
+        self.token = token
+        self.variable = variable
+        self.iterable = iterable
+        self.body = body
+
+    def expression_node(self):
+        pass
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    def __str__(self) -> str:
+        return f"for ({str(self.variable)} in {str(self.iterable)}) {str(self.body)}"
+
+
 class FunctionLiteral(Expression):
     def __init__(self, token: Token, parameters: list[Identifier], body: "BlockStatement"):
         self.token = token
         self.parameters = parameters
         self.body = body
+        # the name of the let binding the literal directly, if any; used to label the function in profiles
+        self.name = ""
+        # names the closure may need from its defining scope, filled in on first evaluation
+        self.free_names: frozenset[str] | None = None
 
     def expression_node(self):
         pass
@@ -222,6 +280,9 @@ class IndexExpression(Expression):
         self.token = token
         self.left = left
         self.index = index
+        # inline cache filled by the evaluator for constant string indices: last shape seen and its slot
+        self.cached_shape: Optional["Shape"] = None
+        self.cached_slot = 0
 
     def expression_node(self):
         pass
@@ -237,6 +298,9 @@ class HashLiteral(Expression):
     def __init__(self, token: Token, pairs: dict[Expression, Expression]):
         self.token = token
         self.pairs = pairs
+        # set by the evaluator on first use when every key is a distinct constant string
+        self.shape: Optional["Shape"] = None
+        self.shape_checked = False
 
     def expression_node(self):
         pass
@@ -272,6 +336,22 @@ class LetStatement(Statement):
         return "".join(out)
 
 
+class AssignStatement(Statement):
+    def __init__(self, token: Token, name: Identifier, value: Expression):
+        self.token = token
+        self.name = name
+        self.value = value
+
+    def statement_node(self):
+        pass
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    def __str__(self) -> str:
+        return f"{str(self.name)} = {str(self.value)};"
+
+
 class ReturnStatement(Statement):
     def __init__(self, token: Token, return_value: Expression):
         self.token = token
@@ -313,6 +393,8 @@ class BlockStatement(Statement):
     def __init__(self, token: Token):
         self.token = token
         self.statements: list[Statement] = []
+        # for function bodies: which names a call binds, and which of those are bound once and never reassigned
+        self.scope_info: Optional["ScopeInfo"] = None
 
     def statement_node(self):
         pass
@@ -0,0 +1,144 @@
+import sys
+import threading
+import time
+from typing import Callable
+
+from src.ast.ast import Node
+from src.evaluator import evaluator, hooks
+from src.evaluator.hooks import Hooks
+from src.object.environment import Environment
+from src.object.object import Array, BudgetError, Function, Hash, Object, ObjectType, String
+
+# Steps between two reads of the clock; a deadline can be overrun by this many steps. The clock is also read on every
+# call and return, so time spent in builtins is noticed as soon as they return.
+DEADLINE_CHECK_INTERVAL = 1024
+
+
+class Budget:
+    # Limits for one evaluation, None meaning unlimited. A step is one evaluated AST node, depth counts nested calls
+    # of Monkey functions, and size is the number of elements of an array or hash or characters of a string.
+    def __init__(
+        self,
+        max_steps: int | None = None,
+        timeout: float | None = None,
+        max_depth: int | None = None,
+        max_size: int | None = None,
+    ):
+        self.max_steps = max_steps
+        self.timeout = timeout
+        self.max_depth = max_depth
+        self.max_size = max_size
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+def value_size(obj: Object) -> int:
+    if isinstance(obj, Array):
+        return obj.length()
+    elif isinstance(obj, String):
+        return obj.length
+    elif isinstance(obj, Hash):
+        return len(obj.values) if obj.shape is not None else len(obj.pairs)
+    return 0
+
+
+# Enforces a Budget through evaluation hooks, so evaluations without one run the plain evaluator. Going over a limit
+# raises BudgetExceeded, which unwinds the whole evaluation. Sizes are checked as values are made, so a single
+# builtin call can still build one oversized value before it is rejected, unless the builtin checks the size it is
+# about to build with check_size first. Hooks are seen by every thread, so a meter only counts the evaluation on
+# the thread that made it; others run unlimited.
+class BudgetMeter(Hooks):
+    def __init__(self, budget: Budget):
+        self.thread = threading.get_ident()
+        self.budget = budget
+        self.max_steps = budget.max_steps if budget.max_steps is not None else sys.maxsize
+        self.max_depth = budget.max_depth if budget.max_depth is not None else sys.maxsize
+        self.max_size = budget.max_size if budget.max_size is not None else sys.maxsize
+        self.deadline = time.monotonic() + budget.timeout if budget.timeout is not None else None
+        self.steps = 0
+        self.depth = 0
+
+    def on_node(self, node: Node, result: Object):
+        if threading.get_ident() != self.thread:
+            return
+        self.steps += 1
+        if self.steps > self.max_steps:
+            raise BudgetExceeded(f"more than {self.max_steps} steps")
+        if self.steps % DEADLINE_CHECK_INTERVAL == 0:
+            self.check_deadline()
+
+    def on_call(self, fn: Object, args: list[Object]):
+        if threading.get_ident() != self.thread:
+            return
+        self.check_deadline()
+        if isinstance(fn, Function):
+            self.depth += 1
+            if self.depth > self.max_depth:
+                raise BudgetExceeded(f"calls nested deeper than {self.max_depth}")
+
+    def on_return(self, fn: Object, result: Object):
+        if threading.get_ident() != self.thread:
+            return
+        if isinstance(fn, Function):
+            self.depth -= 1
+        self.check_deadline()
+
+    def on_alloc(self, obj: Object, node: Node | None):
+        if threading.get_ident() != self.thread:
+            return
+        self.check_size(obj.type(), value_size(obj))
+
+    def charge(self, steps: int):
+        # counts steps taken outside this process, by pmap's workers
+        self.steps += steps
+        if self.steps > self.max_steps:
+            raise BudgetExceeded(f"more than {self.max_steps} steps")
+        self.check_deadline()
+
+    def check_deadline(self):
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise BudgetExceeded(f"ran longer than {self.budget.timeout}s")
+
+    def check_size(self, object_type: ObjectType, size: int):
+        if size > self.max_size:
+            raise BudgetExceeded(f"{object_type.value} of size {size} is over the limit of {self.max_size}")
+
+
+def running_meter() -> BudgetMeter | None:
+    # the newest meter of the calling thread
+    thread = threading.get_ident()
+    for h in reversed(hooks.registered):
+        if isinstance(h, BudgetMeter) and h.thread == thread:
+            return h
+    return None
+
+
+def check_size(object_type: ObjectType, size: int):
+    # lets a builtin refuse a value over the size limit of a running budget before it builds the value
+    meter = running_meter()
+    if meter is not None:
+        meter.check_size(object_type, size)
+
+
+def run_within(budget: Budget, run: Callable[[], Object]) -> Object:
+    # calls run, which evaluates something, and returns a BudgetError instead if that goes over budget
+    meter = BudgetMeter(budget)
+    hooks.register(meter)
+    try:
+        result = run()
+        meter.check_deadline()
+        return result
+    except BudgetExceeded as e:
+        return BudgetError(f"budget exceeded: {e}")
+    except RecursionError:
+        return BudgetError("budget exceeded: calls nested deeper than the interpreter's recursion limit")
+    finally:
+        hooks.unregister(meter)
+
+
+def evaluate_with_budget(node: Node, env: Environment, budget: Budget) -> Object:
+    # like evaluate, but returns a BudgetError once the evaluation goes over budget; bindings made before that
+    # stay in env
+    return run_within(budget, lambda: evaluator.evaluate(node, env))
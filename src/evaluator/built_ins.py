@@ -1,19 +1,89 @@
-from src.object.object import Array, BuiltIn, Error, Integer, Null, Object, ObjectType, String
+import functools
+import itertools
+import operator
+import re
+from array import array
+from typing import Callable, Iterable, Iterator
+
+from src.object.environment import Environment
+from src.object.object import (
+    FALSE,
+    NULL,
+    TRUE,
+    Array,
+    Boolean,
+    BuiltIn,
+    BuiltinFunction,
+    Error,
+    Float,
+    Function,
+    Hash,
+    Hashable,
+    HashKey,
+    Integer,
+    Memoized,
+    Null,
+    Object,
+    ObjectType,
+    Range,
+    Sequence,
+    String,
+    get_shape,
+)
 
 
 def new_error(format_string, *args) -> Error:
     return Error(format_string % args)
 
 
+# Raised when a Monkey callback fails part way through a builtin's loop; apply_function turns it back into
+# the Error so builtins don't have to check every callback result.
+class CallbackError(Exception):
+    def __init__(self, error: Error):
+        self.error = error
+
+
+def iter_elements(obj: Object) -> Iterable[Object] | None:
+    if isinstance(obj, Array):
+        return obj.iterate()
+    elif isinstance(obj, Range):
+        return (Integer(i) for i in obj.values)
+    elif isinstance(obj, Sequence):
+        return obj.iterate()
+    return None
+
+
+def is_callable(obj: Object) -> bool:
+    return isinstance(obj, (Function, BuiltIn))
+
+
+def call(fn: Object, *args: Object) -> Object:
+    # imported here as the evaluator imports this module
+    from src.evaluator.evaluator import apply_function
+
+    result: Object = apply_function(fn, list(args))
+    if isinstance(result, Error):
+        raise CallbackError(result)
+    return result
+
+
 def builtin_len(*args: Object) -> Error | Integer:
     if len(args) != 1:
         return new_error("wrong number of arguments. got=%d, want=1", len(args))
 
     arg: Object = args[0]
     if isinstance(arg, Array):
-        return Integer(len(arg.elements))
+        return Integer(arg.length())
+    elif isinstance(arg, Range):
+        return Integer(len(arg.values))
+    elif isinstance(arg, Sequence):
+        # O(n): walks the whole sequence, running every stage of the pipeline
+        count = 0
+        for _ in arg.iterate():
+            count += 1
+        return Integer(count)
     elif isinstance(arg, String):
-        return Integer(len(arg.value))
+        return Integer(arg.length)
     else:
         return new_error("argument to `len` not supported, got %s", arg.type().value)
 
@@ -22,7 +92,7 @@ def builtin_puts(*args: Object) -> Null:
     for arg in args:
         print(arg.inspect())
 
-    return Null()
+    return NULL
 
 
 def builtin_first(*args: Object) -> Error | Object | Null:
@@ -30,15 +100,20 @@ def builtin_first(*args: Object) -> Error | Object | Null:
         return new_error("wrong number of arguments. got=%d, want=1", len(args))
 
     arg: Object = args[0]
+    if isinstance(arg, Sequence):
+        # O(1): pulls a single element through the pipeline
+        return next(arg.iterate(), NULL)
+    if isinstance(arg, Range):
+        return Integer(arg.values[0]) if len(arg.values) > 0 else NULL
     if arg.type() != ObjectType.ARRAY:
         return new_error("argument to `first` must be ARRAY, got %s", arg.type().value)
 
     arr: Object = arg
     assert isinstance(arr, Array)
-    if len(arr.elements) > 0:
-        return arr.elements[0]
+    if arr.length() > 0:
+        return arr.get(0)
 
-    return Null()
+    return NULL
 
 
 def builtin_last(*args: Object) -> Error | Object | Null:
@@ -46,34 +121,40 @@ def builtin_last(*args: Object) -> Error | Object | Null:
         return new_error("wrong number of arguments. got=%d, want=1", len(args))
 
     arg: Object = args[0]
+    if isinstance(arg, Range):
+        return Integer(arg.values[-1]) if len(arg.values) > 0 else NULL
     if arg.type() != ObjectType.ARRAY:
         return new_error("argument to `last` must be ARRAY, got %s", arg.type().value)
 
     arr: Object = arg
     assert isinstance(arr, Array)
-    length = len(arr.elements)
+    length = arr.length()
     if length > 0:
-        return arr.elements[length - 1]
+        return arr.get(length - 1)
 
-    return Null()
+    return NULL
 
 
-def builtin_rest(*args: Object) -> Error | Array | Null:
+def builtin_rest(*args: Object) -> Error | Array | Range | Sequence | Null:
     if len(args) != 1:
         return new_error("wrong number of arguments. got=%d, want=1", len(args))
 
     arg: Object = args[0]
+    if isinstance(arg, Sequence):
+        # O(1): returns a lazy sequence; the skipped element is only computed when it is iterated
+        return drop_sequence(arg, 1)
+    if isinstance(arg, Range):
+        # O(1): the rest of a range is a range
+        return Range(arg.values[1:]) if len(arg.values) > 0 else NULL
     if arg.type() != ObjectType.ARRAY:
         return new_error("argument to `rest` must be ARRAY, got %s", arg.type().value)
 
     arr: Object = arg
     assert isinstance(arr, Array)
-    length = len(arr.elements)
-    if length > 0:
-        new_elements: list[Object] = arr.elements[1:]
-        return Array(new_elements)
+    if arr.length() > 0:
+        return arr.slice(1, None)
 
-    return Null()
+    return NULL
 
 
 def builtin_push(*args: Object) -> Error | Array:
@@ -86,8 +167,663 @@ def builtin_push(*args: Object) -> Error | Array:
 
     arr: Object = arg
     assert isinstance(arr, Array)
-    new_elements: list[Object] = arr.elements + [args[1]]
-    return Array(new_elements)
+    return arr.push(args[1])
+
+
+def builtin_map(*args: Object) -> Error | Array:
+    if len(args) != 2:
+        return new_error("wrong number of arguments. got=%d, want=2", len(args))
+
+    elements = iter_elements(args[0])
+    if elements is None:
+        return new_error("argument to `map` must be ARRAY, got %s", args[0].type().value)
+    fn: Object = args[1]
+    if not is_callable(fn):
+        return new_error("argument to `map` must be FUNCTION, got %s", fn.type().value)
+
+    return Array([call(fn, e) for e in elements])
+
+
+def builtin_pmap(*args: Object) -> Error | Object:
+    # imported here as parallel imports this module
+    from src.evaluator import parallel
+
+    if len(args) not in (2, 3):
+        return new_error("wrong number of arguments. got=%d, want=2 or 3", len(args))
+
+    elements = iter_elements(args[0])
+    if elements is None or isinstance(args[0], Sequence):
+        return new_error("argument to `pmap` must be ARRAY, got %s", args[0].type().value)
+    fn: Object = args[1]
+    if not is_callable(fn):
+        return new_error("argument to `pmap` must be FUNCTION, got %s", fn.type().value)
+    workers = parallel.default_workers()
+    if len(args) == 3:
+        count = args[2]
+        if not isinstance(count, Integer) or count.value < 1:
+            return new_error("worker count to `pmap` must be a positive INTEGER, got %s", count.inspect())
+        # more workers than CPUs would only compete for them
+        workers = min(count.value, workers)
+
+    if parallel.in_process:
+        return Array([call(fn, e) for e in elements])
+    return parallel.parallel_map(fn, list(elements), workers)
+
+
+def builtin_filter(*args: Object) -> Error | Array:
+    if len(args) != 2:
+        return new_error("wrong number of arguments. got=%d, want=2", len(args))
+
+    elements = iter_elements(args[0])
+    if elements is None:
+        return new_error("argument to `filter` must be ARRAY, got %s", args[0].type().value)
+    fn: Object = args[1]
+    if not is_callable(fn):
+        return new_error("argument to `filter` must be FUNCTION, got %s", fn.type().value)
+
+    return Array([e for e in elements if is_truthy(call(fn, e))])
+
+
+def builtin_reduce(*args: Object) -> Error | Object:
+    if len(args) != 3:
+        return new_error("wrong number of arguments. got=%d, want=3", len(args))
+
+    elements = iter_elements(args[0])
+    if elements is None:
+        return new_error("argument to `reduce` must be ARRAY, got %s", args[0].type().value)
+    fn: Object = args[2]
+    if not is_callable(fn):
+        return new_error("argument to `reduce` must be FUNCTION, got %s", fn.type().value)
+
+    acc: Object = args[1]
+    for e in elements:
+        acc = call(fn, acc, e)
+    return acc
+
+
+def builtin_range(*args: Object) -> Error | Range:
+    if len(args) < 1 or len(args) > 3:
+        return new_error("wrong number of arguments. got=%d, want=1..3", len(args))
+
+    for arg in args:
+        if not isinstance(arg, Integer):
+            return new_error("argument to `range` must be INTEGER, got %s", arg.type().value)
+    bounds: list[int] = [arg.value for arg in args]  # type: ignore
+    if len(bounds) == 3 and bounds[2] == 0:
+        return new_error("`range` step must not be zero")
+    return Range(range(*bounds))
+
+
+def builtin_sum(*args: Object) -> Error | Integer | Float:
+    if len(args) != 1:
+        return new_error("wrong number of arguments. got=%d, want=1", len(args))
+
+    arg: Object = args[0]
+    if isinstance(arg, Range):
+        r = arg.values
+        return Integer(len(r) * (r[0] + r[-1]) // 2 if len(r) > 0 else 0)
+    if isinstance(arg, Array) and arg.ints is not None:
+        return Integer(sum(arg.ints))
+    elements = iter_elements(arg)
+    if elements is None:
+        return new_error("argument to `sum` must be ARRAY, got %s", arg.type().value)
+
+    # added left to right like the + operator: exact while every element is an integer, a float once one isn't
+    total: int | float = 0
+    for e in elements:
+        if not isinstance(e, (Integer, Float)):
+            return new_error("elements of `sum` must be INTEGER or FLOAT, got %s", e.type().value)
+        try:
+            total += e.value
+        except OverflowError:
+            return new_error("integer too large to convert to FLOAT")
+    return Float(total) if isinstance(total, float) else Integer(total)
+
+
+def check_range_size(arg: Object):
+    # a range argument is made into an array of its length; a running budget can refuse that before it is built
+    if isinstance(arg, Range):
+        # imported here as budget imports the evaluator
+        from src.evaluator.budget import check_size
+
+        check_size(ObjectType.ARRAY, len(arg.values))
+
+
+def integer_values(name: str, arg: Object) -> "Error | array[int] | range | list[int]":
+    # the integers of an array or range; compact arrays and ranges are used as they are
+    if isinstance(arg, Array) and arg.ints is not None:
+        return arg.ints
+    elif isinstance(arg, Range):
+        return arg.values
+    elif not isinstance(arg, Array):
+        return new_error("argument to `%s` must be ARRAY, got %s", name, arg.type().value)
+    values: list[int] = []
+    for e in arg.iterate():
+        if not isinstance(e, Integer):
+            return new_error("elements of `%s` must be INTEGER, got %s", name, e.type().value)
+        values.append(e.value)
+    return values
+
+
+def int_array(values: Callable[[], Iterator[int]]) -> Array:
+    # bulk results go straight into a compact buffer; if one doesn't fit in 64 bits they are computed again boxed
+    try:
+        return Array.of_ints(array("q", values()))
+    except OverflowError:
+        return Array([Integer(v) for v in values()])
+
+
+def builtin_add(*args: Object) -> Error | Array:
+    if len(args) != 2:
+        return new_error("wrong number of arguments. got=%d, want=2", len(args))
+
+    left = integer_values("add", args[0])
+    if isinstance(left, Error):
+        return left
+    check_range_size(args[0])
+    if isinstance(args[1], Integer):
+        n: int = args[1].value
+        return int_array(lambda: map(n.__add__, left))  # type: ignore
+    right = integer_values("add", args[1])
+    if isinstance(right, Error):
+        return right
+    if len(left) != len(right):
+        return new_error("arguments to `add` must have the same length, got %d and %d", len(left), len(right))
+    return int_array(lambda: map(operator.add, left, right))  # type: ignore
+
+
+def builtin_scale(*args: Object) -> Error | Array:
+    if len(args) != 2:
+        return new_error("wrong number of arguments. got=%d, want=2", len(args))
+
+    values = integer_values("scale", args[0])
+    if isinstance(values, Error):
+        return values
+    check_range_size(args[0])
+    factor: Object = args[1]
+    if not isinstance(factor, Integer):
+        return new_error("argument to `scale` must be INTEGER, got %s", factor.type().value)
+    k: int = factor.value
+    return int_array(lambda: map(k.__mul__, values))  # type: ignore
+
+
+def builtin_dot(*args: Object) -> Error | Integer:
+    if len(args) != 2:
+        return new_error("wrong number of arguments. got=%d, want=2", len(args))
+
+    left = integer_values("dot", args[0])
+    if isinstance(left, Error):
+        return left
+    right = integer_values("dot", args[1])
+    if isinstance(right, Error):
+        return right
+    if len(left) != len(right):
+        return new_error("arguments to `dot` must have the same length, got %d and %d", len(left), len(right))
+    return Integer(sum(map(operator.mul, left, right)))
+
+
+def builtin_argmax(*args: Object) -> Error | Integer | Null:
+    if len(args) != 1:
+        return new_error("wrong number of arguments. got=%d, want=1", len(args))
+
+    values = integer_values("argmax", args[0])
+    if isinstance(values, Error):
+        return values
+    if len(values) == 0:
+        return NULL
+    # the first index of the largest value
+    return Integer(max(range(len(values)), key=values.__getitem__))
+
+
+def comparable_values(name: str, elements: Iterable[Object]) -> Error | list[int | float | str]:
+    values: list[int | float | str] = []
+    kind: ObjectType | None = None
+    for e in elements:
+        if not isinstance(e, (Integer, Float, String)):
+            return new_error("elements of `%s` must be INTEGER, FLOAT or STRING, got %s", name, e.type().value)
+        # integers and floats compare with each other, exactly, as they do in the infix operators
+        if kind is not None and (kind == ObjectType.STRING) != isinstance(e, String):
+            return new_error("elements of `%s` must share a type, got %s and %s", name, kind.value, e.type().value)
+        kind = e.type()
+        values.append(e.value)
+    return values
+
+
+def builtin_min_max(name: str, pick: Callable[..., int]) -> BuiltinFunction:
+    def builtin(*args: Object) -> Error | Object | Null:
+        if len(args) != 1:
+            return new_error("wrong number of arguments. got=%d, want=1", len(args))
+
+        arg: Object = args[0]
+        if isinstance(arg, Range):
+            if len(arg.values) == 0:
+                return NULL
+            return Integer(pick(arg.values))
+        if not isinstance(arg, Array):
+            return new_error("argument to `%s` must be ARRAY, got %s", name, arg.type().value)
+        if arg.ints is not None:
+            return Integer(pick(arg.ints)) if len(arg.ints) > 0 else NULL
+
+        values = comparable_values(name, arg.iterate())
+        if isinstance(values, Error):
+            return values
+        if len(values) == 0:
+            return NULL
+        return arg.get(pick(range(len(values)), key=values.__getitem__))
+
+    return builtin
+
+
+def builtin_sort(*args: Object) -> Error | Array:
+    if len(args) != 1 and len(args) != 2:
+        return new_error("wrong number of arguments. got=%d, want=1 or 2", len(args))
+
+    elements = iter_elements(args[0])
+    if elements is None:
+        return new_error("argument to `sort` must be ARRAY, got %s", args[0].type().value)
+    arg: Object = args[0]
+    if len(args) == 1 and isinstance(arg, Array) and arg.ints is not None:
+        return Array.of_ints(array("q", sorted(arg.ints)))
+    check_range_size(arg)
+    items: list[Object] = list(elements)
+
+    if len(args) == 1:
+        values = comparable_values("sort", items)
+        if isinstance(values, Error):
+            return values
+        order = sorted(range(len(items)), key=values.__getitem__)
+        return Array([items[i] for i in order])
+
+    fn: Object = args[1]
+    if not is_callable(fn):
+        return new_error("argument to `sort` must be FUNCTION, got %s", fn.type().value)
+
+    def compare(a: Object, b: Object) -> int:
+        # list.sort only asks "a < b", so a boolean comparator is enough
+        result: Object = call(fn, a, b)
+        if isinstance(result, Integer):
+            return result.value
+        return -1 if is_truthy(result) else 1
+
+    return Array(sorted(items, key=functools.cmp_to_key(compare)))
+
+
+def builtin_reverse(*args: Object) -> Error | Array | Range:
+    if len(args) != 1:
+        return new_error("wrong number of arguments. got=%d, want=1", len(args))
+
+    arg: Object = args[0]
+    if isinstance(arg, Range):
+        return Range(arg.values[::-1])
+    if not isinstance(arg, Array):
+        return new_error("argument to `reverse` must be ARRAY, got %s", arg.type().value)
+    return arg.slice(None, None, -1)
+
+
+def builtin_slice(*args: Object) -> Error | Array | Range:
+    if len(args) != 2 and len(args) != 3:
+        return new_error("wrong number of arguments. got=%d, want=2 or 3", len(args))
+
+    arg: Object = args[0]
+    for bound in args[1:]:
+        if not isinstance(bound, Integer):
+            return new_error("argument to `slice` must be INTEGER, got %s", bound.type().value)
+    start: int = args[1].value  # type: ignore
+    end: int | None = args[2].value if len(args) == 3 else None  # type: ignore
+
+    if isinstance(arg, Range):
+        return Range(arg.values[start:end])
+    if not isinstance(arg, Array):
+        return new_error("argument to `slice` must be ARRAY, got %s", arg.type().value)
+    return arg.slice(start, end)
+
+
+def drop_sequence(seq: Object, n: int) -> Sequence:
+    return Sequence(lambda: itertools.islice(iter_elements(seq) or (), n, None))
+
+
+def builtin_lazy_map(*args: Object) -> Error | Sequence:
+    if len(args) != 2:
+        return new_error("wrong number of arguments. got=%d, want=2", len(args))
+
+    source: Object = args[0]
+    if iter_elements(source) is None:
+        return new_error("argument to `lazy_map` must be ARRAY or SEQUENCE, got %s", source.type().value)
+    fn: Object = args[1]
+    if not is_callable(fn):
+        return new_error("argument to `lazy_map` must be FUNCTION, got %s", fn.type().value)
+
+    def generate() -> Iterator[Object]:
+        for e in iter_elements(source) or ():
+            yield call(fn, e)
+
+    return Sequence(generate)
+
+
+def builtin_lazy_filter(*args: Object) -> Error | Sequence:
+    if len(args) != 2:
+        return new_error("wrong number of arguments. got=%d, want=2", len(args))
+
+    source: Object = args[0]
+    if iter_elements(source) is None:
+        return new_error("argument to `lazy_filter` must be ARRAY or SEQUENCE, got %s", source.type().value)
+    fn: Object = args[1]
+    if not is_callable(fn):
+        return new_error("argument to `lazy_filter` must be FUNCTION, got %s", fn.type().value)
+
+    def generate() -> Iterator[Object]:
+        for e in iter_elements(source) or ():
+            if is_truthy(call(fn, e)):
+                yield e
+
+    return Sequence(generate)
+
+
+def builtin_take(*args: Object) -> Error | Sequence:
+    if len(args) != 2:
+        return new_error("wrong number of arguments. got=%d, want=2", len(args))
+
+    source: Object = args[0]
+    if iter_elements(source) is None:
+        return new_error("argument to `take` must be ARRAY or SEQUENCE, got %s", source.type().value)
+    n: Object = args[1]
+    if not isinstance(n, Integer) or n.value < 0:
+        return new_error("argument to `take` must be a non-negative INTEGER, got %s", n.inspect())
+
+    count: int = n.value
+    return Sequence(lambda: itertools.islice(iter_elements(source) or (), count))
+
+
+def builtin_drop(*args: Object) -> Error | Sequence:
+    if len(args) != 2:
+        return new_error("wrong number of arguments. got=%d, want=2", len(args))
+
+    source: Object = args[0]
+    if iter_elements(source) is None:
+        return new_error("argument to `drop` must be ARRAY or SEQUENCE, got %s", source.type().value)
+    n: Object = args[1]
+    if not isinstance(n, Integer) or n.value < 0:
+        return new_error("argument to `drop` must be a non-negative INTEGER, got %s", n.inspect())
+
+    return drop_sequence(source, n.value)
+
+
+def builtin_collect(*args: Object) -> Error | Array:
+    if len(args) != 1:
+        return new_error("wrong number of arguments. got=%d, want=1", len(args))
+
+    if isinstance(args[0], Range):
+        check_range_size(args[0])
+        return Array.of_range(args[0].values)
+    elements = iter_elements(args[0])
+    if elements is None:
+        return new_error("argument to `collect` must be ARRAY or SEQUENCE, got %s", args[0].type().value)
+    return Array(list(elements))
+
+
+def builtin_lines(*args: Object) -> Error | Sequence:
+    if len(args) != 1:
+        return new_error("wrong number of arguments. got=%d, want=1", len(args))
+
+    path: Object = args[0]
+    if not isinstance(path, String):
+        return new_error("argument to `lines` must be STRING, got %s", path.type().value)
+    try:
+        open(path.value).close()
+    except OSError as e:
+        return new_error("could not open %s: %s", path.value, e.strerror)
+
+    def generate() -> Iterator[Object]:
+        with open(path.value) as f:
+            for line in f:
+                yield String(line.rstrip("\r\n"))
+
+    return Sequence(generate)
+
+
+WHITESPACE_RUN = re.compile(r"\S+")
+
+
+def clamp(idx: int, length: int) -> int:
+    if idx < 0:
+        idx += length
+    return min(max(idx, 0), length)
+
+
+def builtin_substr(*args: Object) -> Error | String:
+    if len(args) != 2 and len(args) != 3:
+        return new_error("wrong number of arguments. got=%d, want=2 or 3", len(args))
+
+    s: Object = args[0]
+    if not isinstance(s, String):
+        return new_error("argument to `substr` must be STRING, got %s", s.type().value)
+    for arg in args[1:]:
+        if not isinstance(arg, Integer):
+            return new_error("argument to `substr` must be INTEGER, got %s", arg.type().value)
+
+    start: int = clamp(args[1].value, s.length)  # type: ignore
+    end: int = s.length
+    if len(args) == 3:
+        end = min(start + max(args[2].value, 0), s.length)  # type: ignore
+    return s.substring(start, end)
+
+
+def builtin_split(*args: Object) -> Error | Array:
+    if len(args) != 1 and len(args) != 2:
+        return new_error("wrong number of arguments. got=%d, want=1 or 2", len(args))
+
+    s: Object = args[0]
+    if not isinstance(s, String):
+        return new_error("argument to `split` must be STRING, got %s", s.type().value)
+    source, start, end = s.span()
+
+    if len(args) == 1:
+        return Array([String.view(source, m.start(), m.end()) for m in WHITESPACE_RUN.finditer(source, start, end)])
+
+    sep: Object = args[1]
+    if not isinstance(sep, String):
+        return new_error("argument to `split` must be STRING, got %s", sep.type().value)
+    if sep.length == 0:
+        return new_error("`split` separator must not be empty")
+
+    sep_value: str = sep.value
+    pieces: list[Object] = []
+    pos = start
+    while True:
+        found = source.find(sep_value, pos, end)
+        if found == -1:
+            pieces.append(String.view(source, pos, end))
+            return Array(pieces)
+        pieces.append(String.view(source, pos, found))
+        pos = found + sep.length
+
+
+def builtin_join(*args: Object) -> Error | String:
+    if len(args) != 1 and len(args) != 2:
+        return new_error("wrong number of arguments. got=%d, want=1 or 2", len(args))
+
+    elements = iter_elements(args[0])
+    if elements is None:
+        return new_error("argument to `join` must be ARRAY, got %s", args[0].type().value)
+    sep: Object = args[1] if len(args) == 2 else String("")
+    if not isinstance(sep, String):
+        return new_error("argument to `join` must be STRING, got %s", sep.type().value)
+
+    values: list[str] = []
+    for e in elements:
+        if not isinstance(e, String):
+            return new_error("elements of `join` must be STRING, got %s", e.type().value)
+        values.append(e.value)
+    return String(sep.value.join(values))
+
+
+def builtin_find(*args: Object) -> Error | Integer:
+    if len(args) != 2:
+        return new_error("wrong number of arguments. got=%d, want=2", len(args))
+
+    s: Object = args[0]
+    sub: Object = args[1]
+    if not isinstance(s, String):
+        return new_error("argument to `find` must be STRING, got %s", s.type().value)
+    if not isinstance(sub, String):
+        return new_error("argument to `find` must be STRING, got %s", sub.type().value)
+
+    source, start, end = s.span()
+    found = source.find(sub.value, start, end)
+    return Integer(found - start if found != -1 else -1)
+
+
+def builtin_chars(*args: Object) -> Error | Array:
+    if len(args) != 1:
+        return new_error("wrong number of arguments. got=%d, want=1", len(args))
+
+    s: Object = args[0]
+    if not isinstance(s, String):
+        return new_error("argument to `chars` must be STRING, got %s", s.type().value)
+    source, start, end = s.span()
+    return Array([String(source[i]) for i in range(start, end)])
+
+
+def builtin_case(name: str, convert: Callable[[str], str]) -> BuiltinFunction:
+    def builtin(*args: Object) -> Error | String:
+        if len(args) != 1:
+            return new_error("wrong number of arguments. got=%d, want=1", len(args))
+
+        s: Object = args[0]
+        if not isinstance(s, String):
+            return new_error("argument to `%s` must be STRING, got %s", name, s.type().value)
+        return String(convert(s.value))
+
+    return builtin
+
+
+def builtin_trim(*args: Object) -> Error | String:
+    if len(args) != 1:
+        return new_error("wrong number of arguments. got=%d, want=1", len(args))
+
+    s: Object = args[0]
+    if not isinstance(s, String):
+        return new_error("argument to `trim` must be STRING, got %s", s.type().value)
+    source, start, end = s.span()
+    while start < end and source[start].isspace():
+        start += 1
+    while end > start and source[end - 1].isspace():
+        end -= 1
+    return String.view(source, start, end)
+
+
+def builtin_starts_with(*args: Object) -> Error | Boolean:
+    if len(args) != 2:
+        return new_error("wrong number of arguments. got=%d, want=2", len(args))
+
+    s: Object = args[0]
+    prefix: Object = args[1]
+    if not isinstance(s, String):
+        return new_error("argument to `starts_with` must be STRING, got %s", s.type().value)
+    if not isinstance(prefix, String):
+        return new_error("argument to `starts_with` must be STRING, got %s", prefix.type().value)
+
+    source, start, end = s.span()
+    return TRUE if source.startswith(prefix.value, start, end) else FALSE
+
+
+DEFAULT_MEMO_ENTRIES = 1024
+MEMO_STATS_SHAPE = get_shape(("hits", "misses", "evictions", "size"))
+
+
+def call_memoized(memo: Memoized, *args: Object) -> Object:
+    # imported here as the evaluator imports this module
+    from src.evaluator.evaluator import apply_function
+
+    key: tuple[HashKey, ...] | None = None
+    if all(isinstance(arg, Hashable) for arg in args):
+        key = tuple(arg.hash_key() for arg in args)  # type: ignore
+        cached = memo.cache.get(key)
+        if cached is not None:
+            memo.hits += 1
+            memo.cache.move_to_end(key)
+            return cached
+    memo.misses += 1
+
+    # through apply_function so hooks see the call: budgets count its depth and the profiler its time
+    result: Object = apply_function(memo.callee, list(args))
+
+    if key is not None and not isinstance(result, Error):
+        memo.cache[key] = result
+        if len(memo.cache) > memo.max_entries:
+            memo.cache.popitem(last=False)
+            memo.evictions += 1
+    return result
+
+
+def builtin_memoize(*args: Object) -> Error | Memoized:
+    if len(args) != 1 and len(args) != 2:
+        return new_error("wrong number of arguments. got=%d, want=1 or 2", len(args))
+
+    fn: Object = args[0]
+    if not isinstance(fn, Function):
+        return new_error("argument to `memoize` must be FUNCTION, got %s", fn.type().value)
+    max_entries = DEFAULT_MEMO_ENTRIES
+    if len(args) == 2:
+        limit: Object = args[1]
+        if not isinstance(limit, Integer) or limit.value < 1:
+            return new_error("argument to `memoize` must be a positive INTEGER, got %s", limit.inspect())
+        max_entries = limit.value
+
+    memo = Memoized(lambda *call_args: call_memoized(memo, *call_args), fn, max_entries)
+    # recursive calls in the body look the function up by its original name; those names are shadowed by the
+    # memoized wrapper in a scope between the function and its environment so they hit the cache too
+    params = {param.value for param in fn.parameters}
+    rebound: list[str] = []
+    outer: Environment | None = fn.env
+    while outer is not None:
+        rebound.extend(name for name, val in outer.store.items() if val is fn and name not in params)
+        outer = outer.outer
+    if rebound:
+        env = Environment(outer=fn.env)
+        env.store = {name: memo for name in rebound}
+        env.declared_names = env.stable_names = frozenset(rebound)
+        memo.callee = Function(fn.parameters, fn.body, env, fn.name)
+    return memo
+
+
+def builtin_memo_stats(*args: Object) -> Error | Hash:
+    if len(args) != 1:
+        return new_error("wrong number of arguments. got=%d, want=1", len(args))
+
+    memo: Object = args[0]
+    if not isinstance(memo, Memoized):
+        return new_error("argument to `memo_stats` must be a memoized function, got %s", memo.type().value)
+    values: list[Object] = [Integer(memo.hits), Integer(memo.misses), Integer(memo.evictions), Integer(len(memo.cache))]
+    return Hash.record(MEMO_STATS_SHAPE, values)
+
+
+HEAP_STATS_SHAPE = get_shape(("live", "total", "live_bytes", "total_bytes"))
+
+
+def builtin_heap_stats(*args: Object) -> Error | Hash:
+    # imported here as heap imports the evaluator, which imports this module
+    from src.evaluator.heap import running
+
+    if len(args) != 0:
+        return new_error("wrong number of arguments. got=%d, want=0", len(args))
+    if not running:
+        return new_error("heap accounting is not running")
+
+    types = running[-1].types
+    per_type: list[Object] = []
+    for stats in types.values():
+        values: list[Object] = [Integer(stats.live), Integer(stats.total), Integer(stats.live_bytes)]
+        per_type.append(Hash.record(HEAP_STATS_SHAPE, values + [Integer(stats.total_bytes)]))
+    return Hash.record(get_shape(tuple(object_type.value for object_type in types)), per_type)
+
+
+def is_truthy(obj: Object) -> bool:
+    if isinstance(obj, Null):
+        return False
+    elif isinstance(obj, Boolean):
+        return obj.value
+    return True
 
 
 builtin_funcs: dict[str, BuiltIn] = {
@@ -97,4 +833,37 @@ builtin_funcs: dict[str, BuiltIn] = {
     "last": BuiltIn(builtin_last),
     "rest": BuiltIn(builtin_rest),
     "push": BuiltIn(builtin_push),
+    "map": BuiltIn(builtin_map),
+    "pmap": BuiltIn(builtin_pmap),
+    "filter": BuiltIn(builtin_filter),
+    "reduce": BuiltIn(builtin_reduce),
+    "range": BuiltIn(builtin_range),
+    "sum": BuiltIn(builtin_sum),
+    "add": BuiltIn(builtin_add),
+    "scale": BuiltIn(builtin_scale),
+    "dot": BuiltIn(builtin_dot),
+    "argmax": BuiltIn(builtin_argmax),
+    "min": BuiltIn(builtin_min_max("min", min)),
+    "max": BuiltIn(builtin_min_max("max", max)),
+    "sort": BuiltIn(builtin_sort),
+    "reverse": BuiltIn(builtin_reverse),
+    "slice": BuiltIn(builtin_slice),
+    "lazy_map": BuiltIn(builtin_lazy_map),
+    "lazy_filter": BuiltIn(builtin_lazy_filter),
+    "take": BuiltIn(builtin_take),
+    "drop": BuiltIn(builtin_drop),
+    "collect": BuiltIn(builtin_collect),
+    "lines": BuiltIn(builtin_lines),
+    "substr": BuiltIn(builtin_substr),
+    "split": BuiltIn(builtin_split),
+    "join": BuiltIn(builtin_join),
+    "find": BuiltIn(builtin_find),
+    "chars": BuiltIn(builtin_chars),
+    "upper": BuiltIn(builtin_case("upper", str.upper)),
+    "lower": BuiltIn(builtin_case("lower", str.lower)),
+    "trim": BuiltIn(builtin_trim),
+    "starts_with": BuiltIn(builtin_starts_with),
+    "memoize": BuiltIn(builtin_memoize),
+    "memo_stats": BuiltIn(builtin_memo_stats),
+    "heap_stats": BuiltIn(builtin_heap_stats),
 }
@@ -1,10 +1,16 @@
+import itertools
+from typing import Any, Callable, Iterable
+
 from src.ast.ast import (
     ArrayLiteral,
+    AssignStatement,
     BlockStatement,
     BooleanLiteral,
     CallExpression,
     Expression,
     ExpressionStatement,
+    FloatLiteral,
+    ForExpression,
     FunctionLiteral,
     HashLiteral,
     Identifier,
@@ -18,14 +24,25 @@ from src.ast.ast import (
     Program,
     ReturnStatement,
     StringLiteral,
+    WhileExpression,
+)
+from src.evaluator.built_ins import CallbackError, builtin_funcs, iter_elements
+from src.object.environment import (
+    Environment,
+    acquire_frame,
+    global_environment,
+    new_enclosed_environment,
+    release_frame,
 )
-from src.evaluator.built_ins import builtin_funcs
-from src.object.environment import Environment, new_enclosed_environment
 from src.object.object import (
+    FALSE,
+    NULL,
+    TRUE,
     Array,
     Boolean,
     BuiltIn,
     Error,
+    Float,
     Function,
     Hash,
     Hashable,
@@ -35,16 +52,18 @@ from src.object.object import (
     Null,
     Object,
     ObjectType,
+    Range,
     ReturnValue,
+    Sequence,
+    Shape,
     String,
+    get_shape,
 )
-
-TRUE = Boolean(True)
-FALSE = Boolean(False)
-NULL = Null()
+from src.optimizer.free_variables import ScopeInfo, free_names, scope_info
 
 
 def eval_program(program: Program, env: Environment):
+    result = None
     for statement in program.statements:
         result = evaluate(statement, env)
         if isinstance(result, ReturnValue):
@@ -55,6 +74,7 @@ def eval_program(program: Program, env: Environment):
 
 
 def eval_block_statement(block: BlockStatement, env: Environment):
+    result = None
     for statement in block.statements:
         result = evaluate(statement, env)
         if result:
@@ -67,7 +87,7 @@ def native_bool_to_boolean_object(value: bool) -> Boolean:
     return TRUE if value else FALSE
 
 
-def eval_prefix_expression(operator: str, right: Object) -> Boolean | Error | Integer:
+def eval_prefix_expression(operator: str, right: Object) -> Boolean | Error | Integer | Float:
     if operator == "!":
         return eval_bang_operator_expression(right)
     elif operator == "-":
@@ -76,11 +96,10 @@ def eval_prefix_expression(operator: str, right: Object) -> Boolean | Error | In
         return new_error(f"unknown operator: {operator}{right.type().value}")
 
 
-def eval_infix_expression(operator: str, left: Object, right: Object) -> Integer | Boolean | Error | String:
-    if left.type() == ObjectType.INTEGER and right.type() == ObjectType.INTEGER:
-        return eval_integer_infix_expression(operator, left, right)
-    elif left.type() == ObjectType.STRING and right.type() == ObjectType.STRING:
-        return eval_string_infix_expression(operator, left, right)
+def eval_infix_expression(operator: str, left: Object, right: Object) -> Object:
+    handler = INFIX_OPERATORS.get((left.type(), operator, right.type()))
+    if handler is not None:
+        return handler(left, right)
     elif operator == "==":
         return native_bool_to_boolean_object(left == right)
     elif operator == "!=":
@@ -102,47 +121,94 @@ def eval_bang_operator_expression(right: Object) -> Boolean:
         return FALSE
 
 
-def eval_minus_prefix_operator_expression(right: Object) -> Error | Integer:
-    if right.type() != ObjectType.INTEGER:
-        return new_error(f"unknown operator: -{right.type().value}")
-    assert isinstance(right, Integer)
-    value: int = right.value
-    return Integer(-value)
-
-
-def eval_integer_infix_expression(operator: str, left: Object, right: Object) -> Integer | Boolean | Error:
-    assert isinstance(left, Integer)
-    left_val: int = left.value
-    assert isinstance(right, Integer)
-    right_val: int = right.value
-    if operator == "+":
-        return Integer(left_val + right_val)
-    elif operator == "-":
-        return Integer(left_val - right_val)
-    elif operator == "*":
-        return Integer(left_val * right_val)
-    elif operator == "/":
-        return Integer(int(left_val / right_val))
-    elif operator == "<":
-        return native_bool_to_boolean_object(left_val < right_val)
-    elif operator == ">":
-        return native_bool_to_boolean_object(left_val > right_val)
-    elif operator == "==":
-        return native_bool_to_boolean_object(left_val == right_val)
-    elif operator == "!=":
-        return native_bool_to_boolean_object(left_val != right_val)
-    else:
-        return new_error(f"unknown operator: {left.type().value} {operator} {right.type().value}")
-
-
-def eval_string_infix_expression(operator: str, left: Object, right: Object) -> Error | String:
-    if operator != "+":
-        return new_error(f"unknown operator: {left.type().value} {operator} {right.type().value}")
-    assert isinstance(left, String)
-    left_val: str = left.value
-    assert isinstance(right, String)
-    right_val: str = right.value
-    return String(left_val + right_val)
+def eval_minus_prefix_operator_expression(right: Object) -> Error | Integer | Float:
+    if isinstance(right, Integer):
+        return Integer(-right.value)
+    elif isinstance(right, Float):
+        return Float(-right.value)
+    return new_error(f"unknown operator: -{right.type().value}")
+
+
+def truncating_division(left: int, right: int) -> int:
+    # rounds toward zero like int(left / right), but exactly: the float quotient loses precision past 2**53
+    quotient = abs(left) // abs(right)
+    return -quotient if (left < 0) != (right < 0) else quotient
+
+
+def integer_division(left: int, right: int) -> Integer | Error:
+    if right == 0:
+        return new_error("division by zero")
+    return Integer(truncating_division(left, right))
+
+
+def float_division(left: int | float, right: int | float) -> Float | Error:
+    if right == 0:
+        return new_error("division by zero")
+    return Float(left / right)
+
+
+def float_arithmetic(op: Callable[[int | float, int | float], Object]) -> Callable[[int | float, int | float], Object]:
+    # the integer side is converted to a float, which fails for integers beyond the float range
+    def apply(left: int | float, right: int | float) -> Object:
+        try:
+            return op(left, right)
+        except OverflowError:
+            return new_error("integer too large to convert to FLOAT")
+
+    return apply
+
+
+# Operators on integer values. Also used without operand checks for infix expressions that type inference proved
+# to be integer-only.
+INTEGER_OPERATORS: dict[str, Callable[[int, int], Object]] = {
+    "+": lambda a, b: Integer(a + b),
+    "-": lambda a, b: Integer(a - b),
+    "*": lambda a, b: Integer(a * b),
+    "/": integer_division,
+    "<": lambda a, b: TRUE if a < b else FALSE,
+    ">": lambda a, b: TRUE if a > b else FALSE,
+    "==": lambda a, b: TRUE if a == b else FALSE,
+    "!=": lambda a, b: TRUE if a != b else FALSE,
+}
+
+# Operators when either side is a float; Python promotes the integer side and compares int and float exactly
+FLOAT_OPERATORS: dict[str, Callable[[int | float, int | float], Object]] = {
+    "+": float_arithmetic(lambda a, b: Float(a + b)),
+    "-": float_arithmetic(lambda a, b: Float(a - b)),
+    "*": float_arithmetic(lambda a, b: Float(a * b)),
+    "/": float_arithmetic(float_division),
+    "<": lambda a, b: TRUE if a < b else FALSE,
+    ">": lambda a, b: TRUE if a > b else FALSE,
+    "==": lambda a, b: TRUE if a == b else FALSE,
+    "!=": lambda a, b: TRUE if a != b else FALSE,
+}
+
+
+def unknown_operator(operator: str) -> Callable[[Object, Object], Object]:
+    return lambda left, right: new_error(f"unknown operator: {left.type().value} {operator} {right.type().value}")
+
+
+def on_values(op: Callable[[Any, Any], Object]) -> Callable[[Object, Object], Object]:
+    return lambda left, right: op(left.value, right.value)  # type: ignore
+
+
+# Infix operators keyed by (left type, operator, right type); a new type plugs in by adding entries here. Pairs
+# without an entry fall back to identity comparison for == and != and are errors otherwise.
+INFIX_OPERATORS: dict[tuple[ObjectType, str, ObjectType], Callable[[Object, Object], Object]] = {
+    **{(ObjectType.INTEGER, op, ObjectType.INTEGER): on_values(fn) for op, fn in INTEGER_OPERATORS.items()},
+    **{
+        (left, op, right): on_values(fn)
+        for left, right in [
+            (ObjectType.FLOAT, ObjectType.FLOAT),
+            (ObjectType.INTEGER, ObjectType.FLOAT),
+            (ObjectType.FLOAT, ObjectType.INTEGER),
+        ]
+        for op, fn in FLOAT_OPERATORS.items()
+    },
+    (ObjectType.STRING, "+", ObjectType.STRING): lambda left, right: String.concat(left, right),  # type: ignore
+    # strings are not compared by identity like other objects; comparing them is an error
+    **{(ObjectType.STRING, op, ObjectType.STRING): unknown_operator(op) for op in ("==", "!=")},
+}
 
 
 def eval_if_expression(ie: IfExpression, env: Environment) -> Object | Null:
@@ -157,6 +223,53 @@ def eval_if_expression(ie: IfExpression, env: Environment) -> Object | Null:
         return NULL
 
 
+def eval_while_expression(we: WhileExpression, env: Environment) -> Object | Null:
+    while True:
+        condition: Object = evaluate(we.condition, env)
+        if is_error(condition):
+            return condition
+        if not is_truthy(condition):
+            return NULL
+        result = evaluate(we.body, env)
+        if result is not None and (result.type() == ObjectType.RETURN_VALUE or result.type() == ObjectType.ERROR):
+            return result
+
+
+def eval_for_expression(fe: ForExpression, env: Environment) -> Object | Null:
+    iterable: Object = evaluate(fe.iterable, env)
+    if is_error(iterable):
+        return iterable
+
+    items: Iterable[Object] | None
+    if isinstance(iterable, Hash):
+        items = [pair.key for pair in iterable.pairs.values()]
+    else:
+        items = iter_elements(iterable)
+    if items is None:
+        return new_error(f"for loop not supported over: {iterable.type().value}")
+
+    name: str = fe.variable.value
+    body: BlockStatement = fe.body
+    try:
+        for item in items:
+            env.set(name, item)
+            result = evaluate(body, env)
+            if result is not None and (result.type() == ObjectType.RETURN_VALUE or result.type() == ObjectType.ERROR):
+                return result
+    except CallbackError as e:
+        return e.error
+    return NULL
+
+
+def eval_assign_statement(node: AssignStatement, env: Environment) -> Object | Error:
+    val: Object = evaluate(node.value, env)
+    if is_error(val):
+        return val
+    if not env.assign(node.name.value, val):
+        return new_error(f"identifier not found: {node.name.value}")
+    return val
+
+
 def eval_identifier(node: Identifier, env: Environment):
     val, ok = env.get(node.value)
     if ok:
@@ -199,20 +312,64 @@ def apply_function(fn: Object, args: list[Object]) -> Object | Error:
     if isinstance(fn, Function):
         extended_env: Environment = extend_function_env(fn, args)
         evaluated: Object = evaluate(fn.body, extended_env)
+        if not scope_info(fn.parameters, fn.body).escapes:
+            release_frame(extended_env)
         return unwrap_return_value(evaluated)
     elif isinstance(fn, BuiltIn):
-        return fn.fn(*args)
+        try:
+            return fn.fn(*args)
+        except CallbackError as e:
+            return e.error
     else:
         return new_error(f"not a function: {fn.type().value}")
 
 
 def extend_function_env(fn: Function, args: list[Object]) -> Environment:
-    env: Environment = new_enclosed_environment(fn.env)
+    info: ScopeInfo = scope_info(fn.parameters, fn.body)
+    env: Environment = new_enclosed_environment(fn.env) if info.escapes else acquire_frame(fn.env)
+    env.declared_names = info.declared
+    env.stable_names = info.stable
     for param_idx, param in enumerate(fn.parameters):
         env.set(param.value, args[param_idx])
     return env
 
 
+def new_closure(node: FunctionLiteral, env: Environment) -> Function:
+    # Flat closure: copy the values of the free variables instead of keeping every enclosing scope alive. This
+    # is only done when each copied binding can never change afterwards; otherwise the closure keeps env.
+    if env.outer is None:
+        return Function(node.parameters, node.body, env, node.name)
+
+    globals: Environment = global_environment(env)
+    captured: dict[str, Object] = {}
+    for name in free_names(node):
+        owner: Environment = env.owner(name) or globals
+        # an enclosing scope may still bind the name later, e.g. a local recursive let
+        if not shadow_free(env, owner, name):
+            return Function(node.parameters, node.body, env, node.name)
+        if owner is globals:
+            continue
+        if name not in owner.stable_names:
+            return Function(node.parameters, node.body, env, node.name)
+        captured[name] = owner.store[name]
+
+    closure_env = Environment(outer=globals)
+    closure_env.store = captured
+    closure_env.declared_names = frozenset(captured)
+    closure_env.stable_names = frozenset(captured)
+    return Function(node.parameters, node.body, closure_env, node.name)
+
+
+def shadow_free(env: Environment, owner: Environment, name: str) -> bool:
+    # no scope between the closure and the binding's owner can later bind the same name
+    while env is not owner:
+        if env.declared_names is None or name in env.declared_names:
+            return False
+        assert env.outer is not None
+        env = env.outer
+    return True
+
+
 def unwrap_return_value(obj: Object) -> Object:
     if isinstance(obj, ReturnValue):
         return obj.value
@@ -222,6 +379,12 @@ def unwrap_return_value(obj: Object) -> Object:
 def eval_index_expression(left: Object, index: Object) -> Null | Object | Error:
     if left.type() == ObjectType.ARRAY and index.type() == ObjectType.INTEGER:
         return eval_array_index_expression(left, index)
+    elif left.type() == ObjectType.STRING and index.type() == ObjectType.INTEGER:
+        return eval_string_index_expression(left, index)
+    elif left.type() == ObjectType.RANGE and index.type() == ObjectType.INTEGER:
+        return eval_range_index_expression(left, index)
+    elif left.type() == ObjectType.SEQUENCE and index.type() == ObjectType.INTEGER:
+        return eval_sequence_index_expression(left, index)
     elif left.type() == ObjectType.HASH:
         return eval_hash_index_expression(left, index)
     else:
@@ -232,13 +395,62 @@ def eval_array_index_expression(array: Object, index: Object) -> Null | Object:
     assert isinstance(array, Array)
     assert isinstance(index, Integer)
     idx = index.value
-    max_idx = len(array.elements) - 1
+    max_idx = array.length() - 1
     if idx < 0 or idx > max_idx:
         return NULL
-    return array.elements[idx]
+    return array.get(idx)
+
+
+def eval_string_index_expression(string: Object, index: Object) -> Null | String:
+    assert isinstance(string, String)
+    assert isinstance(index, Integer)
+    idx = index.value
+    if idx < 0 or idx >= string.length:
+        return NULL
+    source, start, _ = string.span()
+    return String(source[start + idx])
+
+
+def eval_range_index_expression(range_obj: Object, index: Object) -> Null | Integer:
+    assert isinstance(range_obj, Range)
+    assert isinstance(index, Integer)
+    idx = index.value
+    if idx < 0 or idx >= len(range_obj.values):
+        return NULL
+    return Integer(range_obj.values[idx])
+
+
+def eval_sequence_index_expression(seq: Object, index: Object) -> Null | Object | Error:
+    assert isinstance(seq, Sequence)
+    assert isinstance(index, Integer)
+    idx = index.value
+    if idx < 0:
+        return NULL
+    try:
+        # O(idx): the sequence is walked up to the requested element
+        return next(itertools.islice(seq.iterate(), idx, None), NULL)
+    except CallbackError as e:
+        return e.error
+
+
+def record_shape(node: HashLiteral) -> Shape | None:
+    if not node.shape_checked:
+        node.shape_checked = True
+        keys = tuple(key.value for key in node.pairs if isinstance(key, StringLiteral))
+        if len(keys) == len(node.pairs) and len(set(keys)) == len(keys):
+            node.shape = get_shape(keys)
+    return node.shape
 
 
 def eval_hash_literal(node: HashLiteral, env: Environment) -> Error | Hash:
+    shape: Shape | None = record_shape(node)
+    if shape is not None:
+        values: list[Object] = eval_expressions(list(node.pairs.values()), env)
+        if len(values) == 1 and is_error(values[0]):
+            assert isinstance(values[0], Error)
+            return values[0]
+        return Hash.record(shape, values)
+
     pairs: dict[HashKey, HashPair] = {}
     for key_node, value_node in node.pairs.items():
         key: Object = evaluate(key_node, env)
@@ -256,8 +468,24 @@ def eval_hash_literal(node: HashLiteral, env: Environment) -> Error | Hash:
     return Hash(pairs)
 
 
+def eval_constant_field(node: IndexExpression, hash_obj: Hash) -> Object:
+    # inline cache: a shape check and a list index when this site keeps seeing the same record layout
+    shape = hash_obj.shape
+    assert shape is not None and isinstance(node.index, StringLiteral)
+    if shape is not node.cached_shape:
+        slot = shape.slots.get(node.index.value)
+        if slot is None:
+            return NULL
+        node.cached_shape = shape
+        node.cached_slot = slot
+    return hash_obj.values[node.cached_slot]
+
+
 def eval_hash_index_expression(hash_obj: Object, index: Object) -> Error | Null | Object:
     assert isinstance(hash_obj, Hash)
+    if hash_obj.shape is not None and isinstance(index, String):
+        slot = hash_obj.shape.slots.get(index.value)
+        return NULL if slot is None else hash_obj.values[slot]
     if not isinstance(index, Hashable):
         return new_error(f"unusable as hash key: {index.type().value}")
     pair: HashPair | None = hash_obj.pairs.get(index.hash_key())
@@ -286,8 +514,12 @@ def evaluate(node: Node, env: Environment) -> Object | Error | Null:
             assert isinstance(val, Error)
             return val
         env.set(node.name.value, val)
+    elif isinstance(node, AssignStatement):
+        return eval_assign_statement(node, env)
     elif isinstance(node, IntegerLiteral):
         return Integer(node.value)
+    elif isinstance(node, FloatLiteral):
+        return Float(node.value)
     elif isinstance(node, StringLiteral):
         return String(node.value)
     elif isinstance(node, BooleanLiteral):
@@ -307,15 +539,19 @@ def evaluate(node: Node, env: Environment) -> Object | Error | Null:
         if is_error(right):
             assert isinstance(right, Error)
             return right
+        if node.int_operands:
+            return INTEGER_OPERATORS[node.operator](left.value, right.value)  # type: ignore
         return eval_infix_expression(node.operator, left, right)
     elif isinstance(node, IfExpression):
         return eval_if_expression(node, env)
+    elif isinstance(node, WhileExpression):
+        return eval_while_expression(node, env)
+    elif isinstance(node, ForExpression):
+        return eval_for_expression(node, env)
     elif isinstance(node, Identifier):
         return eval_identifier(node, env)
     elif isinstance(node, FunctionLiteral):
-        params: list[Identifier] = node.parameters
-        body: BlockStatement = node.body
-        return Function(params, body, env)
+        return new_closure(node, env)
     elif isinstance(node, CallExpression):
         function: Object = evaluate(node.function, env)
         if is_error(function):
@@ -335,6 +571,8 @@ def evaluate(node: Node, env: Environment) -> Object | Error | Null:
         if is_error(left):
             assert isinstance(left, Error)
             return left
+        if isinstance(node.index, StringLiteral) and isinstance(left, Hash) and left.shape is not None:
+            return eval_constant_field(node, left)
         index: Object = evaluate(node.index, env)
         if is_error(index):
             assert isinstance(left, Error)
@@ -0,0 +1,114 @@
+import sys
+import tracemalloc
+import weakref
+
+from src.ast.ast import Node
+from src.evaluator import hooks
+from src.evaluator.hooks import Hooks
+from src.object.object import Array, Float, Hash, Integer, Object, ObjectType, String
+
+# Number of lines shown for a tracemalloc snapshot diff.
+TRACEMALLOC_TOP = 10
+
+
+def approximate_size(obj: Object) -> int:
+    # the object with its attributes and the containers it owns: the unboxed buffer of a compact array, the slot
+    # list of a boxed one, a hash's pair dict and pairs. Elements, keys and values are objects of their own and are
+    # counted when they are made; strings sharing characters through ropes and views count only their own text.
+    size = sys.getsizeof(obj) + sys.getsizeof(vars(obj))
+    if isinstance(obj, (Integer, Float)):
+        size += sys.getsizeof(obj.value)
+    elif isinstance(obj, String):
+        size += sys.getsizeof(obj.flat) if obj.flat is not None else 0
+    elif isinstance(obj, Array):
+        size += sys.getsizeof(obj.ints) if obj.ints is not None else sys.getsizeof(obj.boxed)
+    elif isinstance(obj, Hash):
+        if obj.shape is not None:
+            size += sys.getsizeof(obj.values)
+        else:
+            pairs = obj.pairs
+            size += sys.getsizeof(pairs)
+            for hashed, pair in pairs.items():
+                size += sys.getsizeof(pair) + sys.getsizeof(vars(pair)) + sys.getsizeof(hashed)
+    return size
+
+
+class TypeStats:
+    def __init__(self):
+        self.live = 0
+        self.total = 0
+        self.live_bytes = 0
+        self.total_bytes = 0
+
+
+# Counts Monkey objects made while it is running, by type, through the on_alloc hook. An object stays live until
+# Python frees it, which a weak reference reports; objects made before start() are not counted at all. With
+# trace=True the Python allocator is traced as well, and diff() lists where memory grew since the previous call.
+class HeapAccounting(Hooks):
+    def __init__(self, trace: bool = False):
+        self.types: dict[ObjectType, TypeStats] = {}
+        self.refs: dict[weakref.ref, tuple[TypeStats, int]] = {}
+        self.trace = trace
+        self.snapshot: tracemalloc.Snapshot | None = None
+        self.started_tracing = False
+
+    def start(self):
+        hooks.register(self)
+        running.append(self)
+        if self.trace:
+            # tracing someone else started is left running when this stops
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.started_tracing = True
+            self.snapshot = tracemalloc.take_snapshot()
+
+    def stop(self):
+        hooks.unregister(self)
+        if self in running:
+            running.remove(self)
+        if self.snapshot is not None:
+            self.snapshot = None
+        if self.started_tracing:
+            self.started_tracing = False
+            tracemalloc.stop()
+
+    def on_alloc(self, obj: Object, node: Node | None):
+        if weakref.ref(obj) in self.refs:
+            # a builtin handed back an object that is already counted
+            return
+        stats = self.types.get(obj.type())
+        if stats is None:
+            stats = self.types[obj.type()] = TypeStats()
+        size = approximate_size(obj)
+        stats.live += 1
+        stats.total += 1
+        stats.live_bytes += size
+        stats.total_bytes += size
+        self.refs[weakref.ref(obj, self.collected)] = (stats, size)
+
+    def collected(self, ref: weakref.ref):
+        stats, size = self.refs.pop(ref)
+        stats.live -= 1
+        stats.live_bytes -= size
+
+    def report(self) -> str:
+        lines = [f"{'type':<14} {'live':>10} {'live_bytes':>12} {'total':>10} {'total_bytes':>12}"]
+        for object_type, stats in sorted(self.types.items(), key=lambda item: (-item[1].live_bytes, item[0].value)):
+            lines.append(
+                f"{object_type.value:<14} {stats.live:>10} {stats.live_bytes:>12} {stats.total:>10} "
+                f"{stats.total_bytes:>12}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def diff(self, limit: int = TRACEMALLOC_TOP) -> str:
+        # Python source lines whose allocations grew the most since the previous diff (or start)
+        if self.snapshot is None:
+            return ""
+        snapshot = tracemalloc.take_snapshot()
+        changes = snapshot.compare_to(self.snapshot, "lineno")
+        self.snapshot = snapshot
+        return "".join(f"{change}\n" for change in changes[:limit])
+
+
+# Accounting started and not stopped, oldest first; the heap_stats builtin reports the newest.
+running: list[HeapAccounting] = []
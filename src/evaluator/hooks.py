@@ -0,0 +1,135 @@
+from src.ast.ast import (
+    ArrayLiteral,
+    FloatLiteral,
+    FunctionLiteral,
+    HashLiteral,
+    InfixExpression,
+    IntegerLiteral,
+    Node,
+    PrefixExpression,
+    StringLiteral,
+)
+from src.evaluator import evaluator
+from src.object.environment import Environment
+from src.object.object import FALSE, NULL, TRUE, BuiltIn, Error, Object
+
+# Nodes whose value is a newly made object; the value of an identifier, index or call to a Monkey function is one
+# made elsewhere (a call's result is reported by the node in the body that made it).
+ALLOCATING_NODES: tuple[type[Node], ...] = (
+    IntegerLiteral,
+    FloatLiteral,
+    StringLiteral,
+    ArrayLiteral,
+    HashLiteral,
+    FunctionLiteral,
+    PrefixExpression,
+    InfixExpression,
+)
+
+
+# Base class for evaluation hooks; subclasses override the events they want. on_node is called with the value of
+# every evaluated node whose exact type is in node_types, or every node when node_types is None. on_error is called
+# once per error, with the node that produced it. on_alloc sees the values of ALLOCATING_NODES and of builtin
+# calls, except the TRUE/FALSE/NULL singletons; builtins returning one of their arguments are counted too, so
+# allocation counts are an upper bound.
+class Hooks:
+    node_types: tuple[type[Node], ...] | None = None
+
+    def on_call(self, fn: Object, args: list[Object]):
+        pass
+
+    def on_return(self, fn: Object, result: Object):
+        pass
+
+    def on_error(self, error: Error, node: Node):
+        pass
+
+    def on_node(self, node: Node, result: Object):
+        pass
+
+    def on_alloc(self, obj: Object, node: Node | None):
+        pass
+
+
+def overrides(hooks: Hooks, event: str) -> bool:
+    return getattr(type(hooks), event) is not getattr(Hooks, event)
+
+
+# The evaluator's own functions. While hooks are registered, evaluator.evaluate and evaluator.apply_function are
+# replaced by the traced versions below, which call the originals; the evaluator looks both up as module globals,
+# so every recursive call goes through the replacement. With nothing registered the originals are put back and
+# evaluation runs exactly the code it runs without this module. The node passed to evaluate by a caller that
+# imported it before the swap is itself evaluated untraced; its children are traced.
+plain_evaluate = evaluator.evaluate
+plain_apply_function = evaluator.apply_function
+
+registered: list[Hooks] = []
+call_hooks: list[Hooks] = []
+return_hooks: list[Hooks] = []
+error_hooks: list[Hooks] = []
+alloc_hooks: list[Hooks] = []
+all_node_hooks: list[Hooks] = []
+node_hooks: dict[type[Node], list[Hooks]] = {}
+last_error: list[Error | None] = [None]
+
+
+def register(hooks: Hooks):
+    if hooks not in registered:
+        registered.append(hooks)
+        install()
+
+
+def unregister(hooks: Hooks):
+    if hooks in registered:
+        registered.remove(hooks)
+        install()
+
+
+def install():
+    # rebuilds the per-event lists and swaps in only the traced functions some registered hook needs
+    call_hooks[:] = [h for h in registered if overrides(h, "on_call")]
+    return_hooks[:] = [h for h in registered if overrides(h, "on_return")]
+    error_hooks[:] = [h for h in registered if overrides(h, "on_error")]
+    alloc_hooks[:] = [h for h in registered if overrides(h, "on_alloc")]
+    all_node_hooks[:] = [h for h in registered if overrides(h, "on_node") and h.node_types is None]
+    node_hooks.clear()
+    for h in registered:
+        if overrides(h, "on_node") and h.node_types is not None:
+            for node_type in h.node_types:
+                node_hooks.setdefault(node_type, []).append(h)
+    last_error[0] = None
+
+    traces_nodes = bool(error_hooks or alloc_hooks or all_node_hooks or node_hooks)
+    traces_calls = bool(call_hooks or return_hooks or alloc_hooks)
+    evaluator.evaluate = traced_evaluate if traces_nodes else plain_evaluate  # type: ignore
+    evaluator.apply_function = traced_apply_function if traces_calls else plain_apply_function  # type: ignore
+
+
+def traced_evaluate(node: Node, env: Environment) -> Object:
+    result = plain_evaluate(node, env)
+    if isinstance(result, Error):
+        # an error is passed up unchanged by every enclosing node; only the first one reports it
+        if result is not last_error[0]:
+            last_error[0] = result
+            for h in error_hooks:
+                h.on_error(result, node)
+    elif alloc_hooks and isinstance(node, ALLOCATING_NODES) and result not in (TRUE, FALSE, NULL):
+        for h in alloc_hooks:
+            h.on_alloc(result, node)
+    for h in all_node_hooks:
+        h.on_node(node, result)
+    for h in node_hooks.get(type(node), ()):
+        h.on_node(node, result)
+    return result
+
+
+def traced_apply_function(fn: Object, args: list[Object]) -> Object:
+    for h in call_hooks:
+        h.on_call(fn, args)
+    result = plain_apply_function(fn, args)
+    if alloc_hooks and isinstance(fn, BuiltIn) and not isinstance(result, Error) and result not in (TRUE, FALSE, NULL):
+        for h in alloc_hooks:
+            h.on_alloc(result, None)
+    for h in return_hooks:
+        h.on_return(fn, result)
+    return result
@@ -0,0 +1,261 @@
+import math
+import os
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from src.ast.ast import BlockStatement, FunctionLiteral, Identifier
+from src.evaluator import evaluator, hooks
+from src.evaluator.budget import BudgetExceeded, BudgetMeter, running_meter
+from src.evaluator.built_ins import builtin_funcs, new_error
+from src.object.environment import Environment
+from src.object.object import (
+    FALSE,
+    NULL,
+    TRUE,
+    Array,
+    Boolean,
+    BuiltIn,
+    Error,
+    Float,
+    Function,
+    Hash,
+    HashPair,
+    Integer,
+    Null,
+    Object,
+    Range,
+    String,
+    get_shape,
+)
+from src.optimizer.free_variables import free_names
+from src.optimizer.walk import clone
+from src.tokens.tokens import Token, TokenType
+
+# Each worker gets about this many chunks, so a slow chunk doesn't leave the other workers idle for long.
+CHUNKS_PER_WORKER = 4
+# Set in processes that are themselves workers of a pool sized by someone else, such as the server's: pmap then maps
+# in the calling process rather than starting processes of its own.
+in_process = False
+
+# Values cross the process boundary as nested tuples of plain Python data tagged with their kind. Functions are
+# entries in a table shipped alongside, holding their parameters, body and the values of their free variables,
+# and are referred to by index so recursive and mutually recursive functions are sent once.
+Encoded = tuple[Any, ...]
+EncodedFunction = tuple[list[Identifier], BlockStatement, dict[str, Encoded]]
+
+
+class CodecError(Exception):
+    pass
+
+
+class Encoder:
+    def __init__(self):
+        self.functions: list[EncodedFunction] = []
+        self.function_slots: dict[int, int] = {}
+
+    def encode(self, obj: Object) -> Encoded:
+        if isinstance(obj, Integer):
+            return ("int", obj.value)
+        elif isinstance(obj, Float):
+            return ("float", obj.value)
+        elif isinstance(obj, String):
+            return ("str", obj.value)
+        elif isinstance(obj, Boolean):
+            return ("bool", obj.value)
+        elif isinstance(obj, Null):
+            return ("null",)
+        elif isinstance(obj, Array):
+            if obj.ints is not None:
+                return ("ints", obj.ints.tobytes())
+            return ("array", [self.encode(e) for e in obj.iterate()])
+        elif isinstance(obj, Range):
+            return ("range", obj.values.start, obj.values.stop, obj.values.step)
+        elif isinstance(obj, Hash):
+            if obj.shape is not None:
+                return ("record", obj.shape.keys, [self.encode(v) for v in obj.values])
+            return ("hash", [(self.encode(pair.key), self.encode(pair.value)) for pair in obj.pairs.values()])
+        elif isinstance(obj, Function):
+            return ("fn", self.function_slot(obj))
+        elif isinstance(obj, BuiltIn):
+            for name, builtin in builtin_funcs.items():
+                if builtin is obj:
+                    return ("builtin", name)
+            raise CodecError("pmap cannot send a memoized function to a worker process")
+        raise CodecError(f"pmap cannot send {obj.type().value} to a worker process")
+
+    def function_slot(self, fn: Function) -> int:
+        slot = self.function_slots.get(id(fn))
+        if slot is not None:
+            return slot
+        slot = len(self.functions)
+        self.function_slots[id(fn)] = slot
+        body = clone(fn.body)
+        assert isinstance(body, BlockStatement)
+        captured: dict[str, Encoded] = {}
+        # the entry exists before its captured values are encoded, so a function can capture itself
+        self.functions.append((fn.parameters, body, captured))
+
+        # only the free variables are sent, not the whole scope the function was created in
+        literal = FunctionLiteral(token=Token(TokenType.FUNCTION, "fn"), parameters=fn.parameters, body=fn.body)
+        for name in sorted(free_names(literal)):
+            value, ok = fn.env.get(name)
+            if ok:
+                assert value is not None
+                captured[name] = self.encode(value)
+        return slot
+
+
+class Decoder:
+    def __init__(self, functions: list[EncodedFunction]):
+        self.functions = functions
+        self.decoded: list[Function | None] = [None] * len(functions)
+
+    def decode(self, data: Encoded) -> Object:
+        kind = data[0]
+        if kind == "int":
+            return Integer(data[1])
+        elif kind == "float":
+            return Float(data[1])
+        elif kind == "str":
+            return String(data[1])
+        elif kind == "bool":
+            return TRUE if data[1] else FALSE
+        elif kind == "null":
+            return NULL
+        elif kind == "ints":
+            values = array("q")
+            values.frombytes(data[1])
+            return Array.of_ints(values)
+        elif kind == "array":
+            return Array([self.decode(e) for e in data[1]])
+        elif kind == "range":
+            return Range(range(data[1], data[2], data[3]))
+        elif kind == "record":
+            return Hash.record(get_shape(data[1]), [self.decode(v) for v in data[2]])
+        elif kind == "hash":
+            pairs: dict = {}
+            for key_data, value_data in data[1]:
+                key = self.decode(key_data)
+                pairs[key.hash_key()] = HashPair(key, self.decode(value_data))  # type: ignore
+            return Hash(pairs)
+        elif kind == "fn":
+            return self.function(data[1])
+        elif kind == "builtin":
+            return builtin_funcs[data[1]]
+        raise CodecError(f"unknown encoded value {kind}")
+
+    def function(self, slot: int) -> Function:
+        fn = self.decoded[slot]
+        if fn is None:
+            params, body, captured = self.functions[slot]
+            # registered before its captured values are decoded, so a function can capture itself
+            fn = Function(params, body, Environment())
+            self.decoded[slot] = fn
+            for name, value in captured.items():
+                fn.env.set(name, self.decode(value))
+        return fn
+
+
+def run_chunk(
+    functions: list[EncodedFunction], encoded_fn: Encoded, items: list[Encoded], meter: BudgetMeter | None
+) -> tuple[Any, ...]:
+    # runs in a worker process and returns the kind of outcome, the steps taken and its values or message; an Error
+    # result stops the chunk and is reported instead of the values. meter is a copy of the caller's budget meter,
+    # so the chunk runs within what is left of the caller's budget (the monotonic clock is shared by processes).
+    decoder = Decoder(functions)
+    fn = decoder.decode(encoded_fn)
+    encoder = Encoder()
+    results: list[Encoded] = []
+    start = 0
+    if meter is not None:
+        # the copy counts the evaluation on this process's thread
+        meter.thread = threading.get_ident()
+        start = meter.steps
+        hooks.register(meter)
+    try:
+        for item in items:
+            result = evaluator.apply_function(fn, [decoder.decode(item)])
+            if isinstance(result, Error):
+                return ("error", steps_taken(meter, start), result.message)
+            try:
+                results.append(encoder.encode(result))
+            except CodecError as e:
+                return ("error", steps_taken(meter, start), str(e))
+    except BudgetExceeded as e:
+        return ("budget", steps_taken(meter, start), str(e))
+    finally:
+        if meter is not None:
+            hooks.unregister(meter)
+    return ("ok", steps_taken(meter, start), encoder.functions, results)
+
+
+def steps_taken(meter: BudgetMeter | None, start: int) -> int:
+    return meter.steps - start if meter is not None else 0
+
+
+def reset_hooks():
+    # a forked worker starts with copies of the hooks registered in the process that made the pool; it runs only
+    # the ones its chunks register
+    hooks.registered.clear()
+    hooks.install()
+
+
+# The pool is kept, by its worker count, so later calls reuse processes that already have the interpreter loaded.
+# There is at most one: a call asking for another count shuts it down and starts a new one.
+executors: dict[int, ProcessPoolExecutor] = {}
+
+
+def get_executor(workers: int) -> ProcessPoolExecutor:
+    executor = executors.get(workers)
+    if executor is None:
+        for other in executors.values():
+            other.shutdown(cancel_futures=True)
+        executors.clear()
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=reset_hooks)
+        executors[workers] = executor
+    return executor
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def parallel_map(fn: Object, elements: list[Object], workers: int) -> Object:
+    encoder = Encoder()
+    try:
+        encoded_fn = encoder.encode(fn)
+        items = [encoder.encode(e) for e in elements]
+    except CodecError as e:
+        return new_error("%s", str(e))
+    if not items:
+        return Array([])
+
+    size = math.ceil(len(items) / (workers * CHUNKS_PER_WORKER))
+    chunks = [items[i : i + size] for i in range(0, len(items), size)]
+    functions = [encoder.functions] * len(chunks)
+    meter = running_meter()
+    executor = get_executor(workers)
+    try:
+        outcomes = list(executor.map(run_chunk, functions, [encoded_fn] * len(chunks), chunks, [meter] * len(chunks)))
+    except BrokenProcessPool as e:
+        # a dead worker leaves the pool unusable; the next call starts a fresh one
+        executors.pop(workers, None)
+        return new_error("pmap worker failed: %s", e)
+    except Exception as e:
+        return new_error("pmap worker failed: %s", e)
+
+    if meter is not None:
+        # every chunk could use all that was left, so the caller's step limit is checked against their total
+        meter.charge(sum(outcome[1] for outcome in outcomes))
+    results: list[Object] = []
+    for outcome in outcomes:
+        if outcome[0] == "budget":
+            raise BudgetExceeded(outcome[2])
+        if outcome[0] == "error":
+            return new_error("%s", outcome[2])
+        decoder = Decoder(outcome[2])
+        results.extend(decoder.decode(value) for value in outcome[3])
+    return Array(results)
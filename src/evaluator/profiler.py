@@ -0,0 +1,100 @@
+import time
+from typing import Callable
+
+from src.ast.ast import BlockStatement
+from src.evaluator import hooks
+from src.evaluator.hooks import Hooks
+from src.object.object import Function, Object
+
+ANONYMOUS = "<anonymous>"
+
+
+class FunctionStats:
+    # Totals for every closure made from one function literal. total_time counts only the outermost of recursive
+    # calls, so it never exceeds the wall time spent in the function.
+    def __init__(self, label: str, body: BlockStatement):
+        self.label = label
+        self.body = body  # keeps the id used as key from being reused
+        self.calls = 0
+        self.total_time = 0.0
+        self.self_time = 0.0
+        self.active = 0
+
+
+def function_label(fn: Function) -> str:
+    token = fn.body.token
+    return f"{fn.name or ANONYMOUS}@{token.line}:{token.column}"
+
+
+class Frame:
+    def __init__(self, stats: FunctionStats, path: tuple[str, ...], start: float):
+        self.stats = stats
+        self.path = path
+        self.start = start
+        self.child_time = 0.0
+
+
+# Deterministic profiler for Monkey functions, driven by the on_call and on_return hooks; nothing is checked per
+# call when no profiler is running. Builtins are not timed themselves: time spent in them counts towards the Monkey
+# function calling them, and callbacks they make are profiled as usual. Calls made by memoized functions on a cache
+# miss don't go through apply_function and are not counted.
+class Profiler(Hooks):
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.functions: dict[int, FunctionStats] = {}
+        self.stacks: dict[tuple[str, ...], float] = {}
+        self.frames: list[Frame] = []
+
+    def start(self):
+        # frames left by an evaluation that raised are dropped
+        self.frames.clear()
+        hooks.register(self)
+
+    def stop(self):
+        hooks.unregister(self)
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def on_call(self, fn: Object, args: list[Object]):
+        if not isinstance(fn, Function):
+            return
+        stats = self.functions.get(id(fn.body))
+        if stats is None:
+            stats = FunctionStats(function_label(fn), fn.body)
+            self.functions[id(fn.body)] = stats
+        parent = self.frames[-1] if self.frames else None
+        self.frames.append(Frame(stats, (parent.path if parent is not None else ()) + (stats.label,), self.clock()))
+        stats.calls += 1
+        stats.active += 1
+
+    def on_return(self, fn: Object, result: Object):
+        if not isinstance(fn, Function):
+            return
+        frame = self.frames.pop()
+        stats = frame.stats
+        elapsed = self.clock() - frame.start
+        stats.active -= 1
+        if stats.active == 0:
+            stats.total_time += elapsed
+        own = elapsed - frame.child_time
+        stats.self_time += own
+        self.stacks[frame.path] = self.stacks.get(frame.path, 0.0) + own
+        if self.frames:
+            self.frames[-1].child_time += elapsed
+
+    def report(self) -> str:
+        # one line per function, most self time first
+        lines = [f"{'calls':>10} {'total_s':>10} {'self_s':>10}  function"]
+        for stats in sorted(self.functions.values(), key=lambda s: (-s.self_time, s.label)):
+            lines.append(f"{stats.calls:>10} {stats.total_time:>10.4f} {stats.self_time:>10.4f}  {stats.label}")
+        return "\n".join(lines) + "\n"
+
+    def collapsed(self) -> str:
+        # the "collapsed stack" input of flamegraph.pl and speedscope: a call path and its self time in microseconds
+        lines = [f"{';'.join(path)} {round(seconds * 1_000_000)}" for path, seconds in sorted(self.stacks.items())]
+        return "".join(line + "\n" for line in lines)
@@ -0,0 +1,80 @@
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+
+from src.evaluator.evaluator import evaluate
+
+# Seconds between samples. The sampling thread needs the GIL to look at the evaluating thread, which only gives it
+# up every sys.getswitchinterval() (5ms by default), so much shorter intervals don't give more samples.
+SAMPLE_INTERVAL = 0.005
+
+
+def current_line(frame: FrameType | None) -> int | None:
+    # the line of the innermost node being evaluated that has a position; optimizer-made nodes have none
+    while frame is not None:
+        if frame.f_code is evaluate.__code__:
+            token = getattr(frame.f_locals.get("node"), "token", None)
+            if token is not None and token.line > 0:
+                return token.line
+        frame = frame.f_back
+    return None
+
+
+# Statistical line profiler. A background thread periodically looks at the Python stack of the thread that
+# started it and counts the source line of the innermost Monkey node under evaluation. The evaluator itself runs
+# unchanged, so the cost is the sampling thread's share of the GIL, not a per-node hook.
+class LineSampler:
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.hits: Counter[int] = Counter()
+        self.samples = 0
+        self.target: int | None = None
+        self.stopping = threading.Event()
+        self.thread: threading.Thread | None = None
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.target = threading.get_ident()
+        self.stopping.clear()
+        self.thread = threading.Thread(target=self.run, name="monkey-line-sampler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.stopping.set()
+        self.thread.join()
+        self.thread = None
+
+    def __enter__(self) -> "LineSampler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def run(self):
+        assert self.target is not None
+        while not self.stopping.wait(self.interval):
+            self.sample(sys._current_frames().get(self.target))
+
+    def sample(self, frame: FrameType | None):
+        self.samples += 1
+        line = current_line(frame)
+        if line is not None:
+            self.hits[line] += 1
+
+    def histogram(self) -> list[tuple[int, int]]:
+        # (line, hits), hottest first
+        return sorted(self.hits.items(), key=lambda item: (-item[1], item[0]))
+
+    def annotate(self, source: str) -> str:
+        # the source with each line's hits and share of the samples in front of it
+        lines = []
+        for number, text in enumerate(source.splitlines(), start=1):
+            hits = self.hits.get(number, 0)
+            share = f"{100 * hits / self.samples:5.1f}%" if hits else ""
+            lines.append(f"{hits or '':>8} {share:>6} {number:>5} | {text}")
+        return "\n".join(lines) + "\n"
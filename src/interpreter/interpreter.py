@@ -0,0 +1,174 @@
+from typing import Any, Callable
+
+from src.ast.ast import Program
+from src.evaluator import evaluator
+from src.evaluator.budget import Budget, run_within
+from src.evaluator.built_ins import builtin_funcs
+from src.lexer.lexer import Lexer
+from src.object.environment import Environment, new_environment
+from src.object.object import (
+    FALSE,
+    NULL,
+    TRUE,
+    Array,
+    Boolean,
+    BudgetError,
+    BuiltIn,
+    Error,
+    Float,
+    Function,
+    Hash,
+    Hashable,
+    HashPair,
+    Integer,
+    Null,
+    Object,
+    Range,
+    String,
+)
+from src.optimizer.pipeline import optimize
+from src.optimizer.walk import global_names
+from src.parser.parser import Parser
+
+
+class MonkeyError(Exception):
+    # a Monkey program evaluated to an error
+    def __init__(self, error: Error):
+        super().__init__(error.message)
+        self.error = error
+
+
+class BudgetExceededError(MonkeyError):
+    pass
+
+
+class ParseError(Exception):
+    def __init__(self, errors: list[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+def to_monkey(value: Any) -> Object:
+    # Monkey objects pass through, so handles such as functions can be given back
+    if isinstance(value, Object):
+        return value
+    elif value is None:
+        return NULL
+    elif isinstance(value, bool):
+        return TRUE if value else FALSE
+    elif isinstance(value, int):
+        return Integer(value)
+    elif isinstance(value, float):
+        return Float(value)
+    elif isinstance(value, str):
+        return String(value)
+    elif isinstance(value, (list, tuple)):
+        return Array([to_monkey(e) for e in value])
+    elif isinstance(value, range):
+        return Range(value)
+    elif isinstance(value, dict):
+        pairs = {}
+        for k, v in value.items():
+            key = to_monkey(k)
+            if not isinstance(key, Hashable):
+                raise TypeError(f"unusable as hash key: {type(k).__name__}")
+            pairs[key.hash_key()] = HashPair(key, to_monkey(v))
+        return Hash(pairs)
+    raise TypeError(f"no Monkey value for {type(value).__name__}")
+
+
+def to_python(obj: Object) -> Any:
+    # functions, builtins and sequences have no Python counterpart and are returned as they are
+    if isinstance(obj, (Integer, Float, String)):
+        return obj.value
+    elif isinstance(obj, Boolean):
+        return obj.value
+    elif isinstance(obj, Null):
+        return None
+    elif isinstance(obj, Array):
+        return [to_python(e) for e in obj.iterate()]
+    elif isinstance(obj, Range):
+        return obj.values
+    elif isinstance(obj, Hash):
+        return {to_python(pair.key): to_python(pair.value) for pair in obj.pairs.values()}
+    return obj
+
+
+class Compiled:
+    # A parsed (and possibly optimized) program, run with Interpreter.run as often as needed without re-parsing.
+    # warnings lists the operations type inference found can only fail, when optimized. Optimizing assumes nothing
+    # about the globals bound when compiling; compile again after setting others the program also binds.
+    def __init__(self, program: Program, report: list[str], warnings: list[str]):
+        self.program = program
+        self.report = report
+        self.warnings = warnings
+
+
+# Hosts Monkey in a Python application. Each Interpreter has its own global environment, kept between calls, so
+# scripts loaded into it define functions that can then be called from Python with plain Python values. A Budget
+# given to the constructor limits every evaluation; one given to a single call replaces it for that call.
+# Evaluations going over budget raise BudgetExceededError, other Monkey errors MonkeyError.
+class Interpreter:
+    def __init__(self, budget: Budget | None = None, optimized: bool = False):
+        self.budget = budget
+        self.optimized = optimized
+        self.env: Environment = new_environment()
+
+    def reset(self):
+        self.env = new_environment()
+
+    def compile(self, source: str) -> Compiled:
+        parser = Parser(Lexer(source))
+        try:
+            program = parser.parse_program()
+        except AssertionError:
+            # the parser gives up on some malformed input after recording what it expected
+            raise ParseError(parser.get_errors() or ["unexpected end of input"]) from None
+        if parser.get_errors():
+            raise ParseError(parser.get_errors())
+        # the host can set globals to anything, so type inference must not assume the types of those already bound,
+        # and can call any global function with anything
+        report, warnings = (
+            optimize(program, self.env.store.keys(), global_names(program)) if self.optimized else ([], [])
+        )
+        return Compiled(program, report, warnings)
+
+    def run(self, compiled: Compiled, budget: Budget | None = None) -> Any:
+        return self.result(self.within(budget, lambda: evaluator.evaluate(compiled.program, self.env)))
+
+    def eval(self, source: str, budget: Budget | None = None) -> Any:
+        return self.run(self.compile(source), budget)
+
+    def call(self, function: str | Object, *args: Any, budget: Budget | None = None) -> Any:
+        fn = self.lookup(function) if isinstance(function, str) else function
+        if not isinstance(fn, (Function, BuiltIn)):
+            raise TypeError(f"not a function: {fn.type().value}")
+        if isinstance(fn, Function) and len(args) != len(fn.parameters):
+            raise TypeError(f"function takes {len(fn.parameters)} arguments, got {len(args)}")
+        arguments = [to_monkey(arg) for arg in args]
+        return self.result(self.within(budget, lambda: evaluator.apply_function(fn, arguments)))
+
+    def lookup(self, name: str) -> Object:
+        value, ok = self.env.get(name)
+        if not ok:
+            value = builtin_funcs.get(name)
+        if value is None:
+            raise NameError(f"identifier not found: {name}")
+        return value
+
+    def get(self, name: str) -> Any:
+        return to_python(self.lookup(name))
+
+    def set(self, name: str, value: Any):
+        self.env.set(name, to_monkey(value))
+
+    def within(self, budget: Budget | None, run: Callable[[], Object]) -> Object:
+        budget = budget or self.budget
+        return run() if budget is None else run_within(budget, run)
+
+    def result(self, obj: Object | None) -> Any:
+        if isinstance(obj, BudgetError):
+            raise BudgetExceededError(obj)
+        if isinstance(obj, Error):
+            raise MonkeyError(obj)
+        return None if obj is None else to_python(obj)
@@ -7,9 +7,14 @@ class Lexer:
         self.position = 0
         self.read_position = 0
         self.ch = ""
+        self.line = 1
+        self.line_start = 0
         self.read_char()
 
     def read_char(self):
+        if self.ch == "\n":
+            self.line += 1
+            self.line_start = self.read_position
         if self.read_position >= len(self.input):
             self.ch = "\0"
         else:
@@ -25,6 +30,12 @@ class Lexer:
 
     def next_token(self) -> Token:
         self.skip_whitespace()
+        line, column = self.line, self.position - self.line_start + 1
+        tok = self.read_token()
+        tok.line, tok.column = line, column
+        return tok
+
+    def read_token(self) -> Token:
         tok: Token
 
         if self.ch == "=":
@@ -83,7 +94,11 @@ class Lexer:
                 tok_type = lookup_ident(literal)
                 return Token(tok_type, literal)
             elif self.is_digit(self.ch):
-                return Token(TokenType.INT, self.read_number())
+                literal = self.read_number()
+                if self.ch == "." and self.is_digit(self.peek_char()):
+                    self.read_char()
+                    return Token(TokenType.FLOAT, f"{literal}.{self.read_number()}")
+                return Token(TokenType.INT, literal)
             else:
                 tok = self.new_token(TokenType.ILLEGAL, self.ch)
 
@@ -1,6 +1,254 @@
+import argparse
+import asyncio
+import contextlib
+import cProfile
+import json
 import sys
+import time
+from typing import TextIO
 
+from src.evaluator.budget import Budget, evaluate_with_budget
+from src.evaluator.evaluator import evaluate
+from src.evaluator.parallel import default_workers
+from src.evaluator.profiler import Profiler
+from src.evaluator.sampler import LineSampler
+from src.lexer.lexer import Lexer
+from src.object.environment import new_environment
+from src.object.object import Error
+from src.optimizer.pipeline import optimize
+from src.parser.parser import Parser
+from src.parser.parser_tracing import ParserTracer
 from src.repl.repl import monkey_repl
+from src.server.client import Client
+from src.server.server import Server
+from src.tokens.tokens import Token, TokenType
+
+ENGINES = ["tree", "optimized"]
+DEFAULT_PORT = 7878
+
+
+class ReplayLexer(Lexer):
+    # hands the parser tokens lexed up front, so lexing and parsing can be timed separately
+    def __init__(self, tokens: list[Token]):
+        super().__init__("")
+        self.tokens = tokens
+        self.position = 0
+
+    def next_token(self) -> Token:
+        # the last token is EOF, and the parser may ask for it more than once
+        token = self.tokens[min(self.position, len(self.tokens) - 1)]
+        self.position += 1
+        return token
+
+
+def tokenize(source: str) -> list[Token]:
+    lexer = Lexer(source)
+    tokens = [lexer.next_token()]
+    while tokens[-1].type != TokenType.EOF:
+        tokens.append(lexer.next_token())
+    return tokens
+
+
+def peak_memory_mib() -> float | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(source: str, args: argparse.Namespace, out: TextIO) -> int:
+    timings: list[tuple[str, float]] = []
+
+    start = time.perf_counter()
+    tokens = tokenize(source)
+    timings.append(("lex", time.perf_counter() - start))
+
+    start = time.perf_counter()
+    parser = Parser(ReplayLexer(tokens))
+    tracer = ParserTracer() if args.parse_stats else None
+    if tracer is not None:
+        tracer.attach(parser)
+    program = parser.parse_program()
+    timings.append(("parse", time.perf_counter() - start))
+    if tracer is not None:
+        out.write(tracer.report())
+    if parser.get_errors():
+        for msg in parser.get_errors():
+            out.write(f"parser error: {msg}\n")
+        return 1
+
+    if args.engine == "optimized":
+        start = time.perf_counter()
+        report, diagnostics = optimize(program)
+        timings.append(("optimize", time.perf_counter() - start))
+        if args.report:
+            for line in report:
+                out.write(f"optimize: {line}\n")
+        for line in diagnostics:
+            out.write(f"type warning: {line}\n")
+
+    profiler = cProfile.Profile() if args.profile else None
+    function_profiler = Profiler() if args.functions or args.flamegraph else None
+    sampler = LineSampler() if args.lines else None
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    if function_profiler is not None:
+        function_profiler.start()
+    if sampler is not None:
+        sampler.start()
+    budget = Budget(args.max_steps, args.timeout, args.max_depth, args.max_size)
+    limited = any(limit is not None for limit in vars(budget).values())
+    env = new_environment()
+    evaluated = evaluate_with_budget(program, env, budget) if limited else evaluate(program, env)
+    if sampler is not None:
+        sampler.stop()
+    if function_profiler is not None:
+        function_profiler.stop()
+    if profiler is not None:
+        profiler.disable()
+    timings.append(("eval", time.perf_counter() - start))
+
+    if profiler is not None:
+        profiler.dump_stats(args.profile)
+    if function_profiler is not None:
+        if args.functions:
+            out.write(function_profiler.report())
+        if args.flamegraph:
+            with open(args.flamegraph, "w") as f:
+                f.write(function_profiler.collapsed())
+    if sampler is not None:
+        out.write(f"{sampler.samples} samples\n")
+        out.write(sampler.annotate(source))
+    if args.time:
+        for phase, seconds in timings:
+            out.write(f"{phase:<10}{seconds:.4f}s\n")
+        peak = peak_memory_mib()
+        if peak is not None:
+            out.write(f"{'peak':<10}{peak:.1f} MiB\n")
+
+    if isinstance(evaluated, Error):
+        out.write(f"{evaluated.inspect()}\n")
+        return 1
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.main", description="Monkey interpreter")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("repl", help="start the interactive prompt (the default)")
+    runner = commands.add_parser("run", help="run a script; the program's output goes to stdout, reports to stderr")
+    runner.add_argument("file", nargs="?", default="-", help="script to run, or - to read stdin (the default)")
+    runner.add_argument("--time", action="store_true", help="report wall time per phase and peak memory")
+    runner.add_argument("--profile", metavar="PATH", help="write cProfile stats of evaluation to PATH")
+    runner.add_argument("--functions", action="store_true", help="report calls and time per Monkey function")
+    runner.add_argument("--flamegraph", metavar="PATH", help="write Monkey call stacks in collapsed format to PATH")
+    runner.add_argument("--lines", action="store_true", help="sample the running line and print an annotated listing")
+    runner.add_argument("--parse-stats", action="store_true", help="report calls, time and tokens per parse function")
+    add_budget_arguments(runner)
+    runner.add_argument("--engine", choices=ENGINES, default="tree", help="evaluate as parsed or optimize first")
+    runner.add_argument("--report", action="store_true", help="print what the optimizer changed")
+
+    server = commands.add_parser("serve", help="serve scripts and calls sent as JSON lines to a pool of workers")
+    add_address_arguments(server)
+    server.add_argument("--workers", type=int, default=default_workers(), help="worker processes (default: CPUs)")
+    server.add_argument("--max-waiting", type=int, default=1000, help="requests queued for a worker before refusing")
+    server.add_argument("--max-pipeline", type=int, default=64, help="unanswered requests read from one connection")
+    add_budget_arguments(server, "per request")
+
+    sender = commands.add_parser("send", help="run a script on a server; prints its output, then the value as JSON")
+    sender.add_argument("file", nargs="?", default="-", help="script to send, or - to read stdin (the default)")
+    add_address_arguments(sender)
+    sender.add_argument("--call", metavar="NAME", help="load the script and call the function NAME")
+    sender.add_argument("--args", default="[]", metavar="JSON", help="arguments for --call, as a JSON list")
+    sender.add_argument("--stats", action="store_true", help="print the server's stats instead of sending a script")
+    add_budget_arguments(sender)
+    return parser
+
+
+def add_budget_arguments(parser: argparse.ArgumentParser, scope: str = ""):
+    suffix = f" ({scope})" if scope else ""
+    parser.add_argument("--max-steps", type=int, metavar="N", help="stop after evaluating N nodes" + suffix)
+    parser.add_argument("--timeout", type=float, metavar="SECONDS", help="stop after running this long" + suffix)
+    parser.add_argument("--max-depth", type=int, metavar="N", help="stop when calls nest deeper than N" + suffix)
+    parser.add_argument(
+        "--max-size", type=int, metavar="N", help="stop when an array, hash or string exceeds N" + suffix
+    )
+
+
+def add_address_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--socket", metavar="PATH", help="Unix socket to use instead of TCP")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port (default: %(default)s)")
+
+
+async def serve(args: argparse.Namespace, out: TextIO):
+    limits = Budget(args.max_steps, args.timeout, args.max_depth, args.max_size)
+    server = Server(args.workers, limits, args.max_waiting, args.max_pipeline)
+    try:
+        if args.socket:
+            await server.start_unix(args.socket)
+        else:
+            await server.start_tcp(args.host, args.port)
+        out.write(f"serving on {', '.join(map(str, server.addresses()))} with {args.workers} workers\n")
+        out.flush()
+        await asyncio.Event().wait()
+    finally:
+        out.write(json.dumps(server.stats.snapshot()) + "\n")
+        await server.close()
+
+
+async def send(source: str, args: argparse.Namespace, out: TextIO, err: TextIO) -> int:
+    if args.socket:
+        client = await Client.connect_unix(args.socket)
+    else:
+        client = await Client.connect_tcp(args.host, args.port)
+    try:
+        if args.stats:
+            out.write(json.dumps(await client.stats()) + "\n")
+            return 0
+        budget = {
+            field: limit
+            for field, limit in vars(Budget(args.max_steps, args.timeout, args.max_depth, args.max_size)).items()
+            if limit is not None
+        }
+        if args.call:
+            reply = await client.call(source, args.call, json.loads(args.args), budget)
+        else:
+            reply = await client.eval(source, budget)
+    finally:
+        await client.close()
+    out.write(reply.get("output", ""))
+    if not reply["ok"]:
+        # worded like the errors of the run command
+        err.write(f"{'parser error' if reply['kind'] == 'parse' else 'ERROR'}: {reply['error']}\n")
+        return 1
+    out.write(json.dumps(reply["value"]) + "\n")
+    return 0
+
+
+def main(argv: list[str]) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "serve":
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(serve(args, sys.stderr))
+        return 0
+    if args.command not in ("run", "send"):
+        monkey_repl(sys.stdin, sys.stdout)
+        return 0
+    if args.command == "send" and args.stats:
+        source = ""
+    elif args.file == "-":
+        source = sys.stdin.read()
+    else:
+        with open(args.file) as f:
+            source = f.read()
+    if args.command == "send":
+        return asyncio.run(send(source, args, sys.stdout, sys.stderr))
+    return run(source, args, sys.stderr)
+
 
 if __name__ == "__main__":
-    monkey_repl(sys.stdin, sys.stdout)
+    sys.exit(main(sys.argv[1:]))
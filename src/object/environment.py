@@ -8,6 +8,10 @@ class Environment:
     def __init__(self, outer: Optional["Environment"] = None):
         self.store: dict[str, "Object"] = {}
         self.outer = outer
+        # what the code running in this environment may bind (None if unknown) and which of those bindings
+        # never change once set; closures use this to copy values instead of holding the whole scope
+        self.declared_names: frozenset[str] | None = None
+        self.stable_names: frozenset[str] = frozenset()
 
     def get(self, name: str) -> tuple[Optional["Object"], bool]:
         obj: "Object" | None = self.store.get(name)
@@ -19,11 +23,56 @@ class Environment:
         self.store[name] = val
         return val
 
+    def owner(self, name: str) -> Optional["Environment"]:
+        env: Environment | None = self
+        while env is not None:
+            if name in env.store:
+                return env
+            env = env.outer
+        return None
+
+    def assign(self, name: str, val: "Object") -> bool:
+        env: Environment | None = self
+        while env is not None:
+            if name in env.store:
+                env.store[name] = val
+                return True
+            env = env.outer
+        return False
+
 
 def new_enclosed_environment(outer: Environment) -> Environment:
     env = Environment(outer=outer)
     return env
 
 
+# Call frames of functions that never create a closure can't be referenced once the call returns, so they are
+# recycled through this free list instead of allocating an Environment and its dict on every call. 0 disables it.
+FRAME_POOL_SIZE = 256
+frame_pool: list[Environment] = []
+
+
+def acquire_frame(outer: Environment) -> Environment:
+    if frame_pool:
+        env = frame_pool.pop()
+        env.outer = outer
+        return env
+    return Environment(outer=outer)
+
+
+def release_frame(env: Environment):
+    # drop the bindings now so the frame doesn't keep their values alive while it sits in the pool
+    env.store.clear()
+    env.outer = None
+    if len(frame_pool) < FRAME_POOL_SIZE:
+        frame_pool.append(env)
+
+
+def global_environment(env: Environment) -> Environment:
+    while env.outer is not None:
+        env = env.outer
+    return env
+
+
 def new_environment() -> Environment:
     return Environment()
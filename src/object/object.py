@@ -1,10 +1,14 @@
 import enum
 import hashlib
-from typing import Callable
+from array import array
+from collections import OrderedDict
+from typing import Callable, Iterator
 
 from src.ast.ast import BlockStatement, Identifier
 from src.object.environment import Environment
 
+INT64_MIN, INT64_MAX = -(2**63), 2**63 - 1
+
 # Define BuiltinFunction as a callable that takes any number of arguments and returns an Object
 BuiltinFunction = Callable[..., "Object"]
 
@@ -13,6 +17,7 @@ class ObjectType(enum.Enum):
     NULL = "NULL"
     ERROR = "ERROR"
     INTEGER = "INTEGER"
+    FLOAT = "FLOAT"
     BOOLEAN = "BOOLEAN"
     STRING = "STRING"
     RETURN_VALUE = "RETURN_VALUE"
@@ -20,6 +25,8 @@ class ObjectType(enum.Enum):
     BUILTIN = "BUILTIN"
     ARRAY = "ARRAY"
     HASH = "HASH"
+    RANGE = "RANGE"
+    SEQUENCE = "SEQUENCE"
 
 
 class HashKey:
@@ -65,6 +72,17 @@ class Integer(Object, Hashable):
         return HashKey(self.type().value, self.value)
 
 
+class Float(Object):
+    def __init__(self, value: float):
+        self.value = value
+
+    def type(self) -> ObjectType:
+        return ObjectType.FLOAT
+
+    def inspect(self) -> str:
+        return str(self.value)
+
+
 class Boolean(Object, Hashable):
     def __init__(self, value: bool):
         self.value = value
@@ -110,11 +128,17 @@ class Error(Object):
         return f"ERROR: {self.message}"
 
 
+class BudgetError(Error):
+    # An evaluation stopped because it went over its budget, as opposed to an error in the program itself.
+    pass
+
+
 class Function(Object):
-    def __init__(self, parameters: list[Identifier], body: BlockStatement, env: Environment):
+    def __init__(self, parameters: list[Identifier], body: BlockStatement, env: Environment, name: str = ""):
         self.parameters = parameters
         self.body = body
         self.env = env
+        self.name = name
 
     def type(self) -> ObjectType:
         return ObjectType.FUNCTION
@@ -126,9 +150,89 @@ class Function(Object):
         return f"fn({params_str}) {{\n{body_str}\n}}"
 
 
+# Strings shorter than this are joined eagerly on concat; a rope node would cost more than the copy.
+ROPE_THRESHOLD = 256
+
+
 class String(Object, Hashable):
+    # A String is one of: flat text, a rope node joining two Strings, or a view onto a slice of a larger str.
+    # Ropes and views are turned into flat text the first time .value is needed.
     def __init__(self, value: str):
-        self.value = value
+        self.flat: str | None = value
+        self.parts: tuple["String", "String"] | None = None
+        self.source: str | None = None
+        self.offset = 0
+        self.length = len(value)
+
+    @classmethod
+    def concat(cls, left: "String", right: "String") -> "String":
+        if left.length == 0:
+            return right
+        if right.length == 0:
+            return left
+        if left.length + right.length < ROPE_THRESHOLD:
+            return cls(left.value + right.value)
+        if left.parts is not None and right.flat is not None:
+            # appending a short piece: fold it into the rope's last leaf instead of adding a tiny node
+            head, tail = left.parts
+            if tail.flat is not None and tail.length + right.length < ROPE_THRESHOLD:
+                return cls.concat(head, cls(tail.flat + right.flat))
+        node = cls.__new__(cls)
+        node.flat = None
+        node.parts = (left, right)
+        node.source = None
+        node.offset = 0
+        node.length = left.length + right.length
+        return node
+
+    @classmethod
+    def view(cls, source: str, start: int, end: int) -> "String":
+        # keeps source alive until the view is flattened; no characters are copied here
+        if start == 0 and end == len(source):
+            return cls(source)
+        node = cls.__new__(cls)
+        node.flat = None
+        node.parts = None
+        node.source = source
+        node.offset = start
+        node.length = max(end - start, 0)
+        return node
+
+    def span(self) -> tuple[str, int, int]:
+        # the buffer holding this string's characters and their bounds in it, without copying
+        if self.source is not None:
+            return self.source, self.offset, self.offset + self.length
+        return self.value, 0, self.length
+
+    def substring(self, start: int, end: int) -> "String":
+        source, offset, _ = self.span()
+        return String.view(source, offset + start, offset + end)
+
+    @property
+    def value(self) -> str:
+        if self.flat is None:
+            self.flatten()
+        assert self.flat is not None
+        return self.flat
+
+    def flatten(self):
+        # iterative so that long left-leaning chains built by `s = s + x` don't hit the recursion limit
+        pieces: list[str] = []
+        stack: list[String] = [self]
+        while stack:
+            node = stack.pop()
+            if node.flat is not None:
+                pieces.append(node.flat)
+            elif node.source is not None:
+                pieces.append(node.source[node.offset : node.offset + node.length])
+            else:
+                assert node.parts is not None
+                left, right = node.parts
+                stack.append(right)
+                stack.append(left)
+        self.flat = "".join(pieces)
+        self.parts = None
+        self.source = None
 
     def type(self) -> ObjectType:
         return ObjectType.STRING
@@ -153,27 +257,180 @@ class BuiltIn(Object):
         return "builtin function"
 
 
+class Memoized(BuiltIn):
+    # A Function wrapped by the memoize builtin; cache maps argument hash keys to results in LRU order. Misses call
+    # callee, the function with the names it calls itself by bound to this wrapper.
+    def __init__(self, fn: BuiltinFunction, function: Function, max_entries: int):
+        super().__init__(fn)
+        self.function = function
+        self.callee = function
+        self.max_entries = max_entries
+        self.cache: OrderedDict[tuple[HashKey, ...], Object] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def inspect(self) -> str:
+        return f"memoized {self.function.inspect()}"
+
+
+# Arrays of at least this many integers are stored unboxed; for shorter ones boxing on every access would cost
+# more than the memory saved.
+INT_ARRAY_THRESHOLD = 32
+
+
 class Array(Object):
+    # Elements are either a list of objects or, when every element is an integer that fits in 64 bits, a compact
+    # array('q') buffer of 8 bytes per element. The buffer is picked automatically, elements are boxed back into
+    # Integers as they are read, and pushing anything else gives a boxed array.
     def __init__(self, elements: list[Object]):
-        self.elements = elements
+        self.boxed: list[Object] | None = elements
+        self.ints: "array[int] | None" = None
+        if len(elements) >= INT_ARRAY_THRESHOLD and all(type(e) is Integer for e in elements):
+            try:
+                self.ints = array("q", [e.value for e in elements])  # type: ignore
+                self.boxed = None
+            except OverflowError:
+                pass
+
+    @classmethod
+    def of_ints(cls, values: "array[int]") -> "Array":
+        arr = cls([])
+        arr.boxed = None
+        arr.ints = values
+        return arr
+
+    @classmethod
+    def of_range(cls, values: range) -> "Array":
+        # skips boxing every element only to unbox it again
+        if len(values) >= INT_ARRAY_THRESHOLD:
+            try:
+                return cls.of_ints(array("q", values))
+            except OverflowError:
+                pass
+        return cls([Integer(v) for v in values])
+
+    @property
+    def elements(self) -> list[Object]:
+        # O(n) for compact arrays; use length/get/iterate where possible
+        if self.ints is not None:
+            return [Integer(v) for v in self.ints]
+        assert self.boxed is not None
+        return self.boxed
+
+    def length(self) -> int:
+        return len(self.ints) if self.ints is not None else len(self.boxed)  # type: ignore
+
+    def get(self, idx: int) -> Object:
+        if self.ints is not None:
+            return Integer(self.ints[idx])
+        assert self.boxed is not None
+        return self.boxed[idx]
+
+    def iterate(self) -> Iterator[Object]:
+        if self.ints is not None:
+            return (Integer(v) for v in self.ints)
+        assert self.boxed is not None
+        return iter(self.boxed)
+
+    def slice(self, start: int | None, end: int | None, step: int | None = None) -> "Array":
+        if self.ints is not None:
+            return Array.of_ints(self.ints[start:end:step])
+        assert self.boxed is not None
+        return Array(self.boxed[start:end:step])
+
+    def push(self, obj: Object) -> "Array":
+        if self.ints is not None and type(obj) is Integer and INT64_MIN <= obj.value <= INT64_MAX:  # type: ignore
+            values = array("q", self.ints)
+            values.append(obj.value)  # type: ignore
+            return Array.of_ints(values)
+        return Array(self.elements + [obj])
 
     def type(self) -> ObjectType:
         return ObjectType.ARRAY
 
     def inspect(self) -> str:
-        elements_str = ", ".join([e.inspect() for e in self.elements])
+        elements_str = ", ".join([e.inspect() for e in self.iterate()])
         return f"[{elements_str}]"
 
 
+class Range(Object):
+    def __init__(self, values: range):
+        self.values = values
+
+    def type(self) -> ObjectType:
+        return ObjectType.RANGE
+
+    def inspect(self) -> str:
+        r = self.values
+        return f"range({r.start}, {r.stop}, {r.step})"
+
+
+class Sequence(Object):
+    # source builds a fresh generator each time, so a pipeline can be walked more than once
+    def __init__(self, source: Callable[[], Iterator[Object]]):
+        self.source = source
+
+    def iterate(self) -> Iterator[Object]:
+        return self.source()
+
+    def type(self) -> ObjectType:
+        return ObjectType.SEQUENCE
+
+    def inspect(self) -> str:
+        return "sequence"
+
+
 class HashPair:
     def __init__(self, key: Object, value: Object):
         self.key = key
         self.value = value
 
 
+class Shape:
+    # Key layout shared by every record-like hash with the same constant string keys, in literal order.
+    def __init__(self, keys: tuple[str, ...]):
+        self.keys = keys
+        self.slots: dict[str, int] = {key: slot for slot, key in enumerate(keys)}
+        self.key_objects: list[String] = [String(key) for key in keys]
+        self.hash_keys: list[HashKey] = [key.hash_key() for key in self.key_objects]
+
+
+shapes: dict[tuple[str, ...], Shape] = {}
+
+
+def get_shape(keys: tuple[str, ...]) -> Shape:
+    shape = shapes.get(keys)
+    if shape is None:
+        shape = Shape(keys)
+        shapes[keys] = shape
+    return shape
+
+
 class Hash(Object):
     def __init__(self, pairs: dict[HashKey, HashPair]):
-        self.pairs = pairs
+        self._pairs: dict[HashKey, HashPair] | None = pairs
+        self.shape: Shape | None = None
+        self.values: list[Object] = []
+
+    @classmethod
+    def record(cls, shape: Shape, values: list[Object]) -> "Hash":
+        # pairs are only built if something needs the generic dict view
+        h = cls.__new__(cls)
+        h._pairs = None
+        h.shape = shape
+        h.values = values
+        return h
+
+    @property
+    def pairs(self) -> dict[HashKey, HashPair]:
+        if self._pairs is None:
+            assert self.shape is not None
+            self._pairs = {
+                hashed: HashPair(key, value)
+                for hashed, key, value in zip(self.shape.hash_keys, self.shape.key_objects, self.values)
+            }
+        return self._pairs
 
     def type(self) -> ObjectType:
         return ObjectType.HASH
@@ -181,3 +438,8 @@ class Hash(Object):
     def inspect(self) -> str:
         pairs_str = ", ".join([f"{pair.key.inspect()}: {pair.value.inspect()}" for pair in self.pairs.values()])
         return f"{{{pairs_str}}}"
+
+
+TRUE = Boolean(True)
+FALSE = Boolean(False)
+NULL = Null()
@@ -0,0 +1,186 @@
+import sys
+from typing import Hashable, TextIO
+
+from src.ast.ast import (
+    ArrayLiteral,
+    AssignStatement,
+    BlockStatement,
+    BooleanLiteral,
+    CallExpression,
+    Expression,
+    FloatLiteral,
+    ForExpression,
+    FunctionLiteral,
+    HashLiteral,
+    Identifier,
+    IfExpression,
+    IndexExpression,
+    InfixExpression,
+    IntegerLiteral,
+    LetStatement,
+    Node,
+    PrefixExpression,
+    Program,
+    StringLiteral,
+    WhileExpression,
+)
+from src.optimizer.purity import PurityAnalysis
+from src.optimizer.walk import bound_names, children, map_children, walk
+from src.tokens.tokens import Token, TokenType
+
+# Hoisted values are bound to names the lexer can't produce (identifiers never contain digits), so they can't
+# collide with user bindings.
+TEMP_PREFIX = "__cse"
+
+
+def node_key(node: Node) -> Hashable:
+    # structural identity; str() is not enough as it prints "x" and x the same way
+    if isinstance(node, Identifier):
+        return ("ident", node.value)
+    elif isinstance(node, IntegerLiteral):
+        return ("int", node.value)
+    elif isinstance(node, FloatLiteral):
+        return ("float", node.value)
+    elif isinstance(node, StringLiteral):
+        return ("str", node.value)
+    elif isinstance(node, BooleanLiteral):
+        return ("bool", node.value)
+    elif isinstance(node, (PrefixExpression, InfixExpression)):
+        return (type(node).__name__, node.operator, *[node_key(c) for c in children(node)])
+    return (type(node).__name__, *[node_key(c) for c in children(node)])
+
+
+def is_candidate_shape(node: Node) -> bool:
+    # only expressions that contain a call are worth a binding, and literals that allocate are left alone because
+    # == compares arrays, hashes and functions by identity
+    if not isinstance(node, (CallExpression, InfixExpression, PrefixExpression, IndexExpression)):
+        return False
+    has_call = False
+    for n in walk(node):
+        if isinstance(n, (FunctionLiteral, ArrayLiteral, HashLiteral, IfExpression, WhileExpression, ForExpression)):
+            return False
+        has_call = has_call or isinstance(n, CallExpression)
+    return has_call
+
+
+class Occurrence:
+    def __init__(self, node: Expression, statement: int, conditional: bool):
+        self.node = node
+        self.statement = statement
+        self.conditional = conditional
+
+
+def collect_occurrences(node: Node, statement: int, conditional: bool, found: dict[Hashable, list[Occurrence]]):
+    if isinstance(node, FunctionLiteral):
+        return
+    if isinstance(node, Expression) and is_candidate_shape(node):
+        found.setdefault(node_key(node), []).append(Occurrence(node, statement, conditional))
+    if isinstance(node, IfExpression):
+        collect_occurrences(node.condition, statement, conditional, found)
+        collect_occurrences(node.consequence, statement, True, found)
+        if node.alternative is not None:
+            collect_occurrences(node.alternative, statement, True, found)
+    elif isinstance(node, (WhileExpression, ForExpression)):
+        head = node.condition if isinstance(node, WhileExpression) else node.iterable
+        collect_occurrences(head, statement, conditional, found)
+        collect_occurrences(node.body, statement, True, found)
+    else:
+        for child in children(node):
+            collect_occurrences(child, statement, conditional, found)
+
+
+class CommonSubexpressionEliminator:
+    def __init__(self, program: Program):
+        self.program = program
+        self.purity = PurityAnalysis(program)
+        self.temp_count = 0
+        self.report: list[str] = []
+
+    def run(self) -> list[str]:
+        for node in list(walk(self.program)):
+            if isinstance(node, FunctionLiteral):
+                while self.eliminate_one(node):
+                    pass
+        return self.report
+
+    def function_label(self, fn: FunctionLiteral) -> str:
+        name = self.purity.names.get(fn)
+        params = ", ".join(str(p) for p in fn.parameters)
+        return f"{name}" if name is not None else f"fn({params})"
+
+    def is_stable(self, node: Node, fn: FunctionLiteral, first_statement: int) -> bool:
+        # every identifier must denote the same value at each occurrence: never reassigned and, when bound by
+        # this function's own lets, bound before the first occurrence
+        let_positions: dict[str, list[int]] = {}
+        for idx, stmt in enumerate(fn.body.statements):
+            for n in walk(stmt, into_functions=False):
+                if isinstance(n, LetStatement):
+                    let_positions.setdefault(n.name.value, []).append(idx)
+                elif isinstance(n, ForExpression):
+                    let_positions.setdefault(n.variable.value, []).append(idx)
+        assigned = {n.name.value for n in walk(fn.body) if isinstance(n, AssignStatement)}
+        for n in walk(node):
+            if not isinstance(n, Identifier):
+                continue
+            if n.value in assigned or n.value in self.purity.mutable_names:
+                return False
+            if any(pos >= first_statement for pos in let_positions.get(n.value, [])):
+                return False
+        return True
+
+    def eliminate_one(self, fn: FunctionLiteral) -> bool:
+        statements = fn.body.statements
+        found: dict[Hashable, list[Occurrence]] = {}
+        for idx, stmt in enumerate(statements):
+            collect_occurrences(stmt, idx, False, found)
+
+        local_names = bound_names(fn)
+        best: list[Occurrence] | None = None
+        for occurrences in found.values():
+            first = occurrences[0]
+            if len(occurrences) < 2 or first.conditional:
+                continue
+            if not self.purity.is_pure(first.node, local_names):
+                continue
+            if isinstance(first.node, CallExpression) and self.purity.call_allocates(first.node):
+                continue
+            if not self.is_stable(first.node, fn, first.statement):
+                continue
+            if best is None or len(str(first.node)) > len(str(best[0].node)):
+                best = occurrences
+        if best is None:
+            return False
+
+        first = best[0]
+        name = f"{TEMP_PREFIX}{self.temp_count}"
+        self.temp_count += 1
+        key = node_key(first.node)
+
+        def replace(node: Node) -> Node:
+            if isinstance(node, FunctionLiteral):
+                return node
+            if isinstance(node, Expression) and node_key(node) == key:
+                return Identifier(token=Token(TokenType.IDENT, name), value=name)
+            map_children(node, replace)
+            return node
+
+        block: BlockStatement = fn.body
+        block.statements = statements[: first.statement] + [
+            replace(s) for s in statements[first.statement :]  # type: ignore
+        ]
+        let = LetStatement(
+            token=Token(TokenType.LET, "let"),
+            name=Identifier(token=Token(TokenType.IDENT, name), value=name),
+            value=first.node,
+        )
+        block.statements.insert(first.statement, let)
+        self.report.append(f"{self.function_label(fn)}: {first.node} evaluated {len(best)} times, now once as {name}")
+        return True
+
+
+def eliminate_common_subexpressions(program: Program, debug: bool = False, out: TextIO = sys.stderr) -> list[str]:
+    report = CommonSubexpressionEliminator(program).run()
+    if debug:
+        for line in report:
+            out.write(f"cse: {line}\n")
+    return report
@@ -0,0 +1,94 @@
+import math
+
+from src.ast.ast import (
+    BooleanLiteral,
+    Expression,
+    ExpressionStatement,
+    FloatLiteral,
+    IfExpression,
+    InfixExpression,
+    IntegerLiteral,
+    Node,
+    PrefixExpression,
+    StringLiteral,
+)
+from src.evaluator.evaluator import eval_infix_expression, eval_prefix_expression, is_truthy
+from src.object.object import FALSE, TRUE, Boolean, Float, Integer, Object, String
+from src.optimizer.walk import map_children
+from src.tokens.tokens import Token, TokenType
+
+Literal = IntegerLiteral | FloatLiteral | StringLiteral | BooleanLiteral
+
+
+def is_literal(node: Expression) -> bool:
+    return isinstance(node, Literal)
+
+
+def literal_object(node: Literal) -> Object:
+    if isinstance(node, IntegerLiteral):
+        return Integer(node.value)
+    elif isinstance(node, FloatLiteral):
+        return Float(node.value)
+    elif isinstance(node, StringLiteral):
+        return String(node.value)
+    return TRUE if node.value else FALSE
+
+
+def literal_for(obj: Object) -> Literal | None:
+    # None for errors and values without a literal form; those are left for the runtime
+    if isinstance(obj, Integer):
+        return IntegerLiteral(token=Token(TokenType.INT, str(obj.value)), value=obj.value)
+    elif isinstance(obj, Float) and math.isfinite(obj.value):
+        return FloatLiteral(token=Token(TokenType.FLOAT, str(obj.value)), value=obj.value)
+    elif isinstance(obj, String):
+        return StringLiteral(token=Token(TokenType.STRING, obj.value), value=obj.value)
+    elif isinstance(obj, Boolean):
+        token = Token(TokenType.TRUE, "true") if obj.value else Token(TokenType.FALSE, "false")
+        return BooleanLiteral(token=token, value=obj.value)
+    return None
+
+
+# Evaluates operators whose operands are all literals and picks the branch of an if whose condition is a literal.
+# folds counts the rewrites so callers can tell whether folding achieved anything.
+class ConstantFolder:
+    def __init__(self):
+        self.folds = 0
+
+    def fold(self, node: Node) -> Node:
+        map_children(node, self.fold)
+        folded = self.fold_node(node)
+        if folded is None:
+            return node
+        self.folds += 1
+        return folded
+
+    def fold_node(self, node: Node) -> Node | None:
+        # the evaluator's own operator functions compute the folded value, so folding can't disagree with it
+        if isinstance(node, InfixExpression):
+            left, right = node.left, node.right
+            if not isinstance(left, Literal) or not isinstance(right, Literal):
+                return None
+            return literal_for(eval_infix_expression(node.operator, literal_object(left), literal_object(right)))
+        elif isinstance(node, PrefixExpression):
+            if not isinstance(node.right, Literal):
+                return None
+            return literal_for(eval_prefix_expression(node.operator, literal_object(node.right)))
+        elif isinstance(node, IfExpression):
+            if not isinstance(node.condition, Literal):
+                return None
+            # there is no null literal, so a false condition without an else is left alone
+            branch = node.consequence if is_truthy(literal_object(node.condition)) else node.alternative
+            if branch is None or len(branch.statements) != 1:
+                return None
+            stmt = branch.statements[0]
+            if not isinstance(stmt, ExpressionStatement):
+                return None
+            return stmt.expression
+        return None
+
+
+def fold_constants(node: Node) -> int:
+    # folds node's children in place and returns the number of rewrites
+    folder = ConstantFolder()
+    map_children(node, folder.fold)
+    return folder.folds
@@ -0,0 +1,58 @@
+from src.ast.ast import (
+    AssignStatement,
+    BlockStatement,
+    ForExpression,
+    FunctionLiteral,
+    Identifier,
+    LetStatement,
+    WhileExpression,
+)
+from src.optimizer.walk import walk
+
+
+class ScopeInfo:
+    # declared: every name a call of the function may bind in its environment (parameters, lets, for variables)
+    # stable: declared names bound exactly once and never reassigned, so their value can be copied into a closure
+    # escapes: the body creates a closure, which may keep the call's environment alive after the call returns
+    def __init__(self, declared: frozenset[str], stable: frozenset[str], escapes: bool):
+        self.declared = declared
+        self.stable = stable
+        self.escapes = escapes
+
+
+def free_names(fn: FunctionLiteral) -> frozenset[str]:
+    # every identifier the function or its nested functions read or assign, minus its parameters. Names the body
+    # binds with let are kept: they may be read before the let runs, and capturing one too many is harmless.
+    if fn.free_names is None:
+        names: set[str] = set()
+        for node in walk(fn.body, into_functions=False):
+            if isinstance(node, Identifier):
+                names.add(node.value)
+            elif isinstance(node, FunctionLiteral):
+                names.update(free_names(node))
+        fn.free_names = frozenset(names - {param.value for param in fn.parameters})
+    return fn.free_names
+
+
+def scope_info(parameters: list[Identifier], body: BlockStatement) -> ScopeInfo:
+    if body.scope_info is None:
+        counts: dict[str, int] = {param.value: 1 for param in parameters}
+        unstable: set[str] = set()
+        escapes = False
+        for node in walk(body, into_functions=False):
+            escapes = escapes or isinstance(node, FunctionLiteral)
+            if isinstance(node, LetStatement):
+                counts[node.name.value] = counts.get(node.name.value, 0) + 1
+            elif isinstance(node, ForExpression):
+                counts[node.variable.value] = counts.get(node.variable.value, 0) + 1
+                unstable.add(node.variable.value)
+            if isinstance(node, (WhileExpression, ForExpression)):
+                # a let inside a loop body rebinds the name on every pass
+                unstable.update(
+                    n.name.value for n in walk(node.body, into_functions=False) if isinstance(n, LetStatement)
+                )
+        # nested closures can assign to this function's bindings too
+        unstable.update(node.name.value for node in walk(body) if isinstance(node, AssignStatement))
+        stable = {name for name, count in counts.items() if count == 1 and name not in unstable}
+        body.scope_info = ScopeInfo(frozenset(counts), frozenset(stable), escapes)
+    return body.scope_info
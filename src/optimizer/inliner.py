@@ -0,0 +1,232 @@
+from src.ast.ast import (
+    AssignStatement,
+    BooleanLiteral,
+    CallExpression,
+    Expression,
+    ExpressionStatement,
+    FloatLiteral,
+    ForExpression,
+    FunctionLiteral,
+    Identifier,
+    IfExpression,
+    IntegerLiteral,
+    LetStatement,
+    Node,
+    Program,
+    ReturnStatement,
+    StringLiteral,
+    WhileExpression,
+)
+from src.optimizer.free_variables import free_names
+from src.optimizer.purity import PurityAnalysis
+from src.optimizer.walk import bound_names, children, clone, map_children, reset_caches, walk
+from src.tokens.tokens import Token, TokenType
+
+# Maximum number of AST nodes in an inlined function's body.
+INLINE_MAX_SIZE = 16
+# Inlining a body can expose more inlinable calls; passes stop when nothing changes or after this many.
+INLINE_MAX_PASSES = 8
+# Renamed binders use names the lexer can't produce (identifiers never contain digits).
+RENAME_PREFIX = "__inl"
+
+
+def body_expression(fn: FunctionLiteral) -> Expression | None:
+    if len(fn.body.statements) != 1:
+        return None
+    stmt = fn.body.statements[0]
+    if isinstance(stmt, ExpressionStatement):
+        return stmt.expression
+    if isinstance(stmt, ReturnStatement):
+        return stmt.return_value
+    return None
+
+
+def is_literal(node: Node) -> bool:
+    return isinstance(node, (IntegerLiteral, FloatLiteral, StringLiteral, BooleanLiteral))
+
+
+def references(node: Node, name: str) -> list[Identifier]:
+    # the identifiers substitute replaces: binders and reads inside a function that binds the name itself resolve
+    # to that function's binding instead
+    found: list[Identifier] = []
+    stack: list[Node] = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, FunctionLiteral) and name in bound_names(current):
+            continue
+        if isinstance(current, Identifier) and current.value == name:
+            found.append(current)
+        stack.extend(children(current))
+    return found
+
+
+class Inliner:
+    def __init__(self, program: Program, max_size: int = INLINE_MAX_SIZE):
+        self.program = program
+        self.max_size = max_size
+        self.rename_count = 0
+        self.report: list[str] = []
+        self.analyze()
+
+    def analyze(self):
+        # earlier passes rewrote function bodies, so drop the analyses cached on them
+        reset_caches(self.program)
+        self.purity = PurityAnalysis(self.program)
+        self.defining_scope: dict[str, FunctionLiteral | None] = {}
+        self.record_scopes(self.program, None)
+
+        calls: dict[str, set[str]] = {}
+        for name, fn in self.purity.functions.items():
+            calls[name] = {
+                n.function.value
+                for n in walk(fn.body)
+                if isinstance(n, CallExpression) and isinstance(n.function, Identifier)
+            }
+        self.recursive: set[str] = set()
+        for name in self.purity.functions:
+            seen: set[str] = set()
+            pending = list(calls[name])
+            while pending:
+                callee = pending.pop()
+                if callee == name:
+                    self.recursive.add(name)
+                    break
+                if callee in calls and callee not in seen:
+                    seen.add(callee)
+                    pending.extend(calls[callee])
+
+    def record_scopes(self, node: Node, scope: FunctionLiteral | None):
+        for child in children(node):
+            if isinstance(child, LetStatement) and child.name.value in self.purity.functions:
+                self.defining_scope[child.name.value] = scope
+            self.record_scopes(child, child if isinstance(child, FunctionLiteral) else scope)
+
+    def run(self) -> list[str]:
+        for _ in range(INLINE_MAX_PASSES):
+            before = len(self.report)
+            self.visit(self.program, [])
+            if len(self.report) == before:
+                break
+            self.analyze()
+        return self.report
+
+    def visit(self, node: Node, enclosing: list[FunctionLiteral]) -> Node:
+        inner = enclosing + [node] if isinstance(node, FunctionLiteral) else enclosing
+        map_children(node, lambda child: self.visit(child, inner))
+        if isinstance(node, CallExpression):
+            inlined = self.try_inline(node, enclosing)
+            if inlined is not None:
+                return inlined
+        return node
+
+    def try_inline(self, call: CallExpression, enclosing: list[FunctionLiteral]) -> Expression | None:
+        callee = call.function
+        if not isinstance(callee, Identifier):
+            return None
+        name = callee.value
+        fn = self.purity.functions.get(name)
+        if fn is None or name in self.recursive or len(call.arguments) != len(fn.parameters):
+            return None
+        body = body_expression(fn)
+        if body is None or sum(1 for _ in walk(body)) > self.max_size:
+            return None
+        # a let or for in one of the body's blocks would bind in the caller's scope once inlined
+        if any(isinstance(n, (LetStatement, ForExpression)) for n in walk(body, into_functions=False)):
+            return None
+
+        # the call must be able to see the definition, and nothing between the two may rebind a name the body reads
+        scope = self.defining_scope.get(name)
+        if scope is not None and scope not in enclosing:
+            return None
+        inner_scopes = enclosing[enclosing.index(scope) + 1 :] if scope is not None else enclosing
+        fn.free_names = None
+        body_names = free_names(fn)
+        if body_names & self.purity.mutable_names:
+            return None
+        for enclosing_fn in inner_scopes:
+            if body_names & bound_names(enclosing_fn):
+                return None
+
+        params = [param.value for param in fn.parameters]
+        if any(isinstance(n, AssignStatement) and n.name.value in params for n in walk(body)):
+            return None
+        uses = {param: references(body, param) for param in params}
+        sheltered = self.sheltered_identifiers(body)
+        local_names = set().union(*(bound_names(f) for f in enclosing)) if enclosing else set()
+        # parameters of the enclosing functions are bound wherever the call runs; reading them can't fail
+        parameters = {param.value for f in enclosing for param in f.parameters}
+        for param, arg in zip(params, call.arguments):
+            # a literal or a read of a bound, never reassigned name can be copied to any number of uses, or dropped
+            if is_literal(arg) or (
+                isinstance(arg, Identifier) and arg.value in parameters and arg.value not in self.purity.mutable_names
+            ):
+                continue
+            # anything else is moved to where the parameter is used, so it must run exactly once, unconditionally
+            if name not in self.purity.pure_functions or not self.purity.is_pure(arg, local_names):
+                return None
+            if len(uses[param]) != 1 or id(uses[param][0]) in sheltered:
+                return None
+
+        self.report.append(f"inlined {name} into {call}")
+        return self.substitute(body, dict(zip(params, call.arguments)))
+
+    def sheltered_identifiers(self, body: Expression) -> set[int]:
+        # identifiers that are evaluated conditionally, repeatedly or later: in a branch, loop body or closure
+        sheltered: set[int] = set()
+        for node in walk(body):
+            guarded: list[Node] = []
+            if isinstance(node, IfExpression):
+                guarded.append(node.consequence)
+                if node.alternative is not None:
+                    guarded.append(node.alternative)
+            elif isinstance(node, (WhileExpression, ForExpression, FunctionLiteral)):
+                guarded.append(node.body)
+                if isinstance(node, WhileExpression):
+                    guarded.append(node.condition)
+            for g in guarded:
+                sheltered.update(id(n) for n in walk(g) if isinstance(n, Identifier))
+        return sheltered
+
+    def substitute(self, body: Expression, args: dict[str, Expression]) -> Expression:
+        copied = self.rename(clone(body), args)
+        assert isinstance(copied, Expression)
+        return copied
+
+    def fresh_identifier(self, name: str) -> Identifier:
+        self.rename_count += 1
+        fresh = f"{RENAME_PREFIX}{self.rename_count}_{name}"
+        return Identifier(token=Token(TokenType.IDENT, fresh), value=fresh)
+
+    def rename(self, node: Node, mapping: dict[str, Expression]) -> Node:
+        # parameters become (clones of) the argument expressions; binders of nested functions get fresh names
+        # so they can't capture identifiers coming from the arguments
+        if isinstance(node, Identifier):
+            target = mapping.get(node.value)
+            return node if target is None else clone(target)
+        if isinstance(node, FunctionLiteral):
+            inner: dict[str, Expression] = dict(mapping)
+            for binder_name in sorted(bound_names(node)):
+                inner[binder_name] = self.fresh_identifier(binder_name)
+            binders: list[Identifier] = list(node.parameters)
+            for n in walk(node.body, into_functions=False):
+                if isinstance(n, LetStatement):
+                    binders.append(n.name)
+                elif isinstance(n, ForExpression):
+                    binders.append(n.variable)
+            for binder in binders:
+                fresh = inner[binder.value]
+                assert isinstance(fresh, Identifier)
+                binder.value = fresh.value
+                binder.token = fresh.token
+            map_children(node, lambda child: self.rename(child, inner))
+            return node
+        if isinstance(node, AssignStatement):
+            target = mapping.get(node.name.value)
+            if isinstance(target, Identifier):
+                node.name = Identifier(token=target.token, value=target.value)
+        map_children(node, lambda child: self.rename(child, mapping))
+        return node
+
+
+def inline_functions(program: Program, max_size: int = INLINE_MAX_SIZE) -> list[str]:
+    return Inliner(program, max_size).run()
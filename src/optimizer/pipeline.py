@@ -0,0 +1,25 @@
+from typing import Iterable
+
+from src.ast.ast import Program
+from src.optimizer.cse import eliminate_common_subexpressions
+from src.optimizer.fold import fold_constants
+from src.optimizer.inliner import inline_functions
+from src.optimizer.specializer import specialize_functions
+from src.optimizer.type_inference import infer_types
+
+
+# Runs every pass over a whole program, in place, and returns their combined report of changes together with the
+# type inference diagnostics, operations that can only fail. Specialization comes first so the inliner sees the
+# smaller residuals, and type inference last because the other passes reset its annotations. predefined names the
+# bindings the program will find already made when it runs, exported those whose functions are called from outside.
+def optimize(
+    program: Program, predefined: Iterable[str] = (), exported: Iterable[str] = ()
+) -> tuple[list[str], list[str]]:
+    report = specialize_functions(program)
+    report += inline_functions(program)
+    folds = fold_constants(program)
+    if folds:
+        report.append(f"folded {folds} constant expressions")
+    report += eliminate_common_subexpressions(program)
+    diagnostics = infer_types(program, predefined, exported)
+    return report, diagnostics
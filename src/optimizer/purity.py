@@ -0,0 +1,153 @@
+from src.ast.ast import (
+    ArrayLiteral,
+    AssignStatement,
+    CallExpression,
+    ForExpression,
+    FunctionLiteral,
+    HashLiteral,
+    Identifier,
+    LetStatement,
+    Node,
+    Program,
+)
+from src.evaluator.built_ins import builtin_funcs
+from src.optimizer.walk import bound_names, children, walk
+
+# Builtins without side effects whose result depends only on their arguments. Higher-order builtins (map, sort
+# with a comparator, lazy_map, ...) run arbitrary callbacks and puts/lines/memoize touch the outside world.
+PURE_BUILTINS = {
+    "len",
+    "first",
+    "last",
+    "rest",
+    "push",
+    "range",
+    "sum",
+    "add",
+    "scale",
+    "dot",
+    "argmax",
+    "min",
+    "max",
+    "reverse",
+    "slice",
+    "substr",
+    "split",
+    "join",
+    "find",
+    "chars",
+    "upper",
+    "lower",
+    "trim",
+    "starts_with",
+}
+
+# Pure builtins that return a fresh array or range. == compares those by identity, so two calls are not
+# interchangeable with one.
+ALLOCATING_BUILTINS = {"push", "rest", "range", "reverse", "slice", "split", "chars", "add", "scale"}
+
+
+# Classifies the program's let-bound function literals as pure or not. Names are resolved conservatively by
+# spelling: a function is only tracked when its name is bound exactly once in the whole program and never
+# reassigned, and reading a name that is reassigned, rebound or used as a for variable anywhere counts as reading
+# mutable state.
+class PurityAnalysis:
+    def __init__(self, program: Program):
+        let_counts: dict[str, int] = {}
+        self.bound: set[str] = set()
+        self.mutable_names: set[str] = set()
+        candidates: dict[str, FunctionLiteral] = {}
+        parameter_names: set[str] = set()
+
+        for node in walk(program):
+            if isinstance(node, LetStatement):
+                name = node.name.value
+                let_counts[name] = let_counts.get(name, 0) + 1
+                self.bound.add(name)
+                if isinstance(node.value, FunctionLiteral):
+                    candidates[name] = node.value
+            elif isinstance(node, AssignStatement):
+                self.mutable_names.add(node.name.value)
+            elif isinstance(node, ForExpression):
+                self.mutable_names.add(node.variable.value)
+                self.bound.add(node.variable.value)
+            elif isinstance(node, FunctionLiteral):
+                parameter_names.update(param.value for param in node.parameters)
+
+        self.mutable_names.update(name for name, count in let_counts.items() if count > 1)
+        self.bound.update(parameter_names)
+        self.functions: dict[str, FunctionLiteral] = {
+            name: fn
+            for name, fn in candidates.items()
+            if name not in self.mutable_names and name not in parameter_names
+        }
+        self.names: dict[FunctionLiteral, str] = {fn: name for name, fn in self.functions.items()}
+
+        # greatest fixpoint: assume every function is pure and drop the ones whose bodies prove otherwise
+        self.pure_functions: set[str] = set(self.functions)
+        changed = True
+        while changed:
+            changed = False
+            for name, fn in self.functions.items():
+                if name in self.pure_functions and not self.is_pure_function(fn):
+                    self.pure_functions.discard(name)
+                    changed = True
+
+        # least fixpoint: a function allocates if its body builds an array, hash or closure, or calls something
+        # that does
+        self.allocating_functions: set[str] = set()
+        changed = True
+        while changed:
+            changed = False
+            for name, fn in self.functions.items():
+                if name not in self.allocating_functions and self.body_allocates(fn):
+                    self.allocating_functions.add(name)
+                    changed = True
+
+    def body_allocates(self, fn: FunctionLiteral) -> bool:
+        for node in walk(fn.body, into_functions=False):
+            if isinstance(node, (ArrayLiteral, HashLiteral, FunctionLiteral)):
+                return True
+            if isinstance(node, CallExpression) and self.call_allocates(node):
+                return True
+        return False
+
+    def call_allocates(self, call: CallExpression) -> bool:
+        callee = call.function
+        if isinstance(callee, Identifier):
+            if callee.value in self.functions:
+                return callee.value in self.allocating_functions
+            if callee.value in builtin_funcs and callee.value not in self.bound:
+                return callee.value in ALLOCATING_BUILTINS
+        return True
+
+    def is_pure_function(self, fn: FunctionLiteral) -> bool:
+        return self.is_pure(fn.body, bound_names(fn))
+
+    def is_pure_callee(self, callee: Node, local_names: set[str]) -> bool:
+        if isinstance(callee, FunctionLiteral):
+            return self.is_pure_function(callee)
+        if not isinstance(callee, Identifier):
+            return False
+        name = callee.value
+        if name in self.functions:
+            return name in self.pure_functions
+        if name in local_names:
+            return False
+        return name in builtin_funcs and name not in self.bound and name in PURE_BUILTINS
+
+    def is_pure(self, node: Node, local_names: set[str]) -> bool:
+        if isinstance(node, Identifier):
+            return node.value in local_names or node.value not in self.mutable_names
+        elif isinstance(node, FunctionLiteral):
+            # creating a closure has no effect; calling it is checked at the call site
+            return True
+        elif isinstance(node, AssignStatement):
+            if node.name.value not in local_names:
+                return False
+            return self.is_pure(node.value, local_names)
+        elif isinstance(node, CallExpression):
+            if not self.is_pure_callee(node.function, local_names):
+                return False
+            return all(self.is_pure(arg, local_names) for arg in node.arguments)
+        return all(self.is_pure(child, local_names) for child in children(node))
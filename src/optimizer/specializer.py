@@ -0,0 +1,164 @@
+from typing import Hashable
+
+from src.ast.ast import (
+    AssignStatement,
+    BlockStatement,
+    CallExpression,
+    Expression,
+    ForExpression,
+    FunctionLiteral,
+    Identifier,
+    LetStatement,
+    Node,
+    Program,
+)
+from src.optimizer.cse import node_key
+from src.optimizer.fold import ConstantFolder, is_literal
+from src.optimizer.purity import PurityAnalysis
+from src.optimizer.walk import bound_names, children, clone, map_children, reset_caches, walk
+from src.tokens.tokens import Token, TokenType
+
+# Maximum number of residual functions one run may create. Every cached residual is also a definition in the
+# program, so evicting one would only duplicate code; once the cache is full further calls stay generic.
+SPECIALIZE_CACHE_SIZE = 32
+# Residual functions use names the lexer can't produce (identifiers never contain digits).
+SPECIALIZE_PREFIX = "__spec"
+
+
+def constant_parameters(fn: FunctionLiteral) -> set[str]:
+    # parameters that keep their argument's value for the whole call: never reassigned (a nested closure may do
+    # it too) and never rebound by a let or for in the function's own scope
+    params = {param.value for param in fn.parameters}
+    for node in walk(fn.body):
+        if isinstance(node, AssignStatement):
+            params.discard(node.name.value)
+    for node in walk(fn.body, into_functions=False):
+        if isinstance(node, LetStatement):
+            params.discard(node.name.value)
+        elif isinstance(node, ForExpression):
+            params.discard(node.variable.value)
+    return params
+
+
+def substitute(node: Node, constants: dict[str, Expression]) -> Node:
+    # replaces reads of the constant parameters, stopping wherever a nested function rebinds the name
+    if isinstance(node, Identifier):
+        value = constants.get(node.value)
+        return node if value is None else clone(value)
+    if isinstance(node, FunctionLiteral):
+        inner = {name: value for name, value in constants.items() if name not in bound_names(node)}
+        map_children(node, lambda child: substitute(child, inner))
+        return node
+    map_children(node, lambda child: substitute(child, constants))
+    return node
+
+
+# Specializes calls to known functions on their literal arguments. For a call such as fmt(true, x), a residual
+# copy of fmt is built with the constant parameters substituted and constant-folded, bound next to the original
+# definition, and the call is rewritten to call it with the remaining arguments. Residuals are cached by callee
+# and constant argument tuple, so every call site with the same constants shares one. A residual is only kept when
+# folding simplified its body.
+class Specializer:
+    def __init__(self, program: Program, max_entries: int = SPECIALIZE_CACHE_SIZE):
+        self.program = program
+        self.max_entries = max_entries
+        self.cache: dict[tuple[str, Hashable], Identifier | None] = {}
+        self.residuals: dict[str, list[LetStatement]] = {}
+        self.residual_count = 0
+        self.report: list[str] = []
+        self.purity = PurityAnalysis(program)
+        self.defining_scope: dict[str, FunctionLiteral | None] = {}
+        self.record_scopes(program, None)
+
+    def record_scopes(self, node: Node, scope: FunctionLiteral | None):
+        for child in children(node):
+            if isinstance(child, LetStatement) and child.name.value in self.purity.functions:
+                self.defining_scope[child.name.value] = scope
+            self.record_scopes(child, child if isinstance(child, FunctionLiteral) else scope)
+
+    def run(self) -> list[str]:
+        self.visit(self.program, [])
+        self.place_residuals(self.program)
+        reset_caches(self.program)
+        return self.report
+
+    def visit(self, node: Node, enclosing: list[FunctionLiteral]) -> Node:
+        inner = enclosing + [node] if isinstance(node, FunctionLiteral) else enclosing
+        map_children(node, lambda child: self.visit(child, inner))
+        if isinstance(node, CallExpression):
+            specialized = self.try_specialize(node, enclosing)
+            if specialized is not None:
+                return specialized
+        return node
+
+    def try_specialize(self, call: CallExpression, enclosing: list[FunctionLiteral]) -> CallExpression | None:
+        callee = call.function
+        if not isinstance(callee, Identifier):
+            return None
+        name = callee.value
+        fn = self.purity.functions.get(name)
+        if fn is None or len(call.arguments) != len(fn.parameters):
+            return None
+        scope = self.defining_scope.get(name)
+        if scope is not None and scope not in enclosing:
+            return None
+
+        substitutable = constant_parameters(fn)
+        constants: dict[str, Expression] = {}
+        remaining_params: list[Identifier] = []
+        remaining_args: list[Expression] = []
+        for param, arg in zip(fn.parameters, call.arguments):
+            if is_literal(arg) and param.value in substitutable:
+                constants[param.value] = arg
+            else:
+                remaining_params.append(param)
+                remaining_args.append(arg)
+        if not constants:
+            return None
+
+        key = (name, tuple((param, node_key(arg)) for param, arg in constants.items()))
+        if key not in self.cache:
+            if len(self.cache) >= self.max_entries:
+                return None
+            self.cache[key] = self.build_residual(name, fn, constants, remaining_params)
+        residual = self.cache[key]
+        if residual is None:
+            return None
+
+        self.report.append(f"specialized {call} as {residual.value}")
+        return CallExpression(token=call.token, function=clone(residual), arguments=remaining_args)  # type: ignore
+
+    def build_residual(
+        self, name: str, fn: FunctionLiteral, constants: dict[str, Expression], params: list[Identifier]
+    ) -> Identifier | None:
+        body = substitute(clone(fn.body), constants)
+        assert isinstance(body, BlockStatement)
+        folder = ConstantFolder()
+        map_children(body, folder.fold)
+        if folder.folds == 0:
+            return None
+
+        residual_name = f"{SPECIALIZE_PREFIX}{self.residual_count}_{name}"
+        self.residual_count += 1
+        identifier = Identifier(token=Token(TokenType.IDENT, residual_name), value=residual_name)
+        residual = FunctionLiteral(token=fn.token, parameters=[clone(p) for p in params], body=body)  # type: ignore
+        residual.name = residual_name
+        let = LetStatement(token=Token(TokenType.LET, "let"), name=identifier, value=residual)
+        self.residuals.setdefault(name, []).append(let)
+        return identifier
+
+    def place_residuals(self, node: Node):
+        # each residual is bound right after its original, so it sees the same scope
+        if isinstance(node, (Program, BlockStatement)):
+            statements: list = []
+            for stmt in node.statements:
+                statements.append(stmt)
+                if isinstance(stmt, LetStatement) and stmt.value is self.purity.functions.get(stmt.name.value):
+                    statements.extend(self.residuals.get(stmt.name.value, []))
+            node.statements = statements
+        for child in children(node):
+            self.place_residuals(child)
+
+
+def specialize_functions(program: Program, max_entries: int = SPECIALIZE_CACHE_SIZE) -> list[str]:
+    return Specializer(program, max_entries).run()
@@ -0,0 +1,258 @@
+from typing import Iterable
+
+from src.ast.ast import (
+    ArrayLiteral,
+    AssignStatement,
+    BlockStatement,
+    BooleanLiteral,
+    CallExpression,
+    Expression,
+    ExpressionStatement,
+    FloatLiteral,
+    ForExpression,
+    FunctionLiteral,
+    HashLiteral,
+    Identifier,
+    IfExpression,
+    InfixExpression,
+    IntegerLiteral,
+    LetStatement,
+    Node,
+    PrefixExpression,
+    Program,
+    ReturnStatement,
+    StringLiteral,
+    WhileExpression,
+)
+from src.evaluator.built_ins import builtin_funcs
+from src.object.object import ObjectType
+from src.optimizer.purity import PurityAnalysis
+from src.optimizer.walk import walk
+
+# A type is the set of object types an expression may evaluate to. Errors are not part of it: they propagate as
+# values and the evaluator checks for them before using an operand.
+Type = frozenset[ObjectType]
+
+ANY: Type = frozenset(ObjectType)
+NOTHING: Type = frozenset()
+INTEGER: Type = frozenset({ObjectType.INTEGER})
+FLOAT: Type = frozenset({ObjectType.FLOAT})
+NUMBER: Type = INTEGER | FLOAT
+BOOLEAN: Type = frozenset({ObjectType.BOOLEAN})
+STRING: Type = frozenset({ObjectType.STRING})
+NULL: Type = frozenset({ObjectType.NULL})
+RETURN_VALUE: Type = frozenset({ObjectType.RETURN_VALUE})
+
+BUILTIN_RESULT_TYPES: dict[str, Type] = {
+    "len": INTEGER,
+    "sum": NUMBER,
+    "dot": INTEGER,
+    "find": INTEGER,
+    "starts_with": BOOLEAN,
+    "substr": STRING,
+    "join": STRING,
+    "upper": STRING,
+    "lower": STRING,
+    "trim": STRING,
+    "puts": NULL,
+}
+
+ARITHMETIC_OPERATORS = {"+", "-", "*", "/"}
+COMPARISON_OPERATORS = {"<", ">", "==", "!="}
+
+
+def infix_result(operator: str, left: ObjectType, right: ObjectType) -> ObjectType | None:
+    # mirrors the evaluator's INFIX_OPERATORS; None where the evaluator reports an error
+    if left in NUMBER and right in NUMBER:
+        if operator in ARITHMETIC_OPERATORS:
+            return ObjectType.INTEGER if left == right == ObjectType.INTEGER else ObjectType.FLOAT
+        return ObjectType.BOOLEAN if operator in COMPARISON_OPERATORS else None
+    if left == ObjectType.STRING and right == ObjectType.STRING:
+        return ObjectType.STRING if operator == "+" else None
+    return ObjectType.BOOLEAN if operator in ("==", "!=") else None
+
+
+def may_return(node: Node) -> bool:
+    # a return inside an if or loop makes the whole expression evaluate to the wrapped return value
+    return any(isinstance(n, ReturnStatement) for n in walk(node, into_functions=False))
+
+
+def infix_error(operator: str, left: ObjectType, right: ObjectType) -> str:
+    if left != right:
+        return f"type mismatch: {left.value} {operator} {right.value}"
+    return f"unknown operator: {left.value} {operator} {right.value}"
+
+
+# Flow-insensitive type inference over the whole program. Like PurityAnalysis, names are resolved by spelling: the
+# type of a name is the union of everything any binding of that spelling is given, parameters of a function that
+# is only ever called directly take the types of the arguments at its call sites, and everything else is ANY.
+# Types only grow, so the tables are recomputed until nothing changes.
+#
+# The result assumes the program runs in a fresh environment, apart from the names given as predefined, which may
+# hold anything; bindings made by earlier REPL input are not seen. Functions bound to exported names can be called
+# from outside the program, with anything, so their parameters take any type.
+class TypeInference:
+    def __init__(self, program: Program, predefined: Iterable[str] = (), exported: Iterable[str] = ()):
+        self.program = program
+        purity = PurityAnalysis(program)
+        self.predefined = set(predefined)
+        self.bound = purity.bound | self.predefined
+        self.name_types: dict[str, Type] = {name: ANY for name in self.predefined}
+        self.return_types: dict[FunctionLiteral, Type] = {}
+
+        # functions whose name is used for nothing but calling them; their calls are all visible
+        self.call_sites: dict[FunctionLiteral, list[CallExpression]] = {fn: [] for fn in purity.functions.values()}
+        outside = self.predefined | set(exported)
+        self.known_functions: dict[str, FunctionLiteral] = {
+            name: fn for name, fn in purity.functions.items() if name not in outside
+        }
+        callees: set[int] = set()
+        for node in walk(program):
+            if isinstance(node, CallExpression) and isinstance(node.function, Identifier):
+                fn = self.known_functions.get(node.function.value)
+                if fn is not None:
+                    self.call_sites[fn].append(node)
+                    callees.add(id(node.function))
+            elif isinstance(node, LetStatement):
+                callees.add(id(node.name))
+        for node in walk(program):
+            if isinstance(node, Identifier) and node.value in self.known_functions and id(node) not in callees:
+                self.known_functions.pop(node.value)
+        known = set(self.known_functions.values())
+        self.call_sites = {fn: calls for fn, calls in self.call_sites.items() if fn in known}
+
+        self.solve()
+
+    def solve(self):
+        changed = True
+        while changed:
+            changed = False
+            for node in walk(self.program):
+                if isinstance(node, (LetStatement, AssignStatement)):
+                    changed = self.widen_name(node.name.value, self.type_of(node.value)) or changed
+                elif isinstance(node, ForExpression):
+                    changed = self.widen_name(node.variable.value, self.element_type(node.iterable)) or changed
+                elif isinstance(node, FunctionLiteral):
+                    changed = self.widen_parameters(node) or changed
+                    result = self.return_types.get(node, NOTHING) | self.body_type(node)
+                    if result != self.return_types.get(node):
+                        self.return_types[node] = result
+                        changed = True
+
+    def widen_name(self, name: str, t: Type) -> bool:
+        current = self.name_types.get(name, NOTHING)
+        if t <= current:
+            return False
+        self.name_types[name] = current | t
+        return True
+
+    def widen_parameters(self, fn: FunctionLiteral) -> bool:
+        calls = self.call_sites.get(fn)
+        changed = False
+        for idx, param in enumerate(fn.parameters):
+            t = ANY
+            if calls is not None:
+                t = NOTHING
+                for call in calls:
+                    t = t | (self.type_of(call.arguments[idx]) if idx < len(call.arguments) else ANY)
+            changed = self.widen_name(param.value, t) or changed
+        return changed
+
+    def body_type(self, fn: FunctionLiteral) -> Type:
+        # calls unwrap return values
+        t = self.block_type(fn.body) - RETURN_VALUE
+        for node in walk(fn.body, into_functions=False):
+            if isinstance(node, ReturnStatement):
+                t = t | self.type_of(node.return_value)
+        return t
+
+    def block_type(self, block: BlockStatement) -> Type:
+        if not block.statements:
+            return ANY
+        last = block.statements[-1]
+        t = ANY
+        if isinstance(last, ExpressionStatement):
+            t = self.type_of(last.expression)
+        elif isinstance(last, ReturnStatement):
+            t = NOTHING
+        return t | RETURN_VALUE if may_return(block) else t
+
+    def element_type(self, iterable: Expression) -> Type:
+        if self.builtin_call(iterable) == "range":
+            return INTEGER
+        return ANY
+
+    def builtin_call(self, node: Node) -> str | None:
+        if isinstance(node, CallExpression) and isinstance(node.function, Identifier):
+            name = node.function.value
+            if name in builtin_funcs and name not in self.bound:
+                return name
+        return None
+
+    def type_of(self, node: Expression) -> Type:
+        if isinstance(node, IntegerLiteral):
+            return INTEGER
+        elif isinstance(node, FloatLiteral):
+            return FLOAT
+        elif isinstance(node, StringLiteral):
+            return STRING
+        elif isinstance(node, BooleanLiteral):
+            return BOOLEAN
+        elif isinstance(node, Identifier):
+            t = self.name_types.get(node.value, NOTHING)
+            # a builtin is found whenever no binding of the name is in scope
+            return t | {ObjectType.BUILTIN} if node.value in builtin_funcs else t
+        elif isinstance(node, PrefixExpression):
+            right = self.type_of(node.right)
+            if node.operator == "!":
+                return BOOLEAN if right else NOTHING
+            return NUMBER & right
+        elif isinstance(node, InfixExpression):
+            left, right = self.type_of(node.left), self.type_of(node.right)
+            results = {infix_result(node.operator, lt, rt) for lt in left for rt in right}
+            return frozenset(r for r in results if r is not None)
+        elif isinstance(node, IfExpression):
+            alternative = self.block_type(node.alternative) if node.alternative is not None else NULL
+            return self.block_type(node.consequence) | alternative
+        elif isinstance(node, (WhileExpression, ForExpression)):
+            return NULL | RETURN_VALUE if may_return(node.body) else NULL
+        elif isinstance(node, FunctionLiteral):
+            return frozenset({ObjectType.FUNCTION})
+        elif isinstance(node, ArrayLiteral):
+            return frozenset({ObjectType.ARRAY})
+        elif isinstance(node, HashLiteral):
+            return frozenset({ObjectType.HASH})
+        elif isinstance(node, CallExpression):
+            return self.call_type(node)
+        return ANY
+
+    def call_type(self, call: CallExpression) -> Type:
+        callee = call.function
+        if isinstance(callee, Identifier) and callee.value in self.known_functions:
+            return self.return_types.get(self.known_functions[callee.value], NOTHING)
+        builtin = self.builtin_call(call)
+        if builtin == "sum" and len(call.arguments) == 1 and self.element_type(call.arguments[0]) == INTEGER:
+            # only elements that are floats make a float sum
+            return INTEGER
+        if builtin is not None:
+            return BUILTIN_RESULT_TYPES.get(builtin, ANY)
+        return ANY
+
+    def annotate(self) -> list[str]:
+        # marks integer-only infix expressions for the evaluator's fast path and reports operations that can
+        # only fail
+        diagnostics: list[str] = []
+        for node in walk(self.program):
+            if not isinstance(node, InfixExpression):
+                continue
+            left, right = self.type_of(node.left), self.type_of(node.right)
+            node.int_operands = left == INTEGER and right == INTEGER
+            if len(left) == 1 and len(right) == 1:
+                [lt], [rt] = left, right
+                if infix_result(node.operator, lt, rt) is None:
+                    diagnostics.append(f"{infix_error(node.operator, lt, rt)} in {node}")
+        return diagnostics
+
+
+def infer_types(program: Program, predefined: Iterable[str] = (), exported: Iterable[str] = ()) -> list[str]:
+    return TypeInference(program, predefined, exported).annotate()
@@ -0,0 +1,153 @@
+import copy
+from typing import Callable, Iterator
+
+from src.ast.ast import (
+    ArrayLiteral,
+    AssignStatement,
+    BlockStatement,
+    CallExpression,
+    ExpressionStatement,
+    ForExpression,
+    FunctionLiteral,
+    HashLiteral,
+    IfExpression,
+    IndexExpression,
+    InfixExpression,
+    LetStatement,
+    Node,
+    PrefixExpression,
+    Program,
+    ReturnStatement,
+    WhileExpression,
+)
+
+
+def children(node: Node) -> list[Node]:
+    if isinstance(node, (Program, BlockStatement)):
+        return list(node.statements)
+    elif isinstance(node, ExpressionStatement):
+        return [node.expression]
+    elif isinstance(node, (LetStatement, AssignStatement)):
+        return [node.name, node.value]
+    elif isinstance(node, ReturnStatement):
+        return [node.return_value]
+    elif isinstance(node, PrefixExpression):
+        return [node.right]
+    elif isinstance(node, InfixExpression):
+        return [node.left, node.right]
+    elif isinstance(node, IfExpression):
+        nodes: list[Node] = [node.condition, node.consequence]
+        if node.alternative is not None:
+            nodes.append(node.alternative)
+        return nodes
+    elif isinstance(node, WhileExpression):
+        return [node.condition, node.body]
+    elif isinstance(node, ForExpression):
+        return [node.variable, node.iterable, node.body]
+    elif isinstance(node, FunctionLiteral):
+        return [*node.parameters, node.body]
+    elif isinstance(node, CallExpression):
+        return [node.function, *node.arguments]
+    elif isinstance(node, ArrayLiteral):
+        return list(node.elements)
+    elif isinstance(node, IndexExpression):
+        return [node.left, node.index]
+    elif isinstance(node, HashLiteral):
+        return [n for pair in node.pairs.items() for n in pair]
+    return []
+
+
+def walk(node: Node, into_functions: bool = True) -> Iterator[Node]:
+    # pre-order, iterative so that deeply nested programs don't hit the recursion limit
+    stack: list[Node] = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        if not into_functions and isinstance(current, FunctionLiteral) and current is not node:
+            continue
+        stack.extend(reversed(children(current)))
+
+
+def map_children(node: Node, fn: Callable[[Node], Node]):
+    # replaces each child of node in place with fn(child); the counterpart of children()
+    if isinstance(node, (Program, BlockStatement)):
+        node.statements = [fn(s) for s in node.statements]  # type: ignore
+    elif isinstance(node, ExpressionStatement):
+        node.expression = fn(node.expression)  # type: ignore
+    elif isinstance(node, (LetStatement, AssignStatement)):
+        node.value = fn(node.value)  # type: ignore
+    elif isinstance(node, ReturnStatement):
+        node.return_value = fn(node.return_value)  # type: ignore
+    elif isinstance(node, PrefixExpression):
+        node.right = fn(node.right)  # type: ignore
+    elif isinstance(node, InfixExpression):
+        node.left = fn(node.left)  # type: ignore
+        node.right = fn(node.right)  # type: ignore
+    elif isinstance(node, IfExpression):
+        node.condition = fn(node.condition)  # type: ignore
+        node.consequence = fn(node.consequence)  # type: ignore
+        if node.alternative is not None:
+            node.alternative = fn(node.alternative)  # type: ignore
+    elif isinstance(node, WhileExpression):
+        node.condition = fn(node.condition)  # type: ignore
+        node.body = fn(node.body)  # type: ignore
+    elif isinstance(node, ForExpression):
+        node.iterable = fn(node.iterable)  # type: ignore
+        node.body = fn(node.body)  # type: ignore
+    elif isinstance(node, FunctionLiteral):
+        node.body = fn(node.body)  # type: ignore
+    elif isinstance(node, CallExpression):
+        node.function = fn(node.function)  # type: ignore
+        node.arguments = [fn(a) for a in node.arguments]  # type: ignore
+    elif isinstance(node, ArrayLiteral):
+        node.elements = [fn(e) for e in node.elements]  # type: ignore
+    elif isinstance(node, IndexExpression):
+        node.left = fn(node.left)  # type: ignore
+        node.index = fn(node.index)  # type: ignore
+    elif isinstance(node, HashLiteral):
+        node.pairs = {fn(k): fn(v) for k, v in node.pairs.items()}  # type: ignore
+
+
+def bound_names(fn: FunctionLiteral) -> set[str]:
+    # parameters plus every name the body binds with let or for; blocks share the function's environment
+    names = {param.value for param in fn.parameters}
+    for node in walk(fn.body, into_functions=False):
+        if isinstance(node, LetStatement):
+            names.add(node.name.value)
+        elif isinstance(node, ForExpression):
+            names.add(node.variable.value)
+    return names
+
+
+def global_names(program: Program) -> set[str]:
+    # every name the program binds in the global environment: lets and for variables outside any function
+    names: set[str] = set()
+    for node in walk(program, into_functions=False):
+        if isinstance(node, LetStatement):
+            names.add(node.name.value)
+        elif isinstance(node, ForExpression):
+            names.add(node.variable.value)
+    return names
+
+
+def reset_caches(node: Node):
+    # the per-node caches and type annotations describe the tree they were computed on; clear them after a rewrite
+    for n in walk(node):
+        if isinstance(n, FunctionLiteral):
+            n.free_names = None
+        elif isinstance(n, BlockStatement):
+            n.scope_info = None
+        elif isinstance(n, HashLiteral):
+            n.shape = None
+            n.shape_checked = False
+        elif isinstance(n, IndexExpression):
+            n.cached_shape = None
+            n.cached_slot = 0
+        elif isinstance(n, InfixExpression):
+            n.int_operands = False
+
+
+def clone(node: Node) -> Node:
+    copied = copy.deepcopy(node)
+    reset_caches(copied)
+    return copied
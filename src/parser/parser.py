@@ -2,11 +2,14 @@ from typing import Callable
 
 from src.ast.ast import (
     ArrayLiteral,
+    AssignStatement,
     BlockStatement,
     BooleanLiteral,
     CallExpression,
     Expression,
     ExpressionStatement,
+    FloatLiteral,
+    ForExpression,
     FunctionLiteral,
     HashLiteral,
     Identifier,
@@ -20,6 +23,7 @@ from src.ast.ast import (
     ReturnStatement,
     Statement,
     StringLiteral,
+    WhileExpression,
 )
 from src.lexer.lexer import Lexer
 from src.tokens.tokens import Token, TokenType
@@ -60,6 +64,7 @@ class Parser:
 
         self.register_prefix(TokenType.IDENT, self.parse_identifier)
         self.register_prefix(TokenType.INT, self.parse_integer_literal)
+        self.register_prefix(TokenType.FLOAT, self.parse_float_literal)
         self.register_prefix(TokenType.STRING, self.parse_string_literal)
         self.register_prefix(TokenType.BANG, self.parse_prefix_expression)
         self.register_prefix(TokenType.MINUS, self.parse_prefix_expression)
@@ -67,6 +72,8 @@ class Parser:
         self.register_prefix(TokenType.FALSE, self.parse_boolean)
         self.register_prefix(TokenType.LPAREN, self.parse_grouped_expression)
         self.register_prefix(TokenType.IF, self.parse_if_expression)
+        self.register_prefix(TokenType.WHILE, self.parse_while_expression)
+        self.register_prefix(TokenType.FOR, self.parse_for_expression)
         self.register_prefix(TokenType.FUNCTION, self.parse_function_literal)
         self.register_prefix(TokenType.LBRACKET, self.parse_array_literal)
         self.register_prefix(TokenType.LBRACE, self.parse_hash_literal)
@@ -143,6 +150,8 @@ class Parser:
             return self.parse_let_statement()
         elif self.cur_token.type == TokenType.RETURN:
             return self.parse_return_statement()
+        elif self.cur_token.type == TokenType.IDENT and self.peek_token_is(TokenType.ASSIGN):
+            return self.parse_assign_statement()
         else:
             return self.parse_expression_statement()
 
@@ -163,6 +172,8 @@ class Parser:
 
         value: Expression | None = self.parse_expression(LOWEST)
         assert value is not None
+        if isinstance(value, FunctionLiteral):
+            value.name = name.value
 
         if self.peek_token_is(TokenType.SEMICOLON):
             self.next_token()
@@ -175,6 +186,31 @@ class Parser:
 
         return stmt
 
+    def parse_assign_statement(self) -> None | AssignStatement:
+        cur_token: Token | None = self.cur_token
+        assert cur_token is not None
+
+        name = Identifier(token=cur_token, value=cur_token.literal)
+
+        if not self.expect_peek(TokenType.ASSIGN):
+            return None
+
+        self.next_token()
+
+        value: Expression | None = self.parse_expression(LOWEST)
+        assert value is not None
+
+        if self.peek_token_is(TokenType.SEMICOLON):
+            self.next_token()
+
+        stmt = AssignStatement(
+            token=cur_token,
+            name=name,
+            value=value,
+        )
+
+        return stmt
+
     def parse_return_statement(self) -> ReturnStatement:
         cur_token: Token | None = self.cur_token
         assert cur_token is not None
@@ -263,6 +299,20 @@ class Parser:
 
         return lit
 
+    def parse_float_literal(self) -> None | FloatLiteral:
+        assert self.cur_token is not None
+        try:
+            lit = FloatLiteral(
+                token=self.cur_token,
+                value=float(self.cur_token.literal),
+            )
+        except ValueError:
+            msg = f"could not parse {self.cur_token.literal} as float"
+            self.errors_list.append(msg)
+            return None
+
+        return lit
+
     def parse_string_literal(self) -> StringLiteral:
         assert self.cur_token is not None
         return StringLiteral(token=self.cur_token, value=self.cur_token.literal)
@@ -344,6 +394,70 @@ class Parser:
 
         return expression
 
+    def parse_while_expression(self) -> None | WhileExpression:
+        cur_token: Token | None = self.cur_token
+        assert cur_token is not None
+
+        if not self.expect_peek(TokenType.LPAREN):
+            return None
+
+        self.next_token()
+        condition: Expression | None = self.parse_expression(LOWEST)
+        assert condition is not None
+
+        if not self.expect_peek(TokenType.RPAREN):
+            return None
+
+        if not self.expect_peek(TokenType.LBRACE):
+            return None
+
+        body: BlockStatement = self.parse_block_statement()
+
+        expression = WhileExpression(
+            token=cur_token,
+            condition=condition,
+            body=body,
+        )
+
+        return expression
+
+    def parse_for_expression(self) -> None | ForExpression:
+        cur_token: Token | None = self.cur_token
+        assert cur_token is not None
+
+        if not self.expect_peek(TokenType.LPAREN):
+            return None
+
+        if not self.expect_peek(TokenType.IDENT):
+            return None
+
+        assert self.cur_token is not None
+        variable = Identifier(token=self.cur_token, value=self.cur_token.literal)
+
+        if not self.expect_peek(TokenType.IN):
+            return None
+
+        self.next_token()
+        iterable: Expression | None = self.parse_expression(LOWEST)
+        assert iterable is not None
+
+        if not self.expect_peek(TokenType.RPAREN):
+            return None
+
+        if not self.expect_peek(TokenType.LBRACE):
+            return None
+
+        body: BlockStatement = self.parse_block_statement()
+
+        expression = ForExpression(
+            token=cur_token,
+            variable=variable,
+            iterable=iterable,
+            body=body,
+        )
+
+        return expression
+
     def parse_block_statement(self) -> BlockStatement:
         assert self.cur_token is not None
         block = BlockStatement(token=self.cur_token)
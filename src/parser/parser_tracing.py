@@ -0,0 +1,88 @@
+import time
+from typing import Callable
+
+from src.parser.parser import Parser
+
+TRACE_INDENT = "\t"
+
+
+class ParseStats:
+    # Totals for one parse function. Time and tokens count only the outermost of nested calls, so they are never
+    # more than the whole parse; max_depth is how many calls of the function were active at once.
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.total_time = 0.0
+        self.tokens = 0
+        self.max_depth = 0
+        self.active = 0
+
+
+# Opt-in instrumentation for one Parser. attach() wraps the instance's parse_* methods, including those already
+# registered as prefix and infix parse functions, and its next_token; other parsers run the plain methods. With
+# trace=True it also keeps a BEGIN/END line per call, indented by nesting like the book's parser tracing.
+class ParserTracer:
+    def __init__(self, trace: bool = False, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.lines: list[str] | None = [] if trace else None
+        self.stats: dict[str, ParseStats] = {}
+        self.tokens = 0
+        self.depth = 0
+        self.max_depth = 0
+
+    def attach(self, parser: Parser):
+        traced: dict[str, Callable] = {}
+        for name in dir(Parser):
+            if name.startswith("parse_"):
+                traced[name] = self.wrap(name, getattr(parser, name))
+                setattr(parser, name, traced[name])
+        for table in (parser.prefix_parse_fns, parser.infix_parse_fns):
+            for token_type, fn in table.items():
+                table[token_type] = traced[fn.__name__]
+
+        next_token = parser.next_token
+
+        def counting_next_token():
+            self.tokens += 1
+            next_token()
+
+        parser.next_token = counting_next_token  # type: ignore
+
+    def wrap(self, name: str, fn: Callable) -> Callable:
+        stats = self.stats.setdefault(name, ParseStats(name))
+
+        def traced(*args):
+            stats.calls += 1
+            stats.active += 1
+            stats.max_depth = max(stats.max_depth, stats.active)
+            self.depth += 1
+            self.max_depth = max(self.max_depth, self.depth)
+            if self.lines is not None:
+                self.lines.append(f"{TRACE_INDENT * (self.depth - 1)}BEGIN {name}")
+            start, tokens = self.clock(), self.tokens
+            try:
+                return fn(*args)
+            finally:
+                stats.active -= 1
+                if stats.active == 0:
+                    stats.total_time += self.clock() - start
+                    stats.tokens += self.tokens - tokens
+                self.depth -= 1
+                if self.lines is not None:
+                    self.lines.append(f"{TRACE_INDENT * self.depth}END {name}")
+
+        return traced
+
+    def trace(self) -> str:
+        return "".join(line + "\n" for line in self.lines or [])
+
+    def report(self) -> str:
+        # called functions only, most time first
+        lines = [f"{'calls':>10} {'total_s':>10} {'tokens':>8} {'depth':>6}  function"]
+        called = [stats for stats in self.stats.values() if stats.calls]
+        for stats in sorted(called, key=lambda s: (-s.total_time, s.name)):
+            lines.append(
+                f"{stats.calls:>10} {stats.total_time:>10.4f} {stats.tokens:>8} {stats.max_depth:>6}  {stats.name}"
+            )
+        lines.append(f"max nesting {self.max_depth}, {self.tokens} tokens read")
+        return "\n".join(lines) + "\n"
@@ -1,23 +1,59 @@
 from typing import TextIO
 
 from src.evaluator.evaluator import evaluate
+from src.evaluator.heap import HeapAccounting
 from src.lexer.lexer import Lexer
 from src.object.environment import new_environment
 from src.parser.parser import Parser
 
 PROMPT = ">> "
+HEAP_USAGE = "usage: :heap [on|trace|off]\n"
+
+
+class Session:
+    # REPL state kept between lines other than the Monkey environment
+    def __init__(self):
+        self.heap: HeapAccounting | None = None
+
+
+def heap_command(args: list[str], session: Session, out_stream: TextIO):
+    # :heap on / :heap trace start counting objects (trace also diffs tracemalloc snapshots), :heap off stops,
+    # and :heap alone prints the counts and what grew since the last :heap
+    if args in (["on"], ["trace"]):
+        if session.heap is not None:
+            session.heap.stop()
+        session.heap = HeapAccounting(trace=args == ["trace"])
+        session.heap.start()
+    elif args == ["off"] and session.heap is not None:
+        session.heap.stop()
+        session.heap = None
+    elif args == [] and session.heap is not None:
+        out_stream.write(session.heap.report())
+        out_stream.write(session.heap.diff())
+    elif args == [] or args == ["off"]:
+        out_stream.write("heap accounting is not running; start it with :heap on\n")
+    else:
+        out_stream.write(HEAP_USAGE)
 
 
 def monkey_repl(in_stream: TextIO, out_stream: TextIO):
     env = new_environment()
+    session = Session()
     out_stream.write("py monkey v0.0.1\n")
     while True:
         out_stream.write(PROMPT)
         out_stream.flush()
         line = in_stream.readline()
         if not line:
+            if session.heap is not None:
+                session.heap.stop()
             return
 
+        words = line.split()
+        if words and words[0] == ":heap":
+            heap_command(words[1:], session, out_stream)
+            continue
+
         lexer = Lexer(line)
         parser = Parser(lexer)
 
@@ -0,0 +1,65 @@
+import asyncio
+import itertools
+import json
+from typing import Any
+
+from src.server.server import MAX_REQUEST_BYTES
+
+
+# Talks to a Server over one connection. Requests can be sent concurrently from several tasks: each gets its own
+# id, and replies, which may arrive in any order, are matched back to their requests by it.
+class Client:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.ids = itertools.count()
+        self.pending: dict[int, asyncio.Future] = {}
+        self.receiver = asyncio.create_task(self.receive())
+
+    @classmethod
+    async def connect_unix(cls, path: str) -> "Client":
+        return cls(*await asyncio.open_unix_connection(path, limit=MAX_REQUEST_BYTES))
+
+    @classmethod
+    async def connect_tcp(cls, host: str, port: int) -> "Client":
+        return cls(*await asyncio.open_connection(host, port, limit=MAX_REQUEST_BYTES))
+
+    async def receive(self):
+        try:
+            while line := await self.reader.readline():
+                reply = json.loads(line)
+                future = self.pending.pop(reply.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("connection closed before the reply arrived"))
+            self.pending.clear()
+
+    async def request(self, request: dict[str, Any]) -> dict[str, Any]:
+        if self.receiver.done():
+            raise ConnectionError("connection is closed")
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        self.writer.write(json.dumps({**request, "id": request_id}).encode() + b"\n")
+        await self.writer.drain()
+        return await future
+
+    async def eval(self, source: str, budget: dict[str, Any] | None = None) -> dict[str, Any]:
+        return await self.request({"op": "eval", "source": source, "budget": budget or {}})
+
+    async def call(
+        self, source: str, function: str, args: list[Any], budget: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        request = {"op": "call", "source": source, "function": function, "args": args, "budget": budget or {}}
+        return await self.request(request)
+
+    async def stats(self) -> dict[str, Any]:
+        return (await self.request({"op": "stats"}))["stats"]
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self.receiver
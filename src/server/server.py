@@ -0,0 +1,223 @@
+import asyncio
+import json
+import statistics
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from src.evaluator.budget import Budget
+from src.server import worker
+
+# Longest request line accepted; a longer one gets an error and the connection is closed.
+MAX_REQUEST_BYTES = 1 << 20
+# Latencies kept for the percentiles in the stats.
+LATENCY_WINDOW = 10_000
+BUDGET_FIELDS = ("max_steps", "timeout", "max_depth", "max_size")
+
+
+class RequestError(Exception):
+    pass
+
+
+def check_request(request: Any) -> dict[str, Any]:
+    if not isinstance(request, dict):
+        raise RequestError("request must be a JSON object")
+    op = request.get("op")
+    if op not in ("eval", "call", "stats"):
+        raise RequestError(f"unknown op: {op}")
+    if op == "stats":
+        return request
+    if not isinstance(request.get("source"), str):
+        raise RequestError("source must be a string")
+    if op == "call":
+        if not isinstance(request.get("function"), str):
+            raise RequestError("function must be a string")
+        if not isinstance(request.get("args", []), list):
+            raise RequestError("args must be a list")
+    budget = request.get("budget", {})
+    if not isinstance(budget, dict) or not set(budget) <= set(BUDGET_FIELDS):
+        raise RequestError(f"budget must be an object with some of {', '.join(BUDGET_FIELDS)}")
+    for field, limit in budget.items():
+        if isinstance(limit, bool) or not isinstance(limit, (int, float)) or limit <= 0:
+            raise RequestError(f"budget {field} must be a positive number")
+    return request
+
+
+def request_budget(limits: Budget, requested: dict[str, Any]) -> Budget:
+    # a request can lower the server's limits but not raise them
+    budget = Budget()
+    for field in BUDGET_FIELDS:
+        limit, wanted = getattr(limits, field), requested.get(field)
+        if field != "timeout" and wanted is not None:
+            wanted = int(wanted)
+        setattr(budget, field, wanted if limit is None else limit if wanted is None else min(limit, wanted))
+    return budget
+
+
+class ServerStats:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.completed = 0
+        self.cache_hits = 0
+        self.outcomes: dict[str, int] = {}
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.running = 0
+        self.waiting = 0
+        self.connections = 0
+
+    def finished(self, reply: dict[str, Any], latency: float):
+        outcome = "ok" if reply["ok"] else reply["kind"]
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        self.completed += 1
+        self.cache_hits += reply.get("cached", False)
+        self.latencies.append(latency)
+
+    def snapshot(self) -> dict[str, Any]:
+        uptime = time.monotonic() - self.started
+        latencies = sorted(self.latencies)
+        percentiles = {}
+        if len(latencies) > 1:
+            cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+            percentiles = {"p50": cuts[49], "p90": cuts[89], "p99": cuts[98]}
+        if latencies:
+            percentiles["max"] = latencies[-1]
+        return {
+            "uptime": uptime,
+            "requests": self.requests,
+            "completed": self.completed,
+            "throughput": self.completed / uptime if uptime > 0 else 0.0,
+            "latency_ms": {name: seconds * 1000 for name, seconds in percentiles.items()},
+            "outcomes": dict(sorted(self.outcomes.items())),
+            "cache_hits": self.cache_hits,
+            "running": self.running,
+            "waiting": self.waiting,
+            "connections": self.connections,
+        }
+
+
+# Serves Monkey jobs sent as newline-delimited JSON over a Unix socket or TCP. A request is
+#   {"id": ..., "op": "eval", "source": "...", "budget": {"max_steps": ...}}
+#   {"id": ..., "op": "call", "source": "...", "function": "name", "args": [...], "budget": {...}}
+#   {"id": ..., "op": "stats"}
+# and every request gets one reply line carrying its id, written as soon as it is ready, so replies to pipelined
+# requests can come back out of order. Jobs run in long-lived worker processes that cache parsed programs; pmap in a
+# job maps in its worker, so jobs never use more processes than the pool has.
+#
+# At most `workers` jobs run at once and up to max_waiting more wait for a worker; beyond that requests are turned
+# away with kind "busy". A connection with max_pipeline requests unanswered is not read until one is answered.
+# Budgets are enforced inside the workers, between evaluation steps: a single long builtin call is not interrupted.
+class Server:
+    def __init__(
+        self,
+        workers: int,
+        limits: Budget | None = None,
+        max_waiting: int = 1000,
+        max_pipeline: int = 64,
+    ):
+        self.workers = workers
+        self.limits = limits or Budget()
+        self.max_waiting = max_waiting
+        self.max_pipeline = max_pipeline
+        self.stats = ServerStats()
+        self.slots = asyncio.Semaphore(workers)
+        self.pool = self.new_pool()
+        self.server: asyncio.Server | None = None
+
+    def new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=worker.prewarm)
+
+    async def prewarm(self):
+        # submitting a job per worker at once makes the pool start all its processes now, not on first use
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, worker.ping) for _ in range(self.workers)))
+
+    async def start_unix(self, path: str):
+        await self.prewarm()
+        self.server = await asyncio.start_unix_server(self.handle_connection, path, limit=MAX_REQUEST_BYTES)
+
+    async def start_tcp(self, host: str, port: int):
+        await self.prewarm()
+        self.server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_REQUEST_BYTES)
+
+    def addresses(self) -> list[Any]:
+        return [sock.getsockname() for sock in self.server.sockets] if self.server is not None else []
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.pool.shutdown(cancel_futures=True)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats.connections += 1
+        pipeline = asyncio.Semaphore(self.max_pipeline)
+        replies: set[asyncio.Task] = set()
+        try:
+            while True:
+                await pipeline.acquire()
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await self.send(writer, {"id": None, "ok": False, "kind": "request", "error": "request too long"})
+                    break
+                if not line:
+                    break
+                task = asyncio.create_task(self.respond(line, writer, pipeline))
+                replies.add(task)
+                task.add_done_callback(replies.discard)
+            if replies:
+                await asyncio.gather(*replies)
+        except ConnectionError:
+            pass
+        finally:
+            self.stats.connections -= 1
+            writer.close()
+
+    async def respond(self, line: bytes, writer: asyncio.StreamWriter, pipeline: asyncio.Semaphore):
+        received = time.perf_counter()
+        self.stats.requests += 1
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id") if isinstance(request, dict) else None
+            reply = await self.dispatch(check_request(request))
+        except (ValueError, RequestError) as e:
+            reply = {"ok": False, "kind": "request", "error": str(e)}
+        self.stats.finished(reply, time.perf_counter() - received)
+        reply.pop("cached", None)
+        try:
+            await self.send(writer, {"id": request_id, **reply})
+        except ConnectionError:
+            pass
+        finally:
+            pipeline.release()
+
+    async def dispatch(self, request: dict[str, Any]) -> dict[str, Any]:
+        if request["op"] == "stats":
+            return {"ok": True, "stats": self.stats.snapshot()}
+        if self.slots.locked() and self.stats.waiting >= self.max_waiting:
+            return {"ok": False, "kind": "busy", "error": f"{self.stats.waiting} requests are already waiting"}
+        budget = request_budget(self.limits, request.get("budget", {}))
+        self.stats.waiting += 1
+        async with self.slots:
+            self.stats.waiting -= 1
+            self.stats.running += 1
+            try:
+                pool = self.pool
+                return await asyncio.get_running_loop().run_in_executor(pool, worker.run_job, request, budget)
+            except BrokenProcessPool as e:
+                # a worker died, taking the pool with it; later jobs get a fresh one
+                if pool is self.pool:
+                    self.pool = self.new_pool()
+                return {"ok": False, "kind": "worker", "error": f"worker failed: {e}"}
+            except Exception as e:
+                return {"ok": False, "kind": "worker", "error": f"job failed: {e!r}"}
+            finally:
+                self.stats.running -= 1
+
+    async def send(self, writer: asyncio.StreamWriter, reply: dict[str, Any]):
+        writer.write(json.dumps(reply).encode() + b"\n")
+        await writer.drain()
@@ -0,0 +1,98 @@
+import contextlib
+import io
+from collections import OrderedDict
+from typing import Any
+
+from src.evaluator import parallel
+from src.evaluator.budget import Budget
+from src.interpreter.interpreter import BudgetExceededError, Compiled, Interpreter, MonkeyError, ParseError
+
+# Parsed programs and loaded scripts kept by each worker, keyed by source; the least recently used go first.
+CACHE_SIZE = 256
+
+# Runs once in every worker process, so the first job doesn't pay for imports and first-use setup.
+PREWARM_SOURCE = 'let f = fn(xs) { map(xs, fn(x) { x * 2 }) }; len(f([1, 2])) + len("a" + "b")'
+
+compiled_programs: OrderedDict[str, Compiled] = OrderedDict()
+loaded_scripts: OrderedDict[str, Interpreter] = OrderedDict()
+
+
+def prewarm():
+    # the server's pool is all the processes jobs get; pmap in a job maps in the worker
+    parallel.in_process = True
+    Interpreter().eval(PREWARM_SOURCE)
+
+
+def ping() -> bool:
+    return True
+
+
+def cached(cache: OrderedDict, source: str) -> Any:
+    value = cache.get(source)
+    if value is not None:
+        cache.move_to_end(source)
+    return value
+
+
+def store(cache: OrderedDict, source: str, value: Any):
+    cache[source] = value
+    if len(cache) > CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def json_value(value: Any) -> Any:
+    # to_python leaves functions and other Monkey objects as they are; they are sent as their inspect() text
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    elif isinstance(value, (list, range)):
+        return [json_value(e) for e in value]
+    elif isinstance(value, dict):
+        return {k if isinstance(k, str) else str(json_value(k)): json_value(v) for k, v in value.items()}
+    return value.inspect()
+
+
+def run_eval(source: str, budget: Budget) -> tuple[Any, bool]:
+    # each script runs in fresh globals; only the parsed program is reused
+    compiled = cached(compiled_programs, source)
+    hit = compiled is not None
+    interpreter = Interpreter()
+    if compiled is None:
+        compiled = interpreter.compile(source)
+        store(compiled_programs, source, compiled)
+    return interpreter.run(compiled, budget), hit
+
+
+def run_call(source: str, function: str, args: list[Any], budget: Budget) -> tuple[Any, bool]:
+    # the script is evaluated once per worker and its globals shared by the calls made on it, so functions called
+    # this way should not depend on changing them
+    interpreter = cached(loaded_scripts, source)
+    hit = interpreter is not None
+    if interpreter is None:
+        interpreter = Interpreter()
+        interpreter.eval(source, budget)
+        store(loaded_scripts, source, interpreter)
+    return interpreter.call(function, *args, budget=budget), hit
+
+
+def run_job(request: dict[str, Any], budget: Budget) -> dict[str, Any]:
+    # runs in a worker process; request was checked by the server, and the reply is sent back as it is
+    output = io.StringIO()
+    hit = False
+    try:
+        with contextlib.redirect_stdout(output):
+            if request["op"] == "eval":
+                value, hit = run_eval(request["source"], budget)
+            else:
+                value, hit = run_call(request["source"], request["function"], request.get("args", []), budget)
+        reply = {"ok": True, "value": json_value(value)}
+    except ParseError as e:
+        reply = {"ok": False, "kind": "parse", "error": str(e)}
+    except BudgetExceededError as e:
+        reply = {"ok": False, "kind": "budget", "error": str(e)}
+    except MonkeyError as e:
+        reply = {"ok": False, "kind": "error", "error": str(e)}
+    except (NameError, TypeError) as e:
+        reply = {"ok": False, "kind": "request", "error": str(e)}
+    reply["output"] = output.getvalue()
+    reply["cached"] = hit
+    return reply
@@ -9,6 +9,7 @@ class TokenType(Enum):
     # Identifiers + literals
     IDENT = "IDENT"  # add, foobar, x, y, ...
     INT = "INT"  # 1343456
+    FLOAT = "FLOAT"  # 3.14
     STRING = "STRING"  # "foobar"
 
     # Operators
@@ -45,12 +46,18 @@ class TokenType(Enum):
     IF = "IF"
     ELSE = "ELSE"
     RETURN = "RETURN"
+    WHILE = "WHILE"
+    FOR = "FOR"
+    IN = "IN"
 
 
 class Token:
-    def __init__(self, type: TokenType, literal: str):
+    # line and column are 1-based positions of the token's first character; 0 for tokens made up by the optimizer
+    def __init__(self, type: TokenType, literal: str, line: int = 0, column: int = 0):
         self.type = type
         self.literal = literal
+        self.line = line
+        self.column = column
 
 
 keywords: dict[str, TokenType] = {
@@ -61,6 +68,9 @@ keywords: dict[str, TokenType] = {
     "if": TokenType.IF,
     "else": TokenType.ELSE,
     "return": TokenType.RETURN,
+    "while": TokenType.WHILE,
+    "for": TokenType.FOR,
+    "in": TokenType.IN,
 }
 
 
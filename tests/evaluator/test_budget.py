@@ -0,0 +1,110 @@
+import threading
+
+import pytest
+
+from src.evaluator import evaluator, hooks
+from src.evaluator.budget import Budget, BudgetMeter, evaluate_with_budget, running_meter
+from src.lexer.lexer import Lexer
+from src.object.environment import Environment, new_environment
+from src.object.object import BudgetError, Error, Integer, Object
+from src.parser.parser import Parser
+from tests.evaluator.conftest import check_integer_object, eval_factory_for_test
+
+
+def eval_with_budget(input: str, budget: Budget, env: Environment | None = None) -> Object:
+    program = Parser(Lexer(input)).parse_program()
+    return evaluate_with_budget(program, env or new_environment(), budget)
+
+
+@pytest.mark.parametrize(
+    "input, budget, expected",
+    [
+        ("while (true) { 1 }", Budget(max_steps=500), "budget exceeded: more than 500 steps"),
+        ("while (true) { 1 }", Budget(timeout=0.05), "budget exceeded: ran longer than 0.05s"),
+        ("let f = fn(x) { f(x) }; f(1)", Budget(max_depth=20), "budget exceeded: calls nested deeper than 20"),
+        (
+            "let f = memoize(fn(n) { if (n == 0) { 0 } else { n + f(n - 1) } }); f(100)",
+            Budget(max_depth=20),
+            "budget exceeded: calls nested deeper than 20",
+        ),
+        (
+            "let f = fn(x) { f(x) }; f(1)",
+            Budget(),
+            "budget exceeded: calls nested deeper than the interpreter's recursion limit",
+        ),
+        (
+            'let s = "ab"; while (true) { s = s + s }',
+            Budget(max_size=1000),
+            "budget exceeded: STRING of size 1024 is over the limit of 1000",
+        ),
+        ("collect(range(0, 50))", Budget(max_size=10), "budget exceeded: ARRAY of size 50 is over the limit of 10"),
+        ("push([1, 2], 3)", Budget(max_size=2), "budget exceeded: ARRAY of size 3 is over the limit of 2"),
+        # checked before the array is built
+        *[
+            (source, Budget(max_size=1000), "budget exceeded: ARRAY of size 30000000 is over the limit of 1000")
+            for source in [
+                "len(collect(range(30000000)))",
+                "add(range(30000000), 1)",
+                "scale(range(30000000), 2)",
+                "sort(range(30000000))",
+            ]
+        ],
+        # time spent in builtins counts when they return, though few nodes are evaluated
+        ("sum(add(range(2000000), 1))", Budget(timeout=0.01), "budget exceeded: ran longer than 0.01s"),
+    ],
+)
+def test_budget_exceeded(input: str, budget: Budget, expected: str):
+    evaluated = eval_with_budget(input, budget)
+    assert isinstance(evaluated, BudgetError)
+    assert evaluated.message == expected
+
+
+@pytest.mark.parametrize(
+    "input, budget, expected",
+    [
+        ("let f = fn(n) { if (n == 0) { 0 } else { n + f(n - 1) } }; f(10)", Budget(max_depth=11), "55"),
+        ("let f = memoize(fn(n) { if (n == 0) { 0 } else { n + f(n - 1) } }); f(10)", Budget(max_depth=11), "55"),
+        ("1 + 2 * 3", Budget(max_steps=7), "7"),
+        ("[1, 2, 3]", Budget(max_size=3, timeout=10), "[1, 2, 3]"),
+    ],
+)
+def test_within_budget(input: str, budget: Budget, expected: str):
+    assert eval_with_budget(input, budget).inspect() == expected
+
+
+def test_program_errors_are_not_budget_errors():
+    evaluated = eval_with_budget("1 + true", Budget(max_steps=100))
+    assert isinstance(evaluated, Error) and not isinstance(evaluated, BudgetError)
+
+
+def test_budget_is_per_evaluation():
+    env = new_environment()
+    assert isinstance(
+        eval_with_budget("let i = 0; while (true) { i = i + 1 }", Budget(max_steps=100), env), BudgetError
+    )
+    # bindings made before the budget ran out are kept, and the next evaluation starts with a fresh count
+    counted = eval_with_budget("i", Budget(max_steps=3), env)
+    assert isinstance(counted, Integer) and counted.value > 0
+    assert evaluator.evaluate is hooks.plain_evaluate
+    assert evaluator.apply_function is hooks.plain_apply_function
+
+
+def test_budget_only_counts_its_own_thread():
+    meter = BudgetMeter(Budget(max_steps=10, max_depth=1))
+    hooks.register(meter)
+    try:
+        results: list[Object | BudgetMeter | None] = []
+
+        def run():
+            results.append(eval_factory_for_test("let f = fn(n) { if (n == 0) { 0 } else { n + f(n - 1) } }; f(20)"))
+            results.append(running_meter())
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        check_integer_object(results[0], 210)  # type: ignore
+        assert results[1] is None
+        assert (meter.steps, meter.depth) == (0, 0)
+        assert running_meter() is meter
+    finally:
+        hooks.unregister(meter)
@@ -1,6 +1,7 @@
 import pytest
 
-from src.object.object import Array, Boolean, Error, Function, Hash, HashKey, Integer, Object, String
+from src.object.environment import frame_pool
+from src.object.object import Array, Boolean, Error, Float, Function, Hash, HashKey, Integer, Object, String
 from tests.evaluator.conftest import (
     check_boolean_object,
     check_integer_object,
@@ -320,6 +321,14 @@ def test_evaluate_string_concatenation():
         ("last(1)", "argument to `last` must be ARRAY, got INTEGER"),
         ("rest([1, 2, 3])", [2, 3]),
         ("rest([])", None),
+        ("first(range(3, 6))", 3),
+        ("first(range(0))", None),
+        ("last(range(3, 6))", 5),
+        ("last(range(10, 0, -3))", 1),
+        ("last(range(0))", None),
+        ("collect(rest(range(3, 6)))", [4, 5]),
+        ("rest(range(3, 6))[0]", 4),
+        ("rest(range(0))", None),
         ("push([], 1)", [1]),
         ("push(1, 1)", "argument to `push` must be ARRAY, got INTEGER"),
     ],
@@ -425,3 +434,500 @@ def test_evaluate_hash_index_expression(input: str, expected: int | None):
         check_null_object(obj=evaluated)
     else:
         check_integer_object(obj=evaluated, expected=expected)
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("let x = 1; x = 2; x;", 2),
+        ("let x = 1; let f = fn() { x = x + 10; }; f(); x;", 11),
+        ("let i = 0; while (i < 10) { i = i + 1; }; i;", 10),
+        ("let i = 0; while (false) { i = i + 1; }; i;", 0),
+        ("let total = 0; for (x in [1, 2, 3, 4]) { total = total + x; }; total;", 10),
+        ('let total = 0; for (k in {1: "a", 2: "b"}) { total = total + k; }; total;', 3),
+        ("let f = fn() { let i = 0; while (true) { if (i > 4) { return i; } i = i + 1; } }; f();", 5),
+        ("let f = fn(xs) { for (x in xs) { if (x > 1) { return x; } } }; f([1, 2, 3]);", 2),
+        ("let i = 0; while (i < 10000) { i = i + 1; }; i;", 10000),
+    ],
+)
+def test_evaluate_loops_and_assignment(input: str, expected: int):
+    evaluated: Object = eval_factory_for_test(input=input)
+    check_integer_object(obj=evaluated, expected=expected)
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("x = 1;", "identifier not found: x"),
+        ("for (x in 5) { x }", "for loop not supported over: INTEGER"),
+        ("let i = 0; while (i < 3) { i = i + true; }", "type mismatch: INTEGER + BOOLEAN"),
+    ],
+)
+def test_evaluate_loop_errors(input: str, expected: str):
+    evaluated = eval_factory_for_test(input=input)
+    assert isinstance(evaluated, Error)
+    assert evaluated.message == expected
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("map([1, 2, 3], fn(x) { x * 2 })", [2, 4, 6]),
+        ("map([], fn(x) { x })", []),
+        ("filter([1, 2, 3, 4], fn(x) { x > 2 })", [3, 4]),
+        ("reduce([1, 2, 3, 4], 0, fn(acc, x) { acc + x })", 10),
+        ("reduce([], 7, fn(acc, x) { acc + x })", 7),
+        ("len(range(5))", 5),
+        ("range(2, 10, 3)[1]", 5),
+        ("range(3)[3]", None),
+        ("map(range(1, 4), fn(x) { x * x })", [1, 4, 9]),
+        ("sum([1, 2, 3])", 6),
+        ("sum(range(1000001))", 500000500000),
+        ("sum(range(10, 0, -3))", 22),
+        ("min([3, 1, 2])", 1),
+        ("max([3, 1, 2])", 3),
+        ("max(range(4))", 3),
+        ("min([2, 2.0])", 2),
+        ("min([])", None),
+        ("sort([3, 1, 2])", [1, 2, 3]),
+        ("sort([3, 1, 2], fn(a, b) { a > b })", [3, 2, 1]),
+        ("sort([3, 1, 2], fn(a, b) { b - a })", [3, 2, 1]),
+        ("reverse([1, 2, 3])", [3, 2, 1]),
+        ("slice([1, 2, 3, 4], 1, 3)", [2, 3]),
+        ("slice([1, 2, 3, 4], -2)", [3, 4]),
+        ("let total = 0; for (i in range(100)) { total = total + i; }; total;", 4950),
+        ("map(1, fn(x) { x })", "argument to `map` must be ARRAY, got INTEGER"),
+        ("map([1], 1)", "argument to `map` must be FUNCTION, got INTEGER"),
+        ("map([1, true], fn(x) { x + 1 })", "type mismatch: BOOLEAN + INTEGER"),
+        ("sort([1, true], fn(a, b) { a < b })", "type mismatch: BOOLEAN < INTEGER"),
+        ('sort([1, "a"])', "elements of `sort` must share a type, got INTEGER and STRING"),
+        ('sum(["a"])', "elements of `sum` must be INTEGER or FLOAT, got STRING"),
+        ("range(1, 2, 0)", "`range` step must not be zero"),
+    ],
+)
+def test_evaluate_collection_built_in_functions(input: str, expected: int | list[int] | str | None):
+    evaluated: Object = eval_factory_for_test(input=input)
+    if expected is None:
+        check_null_object(obj=evaluated)
+    if isinstance(expected, int):
+        check_integer_object(obj=evaluated, expected=expected)
+    if isinstance(expected, str):
+        assert isinstance(evaluated, Error)
+        assert evaluated.message == expected
+    if isinstance(expected, list):
+        assert isinstance(evaluated, Array)
+        assert [e.value for e in evaluated.elements] == expected  # type: ignore
+
+
+def test_evaluate_map_over_large_array_without_recursion():
+    input = "sum(map(range(20000), fn(x) { x + 1 }))"
+    evaluated: Object = eval_factory_for_test(input=input)
+    check_integer_object(obj=evaluated, expected=20000 * 20001 // 2)
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("collect(lazy_map([1, 2, 3], fn(x) { x * 10 }))", [10, 20, 30]),
+        ("collect(lazy_filter(range(10), fn(x) { x > 6 }))", [7, 8, 9]),
+        ("collect(take(range(1000000000), 3))", [0, 1, 2]),
+        ("collect(drop(range(5), 3))", [3, 4]),
+        ("collect(take(drop(lazy_map(range(1000000000), fn(x) { x * x }), 2), 2))", [4, 9]),
+        ("len(lazy_filter(range(10), fn(x) { x > 4 }))", 5),
+        ("first(lazy_map(range(1000000000), fn(x) { x + 7 }))", 7),
+        ("first(take(range(5), 0))", None),
+        ("collect(rest(take(range(5), 3)))", [1, 2]),
+        ("lazy_map(range(1000000000), fn(x) { x * 2 })[21]", 42),
+        ("take(range(3), 2)[5]", None),
+        ("sum(take(range(1, 1000000000), 4))", 10),
+        ("let s = lazy_map([1, 2], fn(x) { x + 1 }); len(s) + len(s);", 4),
+        ("let total = 0; for (x in take(range(100), 4)) { total = total + x; }; total;", 6),
+        ("collect(lazy_map([1, true], fn(x) { x + 1 }))", "type mismatch: BOOLEAN + INTEGER"),
+        ("for (x in lazy_map([true], fn(x) { -x })) { x }", "unknown operator: -BOOLEAN"),
+        ("take(range(3), -1)", "argument to `take` must be a non-negative INTEGER, got -1"),
+        ("lazy_map(1, fn(x) { x })", "argument to `lazy_map` must be ARRAY or SEQUENCE, got INTEGER"),
+    ],
+)
+def test_evaluate_lazy_sequences(input: str, expected: int | list[int] | str | None):
+    evaluated: Object = eval_factory_for_test(input=input)
+    if expected is None:
+        check_null_object(obj=evaluated)
+    if isinstance(expected, int):
+        check_integer_object(obj=evaluated, expected=expected)
+    if isinstance(expected, str):
+        assert isinstance(evaluated, Error)
+        assert evaluated.message == expected
+    if isinstance(expected, list):
+        assert isinstance(evaluated, Array)
+        assert [e.value for e in evaluated.elements] == expected  # type: ignore
+
+
+def test_evaluate_lines_sequence(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("alpha\nbeta\ngamma\n")
+    evaluated: Object = eval_factory_for_test(input=f'collect(drop(lines("{path}"), 1))')
+    assert isinstance(evaluated, Array)
+    assert [e.value for e in evaluated.elements] == ["beta", "gamma"]  # type: ignore
+
+    evaluated = eval_factory_for_test(input=f'lines("{tmp_path / "missing.txt"}")')
+    assert isinstance(evaluated, Error)
+    assert evaluated.message.startswith("could not open")
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ('substr("hello world", 6)', "world"),
+        ('substr("hello world", 0, 5)', "hello"),
+        ('substr("hello world", -5, 2)', "wo"),
+        ('substr(substr("hello world", 6), 1, 3)', "orl"),
+        ('join(split("a,b,,c", ","), "|")', "a|b||c"),
+        ('join(split("  many   spaced words "), "-")', "many-spaced-words"),
+        ('join(split(substr("x a b", 1)), "+")', "a+b"),
+        ('join(["a", "b", "c"])', "abc"),
+        ('find("hello", "ll")', 2),
+        ('find("hello", "z")', -1),
+        ('find(substr("abcabc", 1), "a")', 2),
+        ('join(chars("abc"), " ")', "a b c"),
+        ('upper("MonKey")', "MONKEY"),
+        ('lower("MonKey")', "monkey"),
+        ('trim("  padded \n")', "padded"),
+        ('starts_with("monkey", "mon")', True),
+        ('starts_with(substr("monkey", 3), "mon")', False),
+        ('if (starts_with("monkey", "x")) { 1 } else { 2 }', 2),
+        ('"monkey"[1]', "o"),
+        ('"monkey"[10]', None),
+        ('len(split("a b c")[1])', 1),
+        ('{"b": 1}[split("a b")[1]]', 1),
+        ('split("abc", "")', "`split` separator must not be empty"),
+        ('join([1], ",")', "elements of `join` must be STRING, got INTEGER"),
+        ("upper(1)", "argument to `upper` must be STRING, got INTEGER"),
+    ],
+)
+def test_evaluate_string_built_in_functions(input: str, expected: int | bool | str | None):
+    evaluated: Object = eval_factory_for_test(input=input)
+    if expected is None:
+        check_null_object(obj=evaluated)
+    elif isinstance(expected, bool):
+        check_boolean_object(obj=evaluated, expected=expected)
+    elif isinstance(expected, int):
+        check_integer_object(obj=evaluated, expected=expected)
+    elif isinstance(evaluated, Error):
+        assert evaluated.message == expected
+    else:
+        assert isinstance(evaluated, String)
+        assert evaluated.value == expected
+
+
+def test_evaluate_record_hashes_share_shape():
+    input = """
+let make = fn(name, age) { {"name": name, "age": age} };
+[make("a", 1), make("b", 2), {"name": "c", "age": 3}, {"age": 4, "name": "d"}]
+"""
+    evaluated: Object = eval_factory_for_test(input=input)
+    assert isinstance(evaluated, Array)
+    records = evaluated.elements
+    assert all(isinstance(r, Hash) and r.shape is not None for r in records)
+    assert records[0].shape is records[1].shape is records[2].shape  # type: ignore
+    assert records[3].shape is not records[0].shape  # type: ignore
+    assert records[3].inspect() == "{age: 4, name: d}"
+
+    got = records[1].pairs[String("age").hash_key()]  # type: ignore
+    check_integer_object(obj=got.value, expected=2)
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ('let r = {"x": 1, "y": 2}; r["y"]', 2),
+        ('let r = {"x": 1, "y": 2}; r["z"]', None),
+        ('let r = {"x": 1, "y": 2}; let k = "x"; r[k]', 1),
+        ('let r = {"x": 1, "y": 2}; r["x" + ""]', 1),
+        ('let r = {"x": 1, "x": 2}; r["x"]', 2),
+        ('let r = {"x": 1, 2: 3}; r["x"] + r[2]', 4),
+        (
+            """
+let getY = fn(r) { r["y"] };
+getY({"x": 1, "y": 2}) + getY({"y": 10, "x": 1}) + getY({"y": 100}) + getY({"x": 1, "y": 2});
+""",
+            114,
+        ),
+    ],
+)
+def test_evaluate_record_field_access(input: str, expected: int | None):
+    evaluated: Object = eval_factory_for_test(input=input)
+    if expected is None:
+        check_null_object(obj=evaluated)
+    else:
+        check_integer_object(obj=evaluated, expected=expected)
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        (
+            """
+let fib = memoize(fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } }, 100);
+fib(50);
+""",
+            12586269025,
+        ),
+        (
+            """
+let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+let fast = memoize(fib, 100);
+fast(60);
+""",
+            1548008755920,
+        ),
+        (
+            """
+let fib = memoize(fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } }, 100);
+fib(30);
+let stats = memo_stats(fib);
+stats["hits"] * 1000 + stats["misses"];
+""",
+            28031,
+        ),
+        (
+            """
+let sq = memoize(fn(x) { x * x }, 2);
+sq(1); sq(2); sq(3); sq(1);
+let stats = memo_stats(sq);
+[stats["evictions"], stats["size"], stats["hits"]];
+""",
+            [2, 2, 0],
+        ),
+        (
+            """
+let calls = 0;
+let f = memoize(fn(x) { calls = calls + 1; len(x) }, 10);
+f([1, 2]); f([1, 2]);
+calls;
+""",
+            2,
+        ),
+        ("memoize(len, 1)", "argument to `memoize` must be FUNCTION, got BUILTIN"),
+        ("memoize(fn(x) { x }, 0)", "argument to `memoize` must be a positive INTEGER, got 0"),
+        ("memo_stats(fn(x) { x })", "argument to `memo_stats` must be a memoized function, got FUNCTION"),
+    ],
+)
+def test_evaluate_memoize(input: str, expected: int | list[int] | str):
+    evaluated: Object = eval_factory_for_test(input=input)
+    if isinstance(expected, int):
+        check_integer_object(obj=evaluated, expected=expected)
+    if isinstance(expected, str):
+        assert isinstance(evaluated, Error)
+        assert evaluated.message == expected
+    if isinstance(expected, list):
+        assert isinstance(evaluated, Array)
+        assert [e.value for e in evaluated.elements] == expected  # type: ignore
+
+
+def test_evaluate_closure_captures_only_free_variables():
+    input = """
+let make = fn() {
+  let big = [1, 2, 3, 4, 5];
+  let n = len(big);
+  fn(x) { x + n }
+};
+make();
+"""
+    evaluated: Object = eval_factory_for_test(input=input)
+    assert isinstance(evaluated, Function)
+    assert set(evaluated.env.store) == {"n"}
+    assert evaluated.env.outer is not None and evaluated.env.outer.outer is None
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("let newAdder = fn(x) { fn(y) { x + y } }; newAdder(2)(3);", 5),
+        ("let a = fn(x) { fn(y) { fn(z) { x + y + z } } }; a(1)(2)(3);", 6),
+        ("let counter = fn() { let n = 0; fn() { n = n + 1; n } }; let c = counter(); c(); c(); c();", 3),
+        ("let f = fn() { let n = 1; let g = fn() { n }; let n = 2; g() }; f();", 2),
+        ("let x = 1; let f = fn() { let g = fn() { x }; let x = 5; g() }; f();", 5),
+        ("let f = fn() { let go = fn(n) { if (n == 0) { 0 } else { go(n - 1) } }; go(5) }; f();", 0),
+        ("let f = fn() { let a = fn() { b() }; let b = fn() { 7 }; a() }; f();", 7),
+        (
+            """
+let f = fn(xs) {
+  let fs = [];
+  for (x in xs) { let y = x * 10; fs = push(fs, fn() { y }); }
+  fs[0]() + fs[1]()
+};
+f([1, 2]);
+""",
+            40,
+        ),
+        ("let g = 1; let f = fn() { fn() { g } }; let h = f(); let g = 2; h();", 2),
+        ("let f = fn(a) { fn() { len(a) } }; f([1, 2])();", 2),
+    ],
+)
+def test_evaluate_flat_closures_preserve_scoping(input: str, expected: int):
+    evaluated: Object = eval_factory_for_test(input=input)
+    check_integer_object(obj=evaluated, expected=expected)
+
+
+def test_evaluate_recycles_non_escaping_frames():
+    frame_pool.clear()
+    check_integer_object(obj=eval_factory_for_test(input="let f = fn(x) { x + 1 }; f(1) + f(2);"), expected=5)
+    assert len(frame_pool) == 1
+
+    frame_pool.clear()
+    input = "let f = fn(x) { fn() { x } }; let g = f(1); f(2); g();"
+    check_integer_object(obj=eval_factory_for_test(input=input), expected=1)
+    # only the frame of g(); f creates closures so its frames are left to the garbage collector
+    assert len(frame_pool) == 1
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } }; fib(15);", 610),
+        ("let id = fn(x) { x }; let a = id([1]); let b = id([2]); a[0] + b[0];", 3),
+        ("let sq = fn(x) { x * x }; sum(map([1, 2, 3], sq));", 14),
+        ("let f = fn(x) { let y = x; y = y + 1; y }; f(1) + f(10);", 13),
+        ("let outer = fn(x) { let inner = fn(y) { x + y }; inner(1) + inner(2) }; outer(10);", 23),
+    ],
+)
+def test_evaluate_with_recycled_frames(input: str, expected: int):
+    evaluated: Object = eval_factory_for_test(input=input)
+    check_integer_object(obj=evaluated, expected=expected)
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("1.5", 1.5),
+        ("-2.5", -2.5),
+        ("1.5 + 1.5", 3.0),
+        ("1 + 0.5", 1.5),
+        ("0.5 * 4", 2.0),
+        ("7 / 2.0", 3.5),
+        ("1.0 - 3", -2.0),
+        ("let x = 0.25; x * x", 0.0625),
+    ],
+)
+def test_evaluate_float_expression(input: str, expected: float):
+    evaluated: Object = eval_factory_for_test(input=input)
+    assert isinstance(evaluated, Float)
+    assert evaluated.value == expected
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("sum([1.5, 2])", 3.5),
+        ("sum([1, 2, 0.5])", 3.5),
+        ("sum(map(range(4), fn(x) { x * 0.5 }))", 3.0),
+        ("min([1.5, 2])", 1.5),
+        ("max([1, 2.5, 2])", 2.5),
+        ("sort([2, 0.5, 1])[0]", 0.5),
+    ],
+)
+def test_evaluate_float_collection_built_in_functions(input: str, expected: float):
+    evaluated: Object = eval_factory_for_test(input=input)
+    assert isinstance(evaluated, Float)
+    assert evaluated.value == expected
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("1.5 < 2", True),
+        ("2 > 1.5", True),
+        ("1 == 1.0", True),
+        ("0.5 != 0.5", False),
+        ("!1.5", False),
+        ("9007199254740993 == 9007199254740992.0", False),
+    ],
+)
+def test_evaluate_float_comparison(input: str, expected: bool):
+    check_boolean_object(obj=eval_factory_for_test(input=input), expected=expected)
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("7 / 2", 3),
+        ("-7 / 2", -3),
+        ("7 / -2", -3),
+        ("-7 / -2", 3),
+        ("100000000000000000000000000001 / 1", 100000000000000000000000000001),
+        ("(10000000000000000000000 * 3 + 1) / 3", 10000000000000000000000),
+    ],
+)
+def test_evaluate_exact_integer_division(input: str, expected: int):
+    check_integer_object(obj=eval_factory_for_test(input=input), expected=expected)
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("1 / 0", "division by zero"),
+        ("1.5 / 0", "division by zero"),
+        ('1.5 + "a"', "type mismatch: FLOAT + STRING"),
+        ("-true", "unknown operator: -BOOLEAN"),
+        ('"a" == "a"', "unknown operator: STRING == STRING"),
+        (
+            "let x = 2; let i = 0; while (i < 11) { x = x * x; i = i + 1 }; x * 1.5",
+            "integer too large to convert to FLOAT",
+        ),
+        (
+            "let x = 2; let i = 0; while (i < 11) { x = x * x; i = i + 1 }; 1.5 / x",
+            "integer too large to convert to FLOAT",
+        ),
+        (
+            "let x = 2; let i = 0; while (i < 11) { x = x * x; i = i + 1 }; sum([x, 1.5])",
+            "integer too large to convert to FLOAT",
+        ),
+        ('min([1.5, "a"])', "elements of `min` must share a type, got FLOAT and STRING"),
+        ("max([1.5, true])", "elements of `max` must be INTEGER, FLOAT or STRING, got BOOLEAN"),
+    ],
+)
+def test_evaluate_numeric_errors(input: str, expected: str):
+    evaluated: Object = eval_factory_for_test(input=input)
+    assert isinstance(evaluated, Error)
+    assert evaluated.message == expected
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("let xs = collect(range(100)); [len(xs), xs[99], first(xs), last(xs), xs[100]]", [100, 99, 0, 99, "null"]),
+        (
+            "let xs = collect(range(100)); [sum(xs), min(xs), max(xs), len(rest(xs)), first(reverse(xs))]",
+            [4950, 0, 99, 99, 99],
+        ),
+        ("let xs = reverse(collect(range(40))); sort(xs)[0] + last(sort(xs))", 39),
+        ("let xs = collect(range(40)); let t = 0; for (x in xs) { t = t + x; } t", 780),
+        ("let xs = collect(range(40)); sum(map(xs, fn(x) { x * 2 }))", 1560),
+        ('let xs = push(collect(range(40)), "x"); [len(xs), xs[40]]', [41, "x"]),
+        ("add([1, 2, 3], [10, 20, 30])", [11, 22, 33]),
+        ("add([1, 2, 3], 5)", [6, 7, 8]),
+        ("add(range(3), range(3))", [0, 2, 4]),
+        ("scale([1, -2, 3], 3)", [3, -6, 9]),
+        ("dot([1, 2, 3], [4, 5, 6])", 32),
+        ("dot(collect(range(100)), collect(range(100)))", 328350),
+        ("argmax([3, 9, 2, 9])", 1),
+        ("argmax([])", None),
+        ("scale([9223372036854775807], 2)", [18446744073709551614]),
+        ("add([1], [1, 2])", "arguments to `add` must have the same length, got 1 and 2"),
+        ('dot([1, "a"], [1, 2])', "elements of `dot` must be INTEGER, got STRING"),
+        ("scale([1], true)", "argument to `scale` must be INTEGER, got BOOLEAN"),
+        ('argmax("abc")', "argument to `argmax` must be ARRAY, got STRING"),
+    ],
+)
+def test_evaluate_integer_array_built_in_functions(input: str, expected: int | list | str | None):
+    evaluated: Object = eval_factory_for_test(input=input)
+    if isinstance(expected, int):
+        check_integer_object(obj=evaluated, expected=expected)
+    elif isinstance(expected, str):
+        assert isinstance(evaluated, Error)
+        assert evaluated.message == expected
+    elif expected is None:
+        check_null_object(obj=evaluated)
+    else:
+        assert isinstance(evaluated, Array)
+        assert [e.inspect() for e in evaluated.elements] == [e if isinstance(e, str) else str(e) for e in expected]
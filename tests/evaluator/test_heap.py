@@ -0,0 +1,92 @@
+import gc
+import tracemalloc
+
+import pytest
+
+from src.evaluator.heap import HeapAccounting, approximate_size
+from src.object.object import Array, Error, Hash, Integer, ObjectType, String
+from tests.evaluator.conftest import eval_factory_for_test
+
+
+@pytest.fixture
+def heap():
+    accounting = HeapAccounting()
+    accounting.start()
+    yield accounting
+    accounting.stop()
+
+
+def test_heap_counts_allocations_by_type(heap: HeapAccounting):
+    eval_factory_for_test('let xs = [1, 2, 3]; let s = "a" + "b"; let h = {"k": xs}; fn(x) { x }')
+    counts = {object_type: stats.total for object_type, stats in heap.types.items()}
+    assert counts == {
+        ObjectType.INTEGER: 3,
+        ObjectType.ARRAY: 1,
+        ObjectType.STRING: 3,
+        ObjectType.HASH: 1,
+        ObjectType.FUNCTION: 1,
+    }
+
+
+def test_heap_tracks_live_objects(heap: HeapAccounting):
+    xs = eval_factory_for_test("let xs = collect(range(0, 100)); let ys = map(xs, fn(x) { x * 2 }); xs")
+    gc.collect()
+    arrays = heap.types[ObjectType.ARRAY]
+    assert (arrays.total, arrays.live) == (2, 1)
+    # measured when the array was made; its attribute dict may have been resized since
+    assert abs(arrays.live_bytes - approximate_size(xs)) < 64
+    assert heap.types[ObjectType.INTEGER].live == 0
+    del xs
+    gc.collect()
+    assert arrays.live == 0 and arrays.live_bytes == 0
+
+
+def test_heap_counts_returned_arguments_once(heap: HeapAccounting):
+    eval_factory_for_test("let xs = [[1]]; first(xs); first(xs)")
+    assert heap.types[ObjectType.ARRAY].total == 2
+
+
+def test_heap_stats_builtin(heap: HeapAccounting):
+    evaluated = eval_factory_for_test("let xs = [1, 2]; heap_stats()")
+    assert isinstance(evaluated, Hash)
+    assert evaluated.inspect().startswith("{INTEGER: {live: 2, total: 2, live_bytes: ")
+
+
+def test_heap_stats_builtin_needs_accounting():
+    evaluated = eval_factory_for_test("heap_stats()")
+    assert isinstance(evaluated, Error)
+    assert evaluated.message == "heap accounting is not running"
+
+
+def test_approximate_size_includes_owned_containers():
+    small, large = Array([Integer(1)]), Array([Integer(1)] * 1000)
+    assert approximate_size(large) - approximate_size(small) >= 999 * 8
+    compact = Array([Integer(i) for i in range(1000)])
+    assert compact.ints is not None
+    assert approximate_size(compact) >= 8000
+    assert approximate_size(String("x" * 1000)) > approximate_size(String("x"))
+
+
+def test_heap_trace_diff():
+    accounting = HeapAccounting(trace=True)
+    accounting.start()
+    try:
+        eval_factory_for_test("let xs = map(collect(range(0, 500)), fn(x) { x * 2 })")
+        assert accounting.diff(limit=3).count("\n") == 3
+    finally:
+        accounting.stop()
+
+
+def test_heap_trace_leaves_tracing_it_did_not_start():
+    tracemalloc.start()
+    try:
+        accounting = HeapAccounting(trace=True)
+        accounting.start()
+        accounting.stop()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    accounting = HeapAccounting(trace=True)
+    accounting.start()
+    accounting.stop()
+    assert not tracemalloc.is_tracing()
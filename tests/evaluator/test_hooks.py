@@ -0,0 +1,112 @@
+import pytest
+
+from src.ast.ast import CallExpression, IntegerLiteral, Node
+from src.evaluator import evaluator, hooks
+from src.evaluator.hooks import Hooks
+from src.object.object import Error, Object
+from tests.evaluator.conftest import eval_factory_for_test
+
+
+class Recorder(Hooks):
+    def __init__(self):
+        self.events: list[tuple] = []
+
+    def on_call(self, fn: Object, args: list[Object]):
+        self.events.append(("call", fn.type().value, [a.inspect() for a in args]))
+
+    def on_return(self, fn: Object, result: Object):
+        self.events.append(("return", fn.type().value, result.inspect()))
+
+    def on_error(self, error: Error, node: Node):
+        self.events.append(("error", error.message, str(node)))
+
+
+class CallNodes(Hooks):
+    node_types = (CallExpression,)
+
+    def __init__(self):
+        self.nodes: list[str] = []
+
+    def on_node(self, node: Node, result: Object):
+        self.nodes.append(f"{node} => {result.inspect()}")
+
+
+class Allocations(Hooks):
+    def __init__(self):
+        self.values: list[str] = []
+
+    def on_alloc(self, obj: Object, node: Node | None):
+        self.values.append(obj.inspect())
+
+
+@pytest.fixture
+def registered():
+    added: list[Hooks] = []
+
+    def add(h: Hooks) -> Hooks:
+        hooks.register(h)
+        added.append(h)
+        return h
+
+    yield add
+    for h in added:
+        hooks.unregister(h)
+
+
+def test_hooks_see_calls_and_errors(registered):
+    recorder = registered(Recorder())
+    eval_factory_for_test("let f = fn(x) { len(x) }; f([1, 2]); f(1) + 1;")
+    assert recorder.events == [
+        ("call", "FUNCTION", ["[1, 2]"]),
+        ("call", "BUILTIN", ["[1, 2]"]),
+        ("return", "BUILTIN", "2"),
+        ("return", "FUNCTION", "2"),
+        ("call", "FUNCTION", ["1"]),
+        ("call", "BUILTIN", ["1"]),
+        ("return", "BUILTIN", "ERROR: argument to `len` not supported, got INTEGER"),
+        ("error", "argument to `len` not supported, got INTEGER", "len(x)"),
+        ("return", "FUNCTION", "ERROR: argument to `len` not supported, got INTEGER"),
+    ]
+
+
+def test_on_node_filters_by_node_type(registered):
+    calls = registered(CallNodes())
+    eval_factory_for_test("let f = fn(x) { x * 2 }; f(f(1)) + 1")
+    assert calls.nodes == ["f(1) => 2", "f(f(1)) => 4"]
+
+
+def test_on_alloc(registered):
+    allocations = registered(Allocations())
+    eval_factory_for_test('let x = 5; let xs = [x, "a"]; push(xs, x - 1); x; true')
+    assert allocations.values == ["5", "a", "[5, a]", "1", "4", "[5, a, 4]"]
+
+
+def test_on_node_sees_every_node(registered):
+    class Literals(Hooks):
+        def __init__(self):
+            self.count = 0
+
+        def on_node(self, node: Node, result: Object):
+            self.count += isinstance(node, IntegerLiteral)
+
+    literals = registered(Literals())
+    eval_factory_for_test("1 + 2 * 3")
+    assert literals.count == 3
+
+
+def test_hooks_install_only_the_traced_functions_they_need(registered):
+    registered(CallNodes())
+    assert evaluator.evaluate is hooks.traced_evaluate
+    assert evaluator.apply_function is hooks.plain_apply_function
+
+
+def test_unregistered_hooks_restore_plain_functions():
+    recorder = Recorder()
+    hooks.register(recorder)
+    assert evaluator.evaluate is hooks.traced_evaluate
+    assert evaluator.apply_function is hooks.traced_apply_function
+    hooks.unregister(recorder)
+    assert evaluator.evaluate is hooks.plain_evaluate
+    assert evaluator.apply_function is hooks.plain_apply_function
+    eval_factory_for_test("let f = fn() { 1 }; f()")
+    assert recorder.events == []
@@ -0,0 +1,155 @@
+import pytest
+
+from src.evaluator import parallel
+from src.evaluator.budget import Budget
+from src.evaluator.parallel import CodecError, Decoder, Encoder, executors
+from src.object.object import Array, BudgetError, Error, Float, Function, Hash, Integer, Object, String, get_shape
+from tests.evaluator.conftest import eval_factory_for_test
+from tests.evaluator.test_budget import eval_with_budget
+
+
+@pytest.fixture(scope="module", autouse=True)
+def shutdown_executors():
+    yield
+    for executor in executors.values():
+        executor.shutdown()
+    executors.clear()
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("pmap([1, 2, 3], fn(x) { x * 2 }, 2)", "[2, 4, 6]"),
+        ("pmap(range(0, 50), fn(x) { x * x }, 3)", str([x * x for x in range(50)])),
+        ("pmap([], fn(x) { x }, 2)", "[]"),
+        ('pmap(["a", "b"], upper, 2)', "[A, B]"),
+        ("let k = 10; pmap([1, 2], fn(x) { x + k }, 2)", "[11, 12]"),
+        ("let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } }; pmap([10, 15], fib, 2)", "[55, 610]"),
+        ("let add = fn(a) { fn(b) { a + b } }; pmap([1, 2], add(5), 2)", "[6, 7]"),
+        ("pmap([1, 2], fn(x) { fn(y) { x + y } }, 2)[1](10)", "12"),
+        (
+            'pmap([1.5, 2.5], fn(x) { {"v": x, "t": [x, true, if (false) { 1 }]} }, 2)',
+            "[{v: 1.5, t: [1.5, true, null]}, {v: 2.5, t: [2.5, true, null]}]",
+        ),
+        ("pmap([1, 2, 3], fn(x) { x * 2 })", "[2, 4, 6]"),
+    ],
+)
+def test_pmap(input: str, expected: str):
+    evaluated = eval_factory_for_test(input=input)
+    assert not isinstance(evaluated, Error), evaluated.inspect()
+    assert evaluated.inspect() == expected
+
+
+def test_pmap_matches_map():
+    source = "let f = fn(x) { x * 3 - 1 }; let xs = range(0, 200);"
+    parallel = eval_factory_for_test(source + "pmap(collect(xs), f, 4)")
+    serial = eval_factory_for_test(source + "map(xs, f)")
+    assert parallel.inspect() == serial.inspect()
+
+
+def test_pmap_caps_workers_and_keeps_one_pool(monkeypatch):
+    monkeypatch.setattr(parallel, "default_workers", lambda: 2)
+    assert eval_factory_for_test("pmap(range(0, 10), fn(x) { x }, 10000)").inspect() == str(list(range(10)))
+    assert list(executors) == [2]
+    assert eval_factory_for_test("pmap([1], fn(x) { x }, 1)").inspect() == "[1]"
+    assert list(executors) == [1]
+
+
+SLOW = "fn(x) { let i = 0; while (i < 300000) { i = i + 1 }; i }"
+
+
+@pytest.mark.parametrize(
+    "input, budget, expected",
+    [
+        (f"pmap([1, 2], {SLOW}, 2)", Budget(max_steps=1000), "budget exceeded: more than 1000 steps"),
+        (f"pmap([1, 2], {SLOW}, 2)", Budget(timeout=0.1), "budget exceeded: ran longer than 0.1s"),
+        # each chunk stays within what is left, but together they don't
+        (
+            "pmap(range(0, 8), fn(x) { let i = 0; while (i < 30) { i = i + 1 }; i }, 2)",
+            Budget(max_steps=1000),
+            "budget exceeded: more than 1000 steps",
+        ),
+        ("let f = fn(x) { f(x) }; pmap([1], f)", Budget(max_depth=50), "budget exceeded: calls nested deeper than 50"),
+        (
+            "pmap([1], fn(x) { collect(range(0, 50)) })",
+            Budget(max_size=10),
+            "budget exceeded: ARRAY of size 50 is over the limit of 10",
+        ),
+    ],
+)
+def test_pmap_workers_keep_to_the_budget(input: str, budget: Budget, expected: str):
+    evaluated = eval_with_budget(input, budget)
+    assert isinstance(evaluated, BudgetError)
+    assert evaluated.message == expected
+
+
+def test_pmap_within_budget():
+    evaluated = eval_with_budget("pmap([1, 2], fn(x) { x * 2 }, 2)", Budget(max_steps=100, timeout=10))
+    assert evaluated.inspect() == "[2, 4]"
+
+
+def test_pool_started_under_a_budget_does_not_keep_it():
+    for executor in executors.values():
+        executor.shutdown()
+    executors.clear()
+    assert eval_with_budget("pmap([1, 2], fn(x) { x }, 2)", Budget(max_steps=200)).inspect() == "[1, 2]"
+    evaluated = eval_factory_for_test("len(pmap(range(0, 100), fn(x) { let i = 0; while (i < 10) { i = i + 1 }; i }))")
+    assert evaluated.inspect() == "100"
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("pmap([1, 0], fn(x) { 10 / x }, 2)", "division by zero"),
+        ("pmap([1], fn(x) { x + true }, 1)", "type mismatch: INTEGER + BOOLEAN"),
+        (
+            "let s = lazy_map([1], fn(x) { x }); pmap([1], fn(x) { s }, 1)",
+            "pmap cannot send SEQUENCE to a worker process",
+        ),
+        ("pmap([1], fn(x) { lazy_map([x], fn(y) { y }) }, 1)", "pmap cannot send SEQUENCE to a worker process"),
+        ("pmap([1], memoize(fn(x) { x }), 1)", "pmap cannot send a memoized function to a worker process"),
+        ("pmap(1, fn(x) { x }, 1)", "argument to `pmap` must be ARRAY, got INTEGER"),
+        ("pmap([1], 1, 1)", "argument to `pmap` must be FUNCTION, got INTEGER"),
+        ("pmap([1], fn(x) { x }, 0)", "worker count to `pmap` must be a positive INTEGER, got 0"),
+        ("pmap([1])", "wrong number of arguments. got=1, want=2 or 3"),
+    ],
+)
+def test_pmap_errors(input: str, expected: str):
+    evaluated = eval_factory_for_test(input=input)
+    assert isinstance(evaluated, Error)
+    assert evaluated.message == expected
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        Integer(2**70),
+        Float(0.25),
+        String("text"),
+        Array([Integer(1), String("a")]),
+        Array([Integer(i) for i in range(100)]),
+        Hash.record(get_shape(("a", "b")), [Integer(1), Array([])]),
+    ],
+)
+def test_codec_round_trip(obj: Object):
+    encoder = Encoder()
+    decoded = Decoder(encoder.functions).decode(encoder.encode(obj))
+    assert type(decoded) is type(obj)
+    assert decoded.inspect() == obj.inspect()
+
+
+def test_codec_shares_recursive_functions():
+    fn = eval_factory_for_test("let f = fn(n) { if (n == 0) { 0 } else { f(n - 1) } }; f")
+    assert isinstance(fn, Function)
+    encoder = Encoder()
+    data = encoder.encode(fn)
+    assert len(encoder.functions) == 1
+    decoded = Decoder(encoder.functions).decode(data)
+    assert isinstance(decoded, Function)
+    assert decoded.env.get("f") == (decoded, True)
+
+
+def test_codec_rejects_unsupported_values():
+    sequence = eval_factory_for_test("lazy_map([1], fn(x) { x })")
+    with pytest.raises(CodecError):
+        Encoder().encode(sequence)
@@ -0,0 +1,71 @@
+import itertools
+
+from src.evaluator import evaluator
+from src.evaluator.profiler import Profiler
+from tests.evaluator.conftest import check_integer_object, eval_factory_for_test
+
+
+def ticking_profiler() -> Profiler:
+    # every clock reading is one second after the previous one
+    ticks = itertools.count()
+    return Profiler(clock=lambda: float(next(ticks)))
+
+
+def test_profiler_counts_calls_per_function():
+    with Profiler() as profiler:
+        evaluated = eval_factory_for_test(
+            "let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };\n"
+            "let inc = fn(x) { x + 1 };\n"
+            "inc(fib(5)) + map([1, 2], fn(x) { x })[0]"
+        )
+    check_integer_object(evaluated, 7)
+    calls = {stats.label: stats.calls for stats in profiler.functions.values()}
+    assert calls == {"fib@1:17": 15, "inc@2:17": 1, "<anonymous>@3:33": 2}
+
+
+def test_profiler_counts_memoized_misses():
+    with Profiler() as profiler:
+        evaluated = eval_factory_for_test(
+            "let fib = memoize(fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } }); fib(10) + fib(10)"
+        )
+    check_integer_object(evaluated, 110)
+    assert [stats.calls for stats in profiler.functions.values()] == [11]
+
+
+def test_profiler_self_and_total_time():
+    profiler = ticking_profiler()
+    with profiler:
+        eval_factory_for_test("let leaf = fn() { 1 }; let outer = fn() { leaf() + leaf() }; outer()")
+    stats = {s.label.split("@")[0]: s for s in profiler.functions.values()}
+    # outer: starts at 0 and ends at 5; each leaf call spans one tick
+    assert (stats["leaf"].calls, stats["leaf"].total_time, stats["leaf"].self_time) == (2, 2.0, 2.0)
+    assert (stats["outer"].total_time, stats["outer"].self_time) == (5.0, 3.0)
+
+
+def test_profiler_counts_recursive_total_time_once():
+    profiler = ticking_profiler()
+    with profiler:
+        eval_factory_for_test("let down = fn(n) { if (n > 0) { down(n - 1) } else { 0 } }; down(2)")
+    [stats] = profiler.functions.values()
+    assert stats.calls == 3
+    assert stats.total_time == 5.0
+    assert stats.self_time == 5.0
+
+
+def test_profiler_report_and_collapsed_stacks():
+    profiler = ticking_profiler()
+    with profiler:
+        eval_factory_for_test("let leaf = fn() { 1 }; let outer = fn() { leaf() + leaf() }; outer()")
+    report = profiler.report().splitlines()
+    assert report[0].split() == ["calls", "total_s", "self_s", "function"]
+    assert [line.split()[-1] for line in report[1:]] == ["outer@1:41", "leaf@1:17"]
+    assert profiler.collapsed() == "outer@1:41 3000000\nouter@1:41;leaf@1:17 2000000\n"
+
+
+def test_profiler_restores_apply_function():
+    original = evaluator.apply_function
+    profiler = Profiler()
+    profiler.start()
+    assert evaluator.apply_function != original
+    profiler.stop()
+    assert evaluator.apply_function is original
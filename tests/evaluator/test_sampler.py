@@ -0,0 +1,74 @@
+import sys
+
+import pytest
+
+from src.evaluator.built_ins import builtin_funcs
+from src.evaluator.sampler import LineSampler
+from src.object.object import NULL, BuiltIn, Object
+from tests.evaluator.conftest import eval_factory_for_test
+
+HOT_LOOP = """let work = fn(n) {
+  let s = 0;
+  let i = 0;
+  while (i < n) {
+    s = s + i * i;
+    i = i + 1;
+  }
+  s
+};
+work(5000);
+"""
+
+
+@pytest.fixture
+def probe(monkeypatch) -> LineSampler:
+    # a builtin that takes a sample of the stack it is called from
+    sampler = LineSampler()
+
+    def take_sample(*args: Object) -> Object:
+        sampler.sample(sys._getframe())
+        return NULL
+
+    monkeypatch.setitem(builtin_funcs, "probe", BuiltIn(take_sample))
+    return sampler
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("probe()", {1: 1}),
+        ("let x = 1;\n\nprobe();\nprobe()", {3: 1, 4: 1}),
+        ("let f = fn() {\n  let y = 2;\n  probe()\n};\nf(); f();", {3: 2}),
+        ("map([1, 2, 3], fn(x) {\n probe() })", {2: 3}),
+    ],
+)
+def test_sample_records_current_line(probe: LineSampler, input: str, expected: dict[int, int]):
+    eval_factory_for_test(input)
+    assert dict(probe.hits) == expected
+    assert probe.samples == sum(expected.values())
+
+
+def test_sample_outside_evaluation():
+    sampler = LineSampler()
+    sampler.sample(sys._getframe())
+    assert sampler.samples == 1
+    assert not sampler.hits
+
+
+def test_annotate():
+    sampler = LineSampler()
+    sampler.hits.update({2: 3, 3: 1})
+    sampler.samples = 4
+    assert sampler.histogram() == [(2, 3), (3, 1)]
+    assert sampler.annotate("a\nb\nc").splitlines() == [
+        "                    1 | a",
+        "       3  75.0%     2 | b",
+        "       1  25.0%     3 | c",
+    ]
+
+
+def test_sampler_thread_finds_hot_lines():
+    with LineSampler(interval=0.001) as sampler:
+        eval_factory_for_test(HOT_LOOP)
+    assert sampler.thread is None
+    assert set(sampler.hits) <= {4, 5, 6, 8, 10}
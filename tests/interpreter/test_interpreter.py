@@ -0,0 +1,213 @@
+import threading
+
+import pytest
+
+from src.evaluator import evaluator, hooks
+from src.evaluator.budget import Budget
+from src.interpreter.interpreter import (
+    BudgetExceededError,
+    Interpreter,
+    MonkeyError,
+    ParseError,
+    to_monkey,
+    to_python,
+)
+from src.object.object import Function
+
+LIBRARY = """
+let add = fn(a, b) { a + b };
+let greet = fn(person) { "hello " + person["name"] };
+let evens = fn(xs) { filter(xs, fn(x) { x / 2 * 2 == x }) };
+let spin = fn() { while (true) { 1 } };
+"""
+
+
+@pytest.fixture
+def interpreter() -> Interpreter:
+    interpreter = Interpreter()
+    interpreter.eval(LIBRARY)
+    return interpreter
+
+
+@pytest.mark.parametrize(
+    "value",
+    [None, True, False, 0, -7, 2.5, "", "monkey", [], [1, "a", [None]], {"a": 1, 2: [True]}, range(0, 5)],
+)
+def test_conversion_round_trip(value):
+    assert to_python(to_monkey(value)) == value
+
+
+def test_conversion_tuples_become_lists():
+    assert to_python(to_monkey((1, 2))) == [1, 2]
+
+
+@pytest.mark.parametrize("value", [object(), {(1, 2): 3}, {1.5: 2}, [b"bytes"]])
+def test_conversion_rejects_unknown_values(value):
+    with pytest.raises(TypeError):
+        to_monkey(value)
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("1 + 2", 3),
+        ('"a" + "b"', "ab"),
+        ("[1, 2 * 2]", [1, 4]),
+        ('{"k": [true, puts()]}', {"k": [True, None]}),
+        ("let x = 5;", None),
+        ("", None),
+    ],
+)
+def test_eval(source: str, expected):
+    assert Interpreter().eval(source) == expected
+
+
+@pytest.mark.parametrize(
+    "function, args, expected",
+    [
+        ("add", (2, 3), 5),
+        ("add", ("a", "b"), "ab"),
+        ("greet", ({"name": "ada"},), "hello ada"),
+        ("evens", ([1, 2, 3, 4],), [2, 4]),
+        ("evens", (range(0, 5),), [0, 2, 4]),
+        ("len", ([1, 2, 3],), 3),
+    ],
+)
+def test_call_by_name(interpreter: Interpreter, function: str, args: tuple, expected):
+    assert interpreter.call(function, *args) == expected
+
+
+def test_call_by_handle(interpreter: Interpreter):
+    make_adder = interpreter.eval("fn(n) { fn(x) { x + n } }")
+    assert isinstance(make_adder, Function)
+    add_ten = interpreter.call(make_adder, 10)
+    assert isinstance(add_ten, Function)
+    assert interpreter.call(add_ten, 5) == 15
+
+
+@pytest.mark.parametrize(
+    "function, args, error, message",
+    [
+        ("missing", (), NameError, "identifier not found: missing"),
+        ("add", (1,), TypeError, "function takes 2 arguments, got 1"),
+        ("add", (1, True), MonkeyError, r"type mismatch: INTEGER \+ BOOLEAN"),
+    ],
+)
+def test_call_errors(interpreter: Interpreter, function: str, args: tuple, error: type, message: str):
+    with pytest.raises(error, match=message):
+        interpreter.call(function, *args)
+
+
+def test_call_rejects_non_functions(interpreter: Interpreter):
+    interpreter.set("x", 1)
+    with pytest.raises(TypeError, match="not a function: INTEGER"):
+        interpreter.call("x")
+
+
+def test_compile_once_run_many():
+    interpreter = Interpreter()
+    interpreter.eval("let total = 0;")
+    compiled = interpreter.compile("total = total + 1; total")
+    assert [interpreter.run(compiled) for _ in range(3)] == [1, 2, 3]
+    # a compiled program does not belong to an interpreter
+    assert Interpreter().run(interpreter.compile("1 + 1")) == 2
+
+
+@pytest.mark.parametrize(
+    "source, errors",
+    [
+        ("let x 1;", ["expected next token to be TokenType.ASSIGN, got TokenType.INT instead"]),
+        ("let x = ;", ["no prefix parse function for TokenType.SEMICOLON found"]),
+        (
+            "let = 5;",
+            [
+                "expected next token to be TokenType.IDENT, got TokenType.ASSIGN instead",
+                "no prefix parse function for TokenType.ASSIGN found",
+            ],
+        ),
+        ("foo(", ["no prefix parse function for TokenType.EOF found"]),
+        ("1 +", ["no prefix parse function for TokenType.EOF found"]),
+    ],
+)
+def test_compile_parse_errors(source: str, errors: list[str]):
+    with pytest.raises(ParseError) as raised:
+        Interpreter().compile(source)
+    assert raised.value.errors == errors
+
+
+def test_compile_optimized():
+    interpreter = Interpreter(optimized=True)
+    compiled = interpreter.compile("let f = fn(x) { x * 2 }; f(3) + 1")
+    assert compiled.report
+    assert interpreter.run(compiled) == 7
+    assert interpreter.compile('let s = "a"; s - 1').warnings == ["type mismatch: STRING - INTEGER in (s - 1)"]
+
+
+def test_compile_optimized_allows_for_set_globals():
+    interpreter = Interpreter(optimized=True)
+    interpreter.set("x", "ab")
+    # x is read before the program binds it to an integer, so x + x must not take the integer fast path
+    assert interpreter.eval("let y = x + x; let x = 1; len(y)") == 4
+    interpreter.set("x", [1])
+    with pytest.raises(MonkeyError, match=r"unknown operator: ARRAY \+ ARRAY"):
+        interpreter.eval("let y = x + x; let x = 1; y")
+
+
+@pytest.mark.parametrize("arg, expected", [(2, 3), (2.5, 3.5), ("a", MonkeyError)])
+def test_compile_optimized_functions_take_any_arguments_from_the_host(arg, expected):
+    interpreter = Interpreter(optimized=True)
+    interpreter.run(interpreter.compile("let inc = fn(x) { let y = x + 1; y }; let z = 5; inc(z)"))
+    if expected is MonkeyError:
+        with pytest.raises(MonkeyError, match=r"type mismatch: STRING \+ INTEGER"):
+            interpreter.call("inc", arg)
+    else:
+        result = interpreter.call("inc", arg)
+        assert (type(result), result) == (type(expected), expected)
+
+
+def test_get_and_set(interpreter: Interpreter):
+    interpreter.set("config", {"scale": 3})
+    assert interpreter.eval('config["scale"] * 2') == 6
+    interpreter.eval("let items = [1, 2];")
+    assert interpreter.get("items") == [1, 2]
+    with pytest.raises(NameError):
+        interpreter.get("nothing")
+
+
+def test_interpreters_are_isolated(interpreter: Interpreter):
+    other = Interpreter()
+    other.eval("let add = fn(a, b) { a - b };")
+    assert (interpreter.call("add", 5, 3), other.call("add", 5, 3)) == (8, 2)
+    interpreter.reset()
+    with pytest.raises(NameError):
+        interpreter.call("greet", {"name": "ada"})
+
+
+def test_budgets(interpreter: Interpreter):
+    with pytest.raises(BudgetExceededError, match="budget exceeded: more than 100 steps"):
+        interpreter.call("spin", budget=Budget(max_steps=100))
+    limited = Interpreter(budget=Budget(max_steps=100))
+    limited.eval(LIBRARY)
+    with pytest.raises(BudgetExceededError):
+        limited.eval("spin()")
+    # a budget given to one call replaces the interpreter's
+    assert limited.eval("collect(range(0, 100))", budget=Budget(max_steps=10_000)) == list(range(100))
+    assert evaluator.evaluate is hooks.plain_evaluate
+
+
+def test_budgets_leave_other_threads_alone():
+    results: list[object] = []
+
+    def unlimited():
+        try:
+            results.append(Interpreter().eval("let i = 0; while (i < 5000) { i = i + 1 }; i"))
+        except Exception as e:
+            results.append(e)
+
+    thread = threading.Thread(target=unlimited)
+    thread.start()
+    while thread.is_alive():
+        with pytest.raises(BudgetExceededError):
+            Interpreter(budget=Budget(max_steps=50, timeout=0.001)).eval("while (true) { 1 }")
+    thread.join()
+    assert results == [5000]
@@ -125,3 +125,71 @@ if (5 < 10) {
         token: Token = lexer.next_token()
         assert token.type == test_case["expected_type"]
         assert token.literal == test_case["expected_literal"]
+
+
+def test_lexer_loop_keywords():
+    code = """while (x < 10) { x = x + 1; }
+for (y in [1]) { y }
+"""
+    tests: list[dict[str, Any]] = [
+        {"expected_type": TokenType.WHILE, "expected_literal": "while"},
+        {"expected_type": TokenType.LPAREN, "expected_literal": "("},
+        {"expected_type": TokenType.IDENT, "expected_literal": "x"},
+        {"expected_type": TokenType.LT, "expected_literal": "<"},
+        {"expected_type": TokenType.INT, "expected_literal": "10"},
+        {"expected_type": TokenType.RPAREN, "expected_literal": ")"},
+        {"expected_type": TokenType.LBRACE, "expected_literal": "{"},
+        {"expected_type": TokenType.IDENT, "expected_literal": "x"},
+        {"expected_type": TokenType.ASSIGN, "expected_literal": "="},
+        {"expected_type": TokenType.IDENT, "expected_literal": "x"},
+        {"expected_type": TokenType.PLUS, "expected_literal": "+"},
+        {"expected_type": TokenType.INT, "expected_literal": "1"},
+        {"expected_type": TokenType.SEMICOLON, "expected_literal": ";"},
+        {"expected_type": TokenType.RBRACE, "expected_literal": "}"},
+        {"expected_type": TokenType.FOR, "expected_literal": "for"},
+        {"expected_type": TokenType.LPAREN, "expected_literal": "("},
+        {"expected_type": TokenType.IDENT, "expected_literal": "y"},
+        {"expected_type": TokenType.IN, "expected_literal": "in"},
+        {"expected_type": TokenType.LBRACKET, "expected_literal": "["},
+        {"expected_type": TokenType.INT, "expected_literal": "1"},
+        {"expected_type": TokenType.RBRACKET, "expected_literal": "]"},
+        {"expected_type": TokenType.RPAREN, "expected_literal": ")"},
+        {"expected_type": TokenType.LBRACE, "expected_literal": "{"},
+        {"expected_type": TokenType.IDENT, "expected_literal": "y"},
+        {"expected_type": TokenType.RBRACE, "expected_literal": "}"},
+        {"expected_type": TokenType.EOF, "expected_literal": ""},
+    ]
+
+    lexer = Lexer(input=code)
+
+    for test_case in tests:
+        token: Token = lexer.next_token()
+        assert token.type == test_case["expected_type"]
+        assert token.literal == test_case["expected_literal"]
+
+
+def test_lexer_float_literals():
+    lexer = Lexer(input="3.14 10. 0.5;")
+    tests: list[dict[str, Any]] = [
+        {"expected_type": TokenType.FLOAT, "expected_literal": "3.14"},
+        {"expected_type": TokenType.INT, "expected_literal": "10"},
+        {"expected_type": TokenType.ILLEGAL, "expected_literal": "."},
+        {"expected_type": TokenType.FLOAT, "expected_literal": "0.5"},
+        {"expected_type": TokenType.SEMICOLON, "expected_literal": ";"},
+        {"expected_type": TokenType.EOF, "expected_literal": ""},
+    ]
+
+    for test_case in tests:
+        token: Token = lexer.next_token()
+        assert token.type == test_case["expected_type"]
+        assert token.literal == test_case["expected_literal"]
+
+
+def test_lexer_token_positions():
+    lexer = Lexer(input='let x = 5;\n  "a\nb" fn\n\nx')
+    expected = [(1, 1), (1, 5), (1, 7), (1, 9), (1, 10), (2, 3), (3, 4), (5, 1), (5, 2)]
+    positions = []
+    for _ in expected:
+        tok = lexer.next_token()
+        positions.append((tok.line, tok.column))
+    assert positions == expected
@@ -1,4 +1,4 @@
-from src.object.object import Boolean, Integer, String
+from src.object.object import INT_ARRAY_THRESHOLD, Array, Boolean, Integer, String
 
 
 def test_string_hash_key():
@@ -32,3 +32,76 @@ def test_integer_hash_key():
     assert one1.hash_key() == one2.hash_key()
     assert two1.hash_key() == two2.hash_key()
     assert one1.hash_key() != two1.hash_key()
+
+
+def test_string_concat_builds_rope():
+    left = String("a" * 300)
+    right = String("b" * 300)
+    joined = String.concat(left, right)
+
+    assert joined.flat is None
+    assert joined.length == 600
+    assert joined.value == "a" * 300 + "b" * 300
+    assert joined.parts is None
+    assert joined.hash_key() == String("a" * 300 + "b" * 300).hash_key()
+
+
+def test_string_concat_small_strings_are_flat():
+    joined = String.concat(String("foo"), String("bar"))
+
+    assert joined.flat == "foobar"
+    assert String.concat(String(""), joined) is joined
+
+
+def test_string_concat_deep_rope_flattens_iteratively():
+    s = String("")
+    for i in range(50000):
+        s = String.concat(s, String("x" * 300 if i == 0 else "y"))
+
+    assert s.length == 300 + 49999
+    assert s.value == "x" * 300 + "y" * 49999
+
+
+def test_string_view_shares_source():
+    text = "hello brave new world"
+    view = String.view(text, 6, 11)
+
+    assert view.flat is None
+    assert view.span() == (text, 6, 11)
+    assert view.length == 5
+
+    inner = view.substring(1, 3)
+    assert inner.span() == (text, 7, 9)
+    assert inner.value == "ra"
+    assert view.value == "brave"
+    assert view.hash_key() == String("brave").hash_key()
+
+
+def test_integer_array_is_compact():
+    arr = Array([Integer(i) for i in range(INT_ARRAY_THRESHOLD)])
+
+    assert arr.ints is not None and arr.boxed is None
+    assert arr.length() == INT_ARRAY_THRESHOLD
+    assert arr.get(3).inspect() == "3"
+    assert [e.value for e in arr.iterate()][:3] == [0, 1, 2]  # type: ignore
+    assert arr.slice(1, 4).ints is not None
+
+
+def test_short_or_mixed_arrays_stay_boxed():
+    assert Array([Integer(1), Integer(2)]).ints is None
+    assert Array([Integer(i) for i in range(INT_ARRAY_THRESHOLD)] + [String("x")]).ints is None
+    # doesn't fit in 64 bits
+    assert Array([Integer(2**63)] * INT_ARRAY_THRESHOLD).ints is None
+
+
+def test_integer_array_push():
+    arr = Array([Integer(i) for i in range(INT_ARRAY_THRESHOLD)])
+
+    pushed = arr.push(Integer(99))
+    assert pushed.ints is not None and pushed.get(INT_ARRAY_THRESHOLD).inspect() == "99"
+    assert arr.length() == INT_ARRAY_THRESHOLD
+
+    mixed = arr.push(String("x"))
+    assert mixed.ints is None and mixed.boxed is not None
+    assert mixed.get(INT_ARRAY_THRESHOLD).inspect() == "x"
+    assert arr.push(Integer(2**63)).ints is None
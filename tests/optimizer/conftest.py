@@ -0,0 +1,21 @@
+from src.ast.ast import FunctionLiteral, LetStatement, Program
+from src.evaluator.evaluator import evaluate
+from src.object.environment import new_environment
+from src.object.object import Object
+from tests.parser.conftest import parser_factory_for_test
+
+
+def program_for_test(input: str) -> Program:
+    return parser_factory_for_test(input=input)
+
+
+def evaluate_program_for_test(program: Program) -> Object:
+    return evaluate(node=program, env=new_environment())
+
+
+def function_named(program: Program, name: str) -> FunctionLiteral:
+    for stmt in program.statements:
+        if isinstance(stmt, LetStatement) and stmt.name.value == name:
+            assert isinstance(stmt.value, FunctionLiteral)
+            return stmt.value
+    raise AssertionError(f"no function named {name}")
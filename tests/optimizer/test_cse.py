@@ -0,0 +1,75 @@
+import io
+
+import pytest
+
+from src.ast.ast import LetStatement
+from src.optimizer.cse import eliminate_common_subexpressions
+from tests.evaluator.conftest import check_integer_object
+from tests.optimizer.conftest import evaluate_program_for_test, function_named, program_for_test
+
+
+def test_cse_hoists_repeated_pure_call():
+    input = """
+let sq = fn(x) { x * x };
+let f = fn(a) { sq(a + 1) + sq(a + 1) * 2 };
+f(3);
+"""
+    program = program_for_test(input=input)
+    out = io.StringIO()
+    report = eliminate_common_subexpressions(program, debug=True, out=out)
+
+    assert report == ["f: sq((a + 1)) evaluated 2 times, now once as __cse0"]
+    assert out.getvalue() == "cse: f: sq((a + 1)) evaluated 2 times, now once as __cse0\n"
+
+    body = function_named(program, "f").body
+    assert isinstance(body.statements[0], LetStatement)
+    assert str(body) == "let __cse0 = sq((a + 1));(__cse0 + (__cse0 * 2))"
+    check_integer_object(evaluate_program_for_test(program), 48)
+
+
+def test_cse_reports_nested_and_repeated_calls():
+    input = """
+let inc = fn(x) { x + 1 };
+let f = fn(a) {
+  let b = inc(inc(a));
+  if (b > 0) { inc(inc(a)) + inc(a) } else { inc(a) }
+};
+f(1);
+"""
+    program = program_for_test(input=input)
+    report = eliminate_common_subexpressions(program)
+
+    assert report == [
+        "f: inc(inc(a)) evaluated 2 times, now once as __cse0",
+        "f: inc(a) evaluated 3 times, now once as __cse1",
+    ]
+    check_integer_object(evaluate_program_for_test(program), 5)
+
+
+@pytest.mark.parametrize(
+    "input",
+    [
+        # effectful callee
+        "let f = fn(a) { puts(a) + puts(a) };",
+        # unknown callee
+        "let f = fn(g, a) { g(a) + g(a) };",
+        # argument reassigned between the calls
+        "let sq = fn(x) { x * x }; let f = fn(a) { let r = sq(a); a = a + 1; r + sq(a) };",
+        # argument rebound between the calls
+        "let sq = fn(x) { x * x }; let f = fn(a) { let r = sq(a); let a = 2; r + sq(a) };",
+        # first occurrence is conditional
+        "let sq = fn(x) { x * x }; let f = fn(a) { if (a) { sq(a) + sq(a) } };",
+        # reads state that other code changes
+        "let n = 0; let get = fn() { n }; let f = fn() { get() + get() }; n = 1;",
+        # no call, not worth a binding
+        "let f = fn(a) { (a + 1) * (a + 1) };",
+        # results compared by identity
+        "let mk = fn(x) { [x] }; let f = fn(a) { mk(a) == mk(a) };",
+        "let f = fn(a) { let b = rest(a); b == rest(a) };",
+    ],
+)
+def test_cse_leaves_unsafe_expressions(input: str):
+    program = program_for_test(input=input)
+    before = str(program)
+    assert eliminate_common_subexpressions(program) == []
+    assert str(program) == before
@@ -0,0 +1,52 @@
+import pytest
+
+from src.optimizer.fold import fold_constants
+from tests.optimizer.conftest import evaluate_program_for_test, program_for_test
+
+
+@pytest.mark.parametrize(
+    "input, expected, folds",
+    [
+        ("1 + 2 * 3", "7", 2),
+        ("7 / 2", "3", 1),
+        ("1.5 * 2", "3.0", 1),
+        ("-0.5 + 1", "0.5", 2),
+        ("-7 / 2", "-3", 2),
+        ("1 < 2", "true", 1),
+        ("!true", "false", 1),
+        ("!5", "false", 1),
+        ('"a" + "b"', "ab", 1),
+        ("true == true", "true", 1),
+        ("1 == true", "false", 1),
+        ("if (1 > 2) { 10 } else { 20 }", "20", 2),
+        ("x + 1 * 2", "(x + 2)", 1),
+        # runtime errors are left for the runtime to report
+        ("1 / 0", "(1 / 0)", 0),
+        ("1.0 / 0", "(1.0 / 0)", 0),
+        ('"a" == "a"', "(a == a)", 0),
+        ("-true", "(-true)", 0),
+        (f"1{'0' * 400} * 1.5", f"(1{'0' * 400} * 1.5)", 0),
+        # no null literal to fold to
+        ("if (false) { 1 }", "iffalse 1", 0),
+    ],
+)
+def test_fold_constants(input: str, expected: str, folds: int):
+    program = program_for_test(input=input)
+    assert fold_constants(program) == folds
+    assert str(program) == expected
+
+
+@pytest.mark.parametrize(
+    "input",
+    [
+        "[1 + 2, 10 - 20, 3 * -4, 9 / 4, -9 / 4, 1 < 2, 2 > 1, 1 != 1, !false, !!1]",
+        '["x" + "y", 1 == "1", true != false]',
+        "[1.5 + 2, 3 / 2.0, 2.5 < 3, 1 == 1.0, -1.5]",
+        "if (1 < 2) { 3 } else { 4 } + if (!true) { 5 } else { 6 }",
+    ],
+)
+def test_fold_constants_preserves_values(input: str):
+    expected = evaluate_program_for_test(program_for_test(input=input)).inspect()
+    program = program_for_test(input=input)
+    fold_constants(program)
+    assert evaluate_program_for_test(program).inspect() == expected
@@ -0,0 +1,37 @@
+from src.ast.ast import ExpressionStatement, FunctionLiteral
+from src.optimizer.free_variables import free_names, scope_info
+from tests.optimizer.conftest import function_named, program_for_test
+
+
+def test_free_names():
+    program = program_for_test(input="let f = fn(a, b) { let c = a + x; fn(d) { d + b + y; z = 1 } };")
+    fn = function_named(program, "f")
+    assert free_names(fn) == {"c", "x", "y", "z"}
+
+    inner = fn.body.statements[1]
+    assert isinstance(inner, ExpressionStatement) and isinstance(inner.expression, FunctionLiteral)
+    assert free_names(inner.expression) == {"b", "y", "z"}
+
+
+def test_scope_info():
+    input = """
+let f = fn(a, b, c) {
+  let d = 1;
+  let e = 1;
+  let e = 2;
+  b = 3;
+  for (i in [1]) { let g = i; }
+  fn() { c = 1 };
+};
+"""
+    fn = function_named(program_for_test(input=input), "f")
+    info = scope_info(fn.parameters, fn.body)
+    assert info.declared == {"a", "b", "c", "d", "e", "i", "g"}
+    assert info.stable == {"a", "d"}
+    assert info.escapes
+
+
+def test_scope_info_escapes():
+    program = program_for_test(input="let f = fn(a) { let b = a * 2; while (b > 0) { b = b - 1; } b };")
+    fn = function_named(program, "f")
+    assert not scope_info(fn.parameters, fn.body).escapes
@@ -0,0 +1,132 @@
+import pytest
+
+from src.optimizer.inliner import inline_functions
+from tests.evaluator.conftest import check_integer_object
+from tests.optimizer.conftest import evaluate_program_for_test, function_named, program_for_test
+
+
+def test_inline_small_helper():
+    input = """
+let add = fn(a, b) { a + b };
+let f = fn(x, y) { add(x, y) * add(x, 1) };
+f(2, 3);
+"""
+    program = program_for_test(input=input)
+    report = inline_functions(program)
+
+    assert report == ["inlined add into add(x, y)", "inlined add into add(x, 1)", "inlined f into f(2, 3)"]
+    assert str(function_named(program, "f").body) == "((x + y) * (x + 1))"
+    check_integer_object(evaluate_program_for_test(program), 15)
+
+
+def test_inline_exposes_nested_helpers():
+    input = """
+let sq = fn(a) { a * a };
+let sumsq = fn(a, b) { sq(a) + sq(b) };
+let f = fn(x) { sumsq(x, 2) };
+f(3);
+"""
+    program = program_for_test(input=input)
+    inline_functions(program)
+
+    assert str(function_named(program, "f").body) == "((x * x) + (2 * 2))"
+    check_integer_object(evaluate_program_for_test(program), 13)
+
+
+def test_inline_renames_nested_binders():
+    input = """
+let adder = fn(a) { fn(b) { a + b } };
+let f = fn(b) { adder(b)(10) };
+f(1);
+"""
+    program = program_for_test(input=input)
+    inline_functions(program)
+
+    assert str(function_named(program, "f").body) == "fn(__inl1_b) (b + __inl1_b)(10)"
+    check_integer_object(evaluate_program_for_test(program), 11)
+
+
+def test_inline_moves_pure_single_use_argument():
+    input = """
+let sq = fn(a) { a * a };
+let inc = fn(a) { a + 1 };
+let f = fn(x) { inc(sq(x)) };
+f(3);
+"""
+    program = program_for_test(input=input)
+    inline_functions(program)
+
+    assert str(function_named(program, "f").body) == "((x * x) + 1)"
+    check_integer_object(evaluate_program_for_test(program), 10)
+
+
+@pytest.mark.parametrize(
+    "input",
+    [
+        # recursive
+        "let f = fn(n) { if (n < 1) { 0 } else { f(n - 1) } }; let g = fn() { f(3) };",
+        # reassigned callee
+        "let add = fn(a, b) { a + b }; add = fn(a, b) { a - b }; let g = fn() { add(1, 2) };",
+        # callee name bound twice
+        "let add = fn(a, b) { a + b }; let add = fn(a, b) { a - b }; let g = fn() { add(1, 2) };",
+        # body reads a name the call site shadows
+        "let k = 10; let addk = fn(a) { a + k }; let g = fn(k) { addk(k) };",
+        # body too big
+        "let big = fn(a) { a + a + a + a + a + a + a + a + a + a }; let g = fn() { big(1) };",
+        # effectful argument used twice
+        "let twice = fn(a) { a + a }; let g = fn() { twice(puts(1)) };",
+        # argument would be evaluated conditionally
+        "let pick = fn(c, a) { if (c) { a } else { 0 } }; let g = fn(y) { pick(y, len(y)) };",
+        # more than one statement
+        "let f = fn(a) { let b = a; b }; let g = fn() { f(1) };",
+        # binders in the body's blocks
+        "let f = fn(a) { if (a) { let t = a; t } else { 0 } }; let g = fn() { f(1) };",
+        "let f = fn(a) { for (x in a) { x } }; let g = fn() { f([1]) };",
+        # the parameter is only ever a nested function's binder, so the argument would be dropped
+        "let h = fn(c) { fn(c) { 1 }(2) }; let g = fn() { h(1 / 0) };",
+        "let h = fn(c) { fn() { let c = 1; c } }; let g = fn() { h(len(1)) };",
+        # an identifier that may not be bound would no longer be read
+        "let k = fn(a, b) { a }; let g = fn() { k(1, nothing) };",
+    ],
+)
+def test_inline_guards(input: str):
+    program = program_for_test(input=input)
+    before = str(program)
+    assert inline_functions(program) == []
+    assert str(program) == before
+
+
+def test_inline_size_threshold_knob():
+    input = "let big = fn(a) { a + a + a + a + a + a + a + a + a + a }; let g = fn() { big(1) };"
+    program = program_for_test(input=input)
+    assert inline_functions(program, max_size=32) == ["inlined big into big(1)"]
+
+
+@pytest.mark.parametrize(
+    "input",
+    [
+        "let f = fn(a) { if (a) { let len = a; len } else { 0 } }; let g = fn(xs) { f(1) + len(xs) }; g([1, 2])",
+        "let f = fn(a) { if (a) { let t = 100; t } else { 0 } }; let g = fn() { f(true); t }; g()",
+    ],
+)
+def test_inline_keeps_block_bindings_in_the_callee(input: str):
+    expected = evaluate_program_for_test(program_for_test(input=input)).inspect()
+    program = program_for_test(input=input)
+    inline_functions(program)
+    assert evaluate_program_for_test(program).inspect() == expected
+
+
+@pytest.mark.parametrize(
+    "input",
+    [
+        "let h = fn(c) { fn(c) { 1 }(2) }; h(1 / 0)",
+        "let h = fn(c) { fn(c) { 1 }(2) }; h(len(1))",
+        "let k = fn(a, b) { a }; k(1, undefinedname)",
+        "let k = fn(a, b) { a }; let g = fn(x) { k(1, x) }; g(2)",
+    ],
+)
+def test_inline_keeps_argument_errors(input: str):
+    expected = evaluate_program_for_test(program_for_test(input=input)).inspect()
+    program = program_for_test(input=input)
+    inline_functions(program)
+    assert evaluate_program_for_test(program).inspect() == expected
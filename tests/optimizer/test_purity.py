@@ -0,0 +1,45 @@
+import pytest
+
+from src.optimizer.purity import PurityAnalysis
+from tests.optimizer.conftest import program_for_test
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("let f = fn(x) { x * 2 };", {"f": True}),
+        ("let f = fn(x) { puts(x); x };", {"f": False}),
+        ("let f = fn(x) { len(x) + first(x) };", {"f": True}),
+        ("let f = fn(x) { map(x, fn(y) { y }) };", {"f": False}),
+        ("let f = fn(x) { g(x) }; let g = fn(x) { puts(x) };", {"f": False, "g": False}),
+        ("let f = fn(n) { if (n < 1) { 0 } else { f(n - 1) } };", {"f": True}),
+        (
+            "let even = fn(n) { if (n == 0) { true } else { odd(n - 1) } }; let odd = fn(n) { even(n - 1) };",
+            {"even": True, "odd": True},
+        ),
+        (
+            "let f = fn(n) { if (n == 0) { puts(n) } else { g(n - 1) } }; let g = fn(n) { f(n) };",
+            {"f": False, "g": False},
+        ),
+        ("let count = 0; let f = fn() { count = count + 1 };", {"f": False}),
+        ("let count = 0; let f = fn() { count }; count = 2;", {"f": False}),
+        ("let f = fn(xs) { let total = 0; for (x in xs) { total = total + x }; total };", {"f": True}),
+        ("let f = fn(g) { g(1) };", {"f": False}),
+        ("let len = fn(x) { puts(x) }; let f = fn(x) { len(x) };", {"f": False}),
+    ],
+)
+def test_purity_analysis(input: str, expected: dict[str, bool]):
+    analysis = PurityAnalysis(program_for_test(input=input))
+    for name, pure in expected.items():
+        assert (name in analysis.pure_functions) == pure
+
+
+def test_purity_analysis_tracks_allocating_functions():
+    input = """
+let mk = fn(x) { [x] };
+let wrap = fn(x) { mk(x) };
+let count = fn(x) { len(x) };
+let tail = fn(x) { rest(x) };
+"""
+    analysis = PurityAnalysis(program_for_test(input=input))
+    assert analysis.allocating_functions == {"mk", "wrap", "tail"}
@@ -0,0 +1,89 @@
+import pytest
+
+from src.optimizer.specializer import specialize_functions
+from tests.optimizer.conftest import evaluate_program_for_test, function_named, program_for_test
+
+
+def test_specialize_on_constant_arguments():
+    input = """
+let fmt = fn(upper, width, s) { if (upper) { width * 2 + len(s) } else { width - len(s) } };
+let a = fmt(true, 3, "ab");
+let b = fmt(false, 4, "ab");
+[a, b]
+"""
+    program = program_for_test(input=input)
+    report = specialize_functions(program)
+
+    assert report == ["specialized fmt(true, 3, ab) as __spec0_fmt", "specialized fmt(false, 4, ab) as __spec1_fmt"]
+    assert str(function_named(program, "__spec0_fmt")) == "fn() (6 + len(ab))"
+    assert str(function_named(program, "__spec1_fmt")) == "fn() (4 - len(ab))"
+    assert evaluate_program_for_test(program).inspect() == "[8, 2]"
+
+
+def test_specialize_shares_residual_between_call_sites():
+    input = """
+let scale = fn(factor, x) { if (factor == 0) { 0 } else { x * factor } };
+let f = fn(y) { scale(10, y) + scale(10, y + 1) };
+let five = 5;
+[f(1), scale(0, five)]
+"""
+    program = program_for_test(input=input)
+    report = specialize_functions(program)
+
+    assert report == [
+        "specialized scale(10, y) as __spec0_scale",
+        "specialized scale(10, (y + 1)) as __spec0_scale",
+        "specialized f(1) as __spec1_f",
+        "specialized scale(0, five) as __spec2_scale",
+    ]
+    assert str(function_named(program, "__spec0_scale")) == "fn(x) (x * 10)"
+    assert evaluate_program_for_test(program).inspect() == "[30, 0]"
+
+
+def test_specialize_cache_is_bounded():
+    input = """
+let pick = fn(flag, x) { if (flag) { x } else { 0 - x } };
+let one = 1;
+[pick(true, one), pick(false, one), pick(true, one + 2)]
+"""
+    program = program_for_test(input=input)
+    report = specialize_functions(program, max_entries=1)
+
+    assert report == [
+        "specialized pick(true, one) as __spec0_pick",
+        "specialized pick(true, (one + 2)) as __spec0_pick",
+    ]
+    assert evaluate_program_for_test(program).inspect() == "[1, -1, 3]"
+
+
+@pytest.mark.parametrize(
+    "input",
+    [
+        # nothing folds
+        "let f = fn(a, b) { a + b }; f(1, x);",
+        # no literal argument
+        "let f = fn(a, b) { a + b }; let x = 1; f(x, x);",
+        # parameter is reassigned
+        "let f = fn(a) { a = a + 1; a * 2 }; f(1);",
+        # parameter is rebound
+        "let f = fn(a) { let a = 5; a * 2 }; f(1);",
+        # callee reassigned
+        "let f = fn(a) { a * 2 }; f = fn(a) { a }; f(1);",
+    ],
+)
+def test_specialize_guards(input: str):
+    program = program_for_test(input=input)
+    assert specialize_functions(program) == []
+
+
+def test_specialize_respects_nested_shadowing():
+    input = """
+let f = fn(a, b) { let g = fn(a) { a + 1 }; g(b) + a * 2 };
+let y = 10;
+f(3, y)
+"""
+    program = program_for_test(input=input)
+    specialize_functions(program)
+
+    assert str(function_named(program, "__spec0_f").body) == "let g = fn(a) (a + 1);(g(b) + 6)"
+    assert evaluate_program_for_test(program).inspect() == "17"
@@ -0,0 +1,89 @@
+import pytest
+
+from src.ast.ast import InfixExpression
+from src.optimizer.type_inference import infer_types
+from src.optimizer.walk import walk
+from tests.optimizer.conftest import evaluate_program_for_test, program_for_test
+
+
+def integer_only(input: str) -> list[str]:
+    program = program_for_test(input=input)
+    infer_types(program)
+    return [str(n) for n in walk(program) if isinstance(n, InfixExpression) and n.int_operands]
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("1 + 2 * 3", ["(1 + (2 * 3))", "(2 * 3)"]),
+        ("let x = 1; x < 2", ["(x < 2)"]),
+        ("let x = 1; x = true; x < 2", []),
+        ('let s = "a"; s + "b"', []),
+        ("let f = fn(n) { n - 1 }; f(3) * 2", ["(n - 1)", "(f(3) * 2)"]),
+        ("let f = fn(n) { n - 1 }; f(3); f([1])", []),
+        # parameters of functions that escape as values take any type
+        ("let f = fn(n) { n - 1 }; map([1], f)", []),
+        ("fn(n) { n - 1 }(3)", []),
+        (
+            "let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } }; fib(5)",
+            ["(n < 2)", "(fib((n - 1)) + fib((n - 2)))", "(n - 1)", "(n - 2)"],
+        ),
+        ("let t = 0; for (i in range(3)) { t = t + i; }", ["(t + i)"]),
+        ("let t = 0; for (i in [1]) { t = t + i; }", []),
+        ("len([1]) + 1", ["(len([1]) + 1)"]),
+        ("sum(range(3)) + 1", ["(sum(range(3)) + 1)"]),
+        ("sum([1, 2]) + 1", []),
+        ("sum([0.5]) + 1", []),
+        ("let x = 1.5; x + 1", []),
+        ("let f = fn(n) { n * 2 }; f(1); f(0.5)", []),
+        ("let len = fn(x) { x }; len(true) + 1", []),
+        ("let f = fn(c) { if (c) { return 1; } 2 }; f(true) + 1", ["(f(true) + 1)"]),
+        ("let f = fn(c) { if (c) { 1 } }; f(true) + 1", []),
+        # a return inside an if surfaces as a wrapped value
+        ("let f = fn(c) { (if (c) { return 1; } else { 2 }) + 1 }; f(true)", []),
+    ],
+)
+def test_infer_integer_operands(input: str, expected: list[str]):
+    assert integer_only(input) == expected
+
+
+def test_infer_predefined_names_take_any_type():
+    program = program_for_test(input="let y = x + x; let x = 1; let f = fn(n) { n + 1 }; f(2)")
+    infer_types(program, predefined=["x", "f"])
+    assert [str(n) for n in walk(program) if isinstance(n, InfixExpression) and n.int_operands] == []
+
+
+def test_infer_exported_functions_take_any_arguments():
+    program = program_for_test(input="let f = fn(n) { n + 1 }; let g = fn(m) { m + 1 }; f(2) + g(2)")
+    infer_types(program, exported=["f"])
+    assert [str(n) for n in walk(program) if isinstance(n, InfixExpression) and n.int_operands] == ["(m + 1)"]
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ('let s = "a"; s - 1', ["type mismatch: STRING - INTEGER in (s - 1)"]),
+        ('"a" == "b"', ["unknown operator: STRING == STRING in (a == b)"]),
+        ("let f = fn() { true + 1 };", ["type mismatch: BOOLEAN + INTEGER in (true + 1)"]),
+        ("let f = fn(x) { x * 2 }; f(1); f(true);", []),
+        ("1 == true", []),
+        ('1.5 + "a"', ["type mismatch: FLOAT + STRING in (1.5 + a)"]),
+    ],
+)
+def test_infer_types_reports_mismatches(input: str, expected: list[str]):
+    assert infer_types(program_for_test(input=input)) == expected
+
+
+@pytest.mark.parametrize(
+    "input, expected",
+    [
+        ("let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } }; fib(15)", "610"),
+        ("let i = 0; let t = 0; while (i < 10) { t = t + i * 2 - 1; i = i + 1; } t", "80"),
+        ("[7 / 2, -7 / 2, 1 < 2, 2 > 1, 1 == 1, 1 != 1]", "[3, -3, true, true, true, false]"),
+        ("let f = fn(n) { n + undefined }; f(1)", "ERROR: identifier not found: undefined"),
+    ],
+)
+def test_integer_fast_path_matches_checked_evaluation(input: str, expected: str):
+    program = program_for_test(input=input)
+    infer_types(program)
+    assert evaluate_program_for_test(program).inspect() == expected
@@ -4,10 +4,13 @@ import pytest
 
 from src.ast.ast import (
     ArrayLiteral,
+    AssignStatement,
     BooleanLiteral,
     CallExpression,
     Expression,
     ExpressionStatement,
+    FloatLiteral,
+    ForExpression,
     FunctionLiteral,
     HashLiteral,
     Identifier,
@@ -19,6 +22,7 @@ from src.ast.ast import (
     Program,
     ReturnStatement,
     StringLiteral,
+    WhileExpression,
 )
 from tests.parser.conftest import (
     check_identifier,
@@ -105,6 +109,17 @@ def test_parse_integer_literal():
     assert ident.token_literal() == "5"
 
 
+def test_parse_float_literal():
+    program: Program = parser_factory_for_test(input="2.5;")
+
+    stmt = program.statements[0]
+    assert isinstance(stmt, ExpressionStatement)
+    literal = stmt.expression
+    assert isinstance(literal, FloatLiteral)
+    assert literal.value == 2.5
+    assert literal.token_literal() == "2.5"
+
+
 @pytest.mark.parametrize(
     "input, expected_prefix, expected_value",
     [
@@ -602,3 +617,69 @@ def test_parse_hash_literal(
         expected_value = expected[str(key)]
 
         check_integer_literal(il=value, value=expected_value)
+
+
+def test_parse_assign_statement():
+    input = "x = y + 1;"
+
+    program: Program = parser_factory_for_test(input=input)
+
+    assert len(program.statements) == 1
+
+    stmt = program.statements[0]
+    assert isinstance(stmt, AssignStatement)
+    assert stmt.name.value == "x"
+
+    check_infix_expression(exp=stmt.value, left_value="y", operator="+", right_value=1)
+
+
+def test_parse_while_expression():
+    input = "while (x < y) { x = x + 1; }"
+
+    program: Program = parser_factory_for_test(input=input)
+
+    stmt = program.statements[0]
+    assert isinstance(stmt, ExpressionStatement)
+
+    exp = stmt.expression
+    assert isinstance(exp, WhileExpression)
+
+    assert check_infix_expression(
+        exp=exp.condition,
+        left_value="x",
+        operator="<",
+        right_value="y",
+    )
+
+    assert len(exp.body.statements) == 1
+    assert isinstance(exp.body.statements[0], AssignStatement)
+
+
+def test_parse_for_expression():
+    input = "for (x in xs) { puts(x) }"
+
+    program: Program = parser_factory_for_test(input=input)
+
+    stmt = program.statements[0]
+    assert isinstance(stmt, ExpressionStatement)
+
+    exp = stmt.expression
+    assert isinstance(exp, ForExpression)
+
+    check_identifier(exp=exp.variable, value="x")
+    check_identifier(exp=exp.iterable, value="xs")
+
+    assert len(exp.body.statements) == 1
+
+    body_stmt = exp.body.statements[0]
+    assert isinstance(body_stmt, ExpressionStatement)
+    assert isinstance(body_stmt.expression, CallExpression)
+
+
+def test_parse_let_names_function_literal():
+    program = parser_factory_for_test(input="let f = fn(x) { x }; let g = f; fn() { 1 }")
+    first, _, third = program.statements
+    assert isinstance(first, LetStatement) and isinstance(first.value, FunctionLiteral)
+    assert first.value.name == "f"
+    assert isinstance(third, ExpressionStatement) and isinstance(third.expression, FunctionLiteral)
+    assert third.expression.name == ""
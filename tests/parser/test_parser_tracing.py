@@ -0,0 +1,89 @@
+import itertools
+
+import pytest
+
+from src.lexer.lexer import Lexer
+from src.parser.parser import Parser
+from src.parser.parser_tracing import ParserTracer
+
+
+def traced_parser(input: str, trace: bool = False) -> tuple[Parser, ParserTracer]:
+    ticks = itertools.count()
+    parser = Parser(Lexer(input))
+    tracer = ParserTracer(trace=trace, clock=lambda: float(next(ticks)))
+    tracer.attach(parser)
+    return parser, tracer
+
+
+def test_trace_is_indented_by_nesting():
+    parser, tracer = traced_parser("-a;", trace=True)
+    parser.parse_program()
+    assert tracer.trace() == (
+        "BEGIN parse_program\n"
+        "\tBEGIN parse_statement\n"
+        "\t\tBEGIN parse_expression_statement\n"
+        "\t\t\tBEGIN parse_expression\n"
+        "\t\t\t\tBEGIN parse_prefix_expression\n"
+        "\t\t\t\t\tBEGIN parse_expression\n"
+        "\t\t\t\t\t\tBEGIN parse_identifier\n"
+        "\t\t\t\t\t\tEND parse_identifier\n"
+        "\t\t\t\t\tEND parse_expression\n"
+        "\t\t\t\tEND parse_prefix_expression\n"
+        "\t\t\tEND parse_expression\n"
+        "\t\tEND parse_expression_statement\n"
+        "\tEND parse_statement\n"
+        "END parse_program\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "input, name, calls, max_depth",
+    [
+        ("1 + 2 + 3;", "parse_infix_expression", 2, 1),
+        ("1 + (2 + (3 + 4));", "parse_grouped_expression", 2, 2),
+        ("f(g(1), 2);", "parse_call_expression", 2, 2),
+        ("[[1], [2, [3]]]", "parse_array_literal", 4, 3),
+        ('{"a": {"b": 1}}', "parse_hash_literal", 2, 2),
+        ("let a = 1; let b = 2;", "parse_let_statement", 2, 1),
+    ],
+)
+def test_stats_per_parse_function(input: str, name: str, calls: int, max_depth: int):
+    parser, tracer = traced_parser(input)
+    parser.parse_program()
+    assert len(parser.get_errors()) == 0
+    assert tracer.stats[name].calls == calls
+    assert tracer.stats[name].max_depth == max_depth
+
+
+def test_nested_calls_are_counted_once():
+    parser, tracer = traced_parser("1 + (2 + (3 + 4));")
+    program = parser.parse_program()
+    assert str(program) == "(1 + (2 + (3 + 4)))"
+    grouped = tracer.stats["parse_grouped_expression"]
+    # the outer "(" is already current when it starts; it reads 2 + ( 3 + 4 ) )
+    assert grouped.tokens == 8
+    assert tracer.stats["parse_program"].tokens == tracer.tokens == 12
+    assert tracer.stats["parse_program"].total_time >= grouped.total_time
+
+
+def test_report():
+    parser, tracer = traced_parser("let a = 1;")
+    parser.parse_program()
+    report = tracer.report().splitlines()
+    assert report[0].split() == ["calls", "total_s", "tokens", "depth", "function"]
+    assert report[1].split()[-1] == "parse_program"
+    assert {line.split()[-1] for line in report[1:-1]} == {
+        "parse_program",
+        "parse_statement",
+        "parse_let_statement",
+        "parse_expression",
+        "parse_integer_literal",
+    }
+    assert report[-1] == f"max nesting {tracer.max_depth}, {tracer.tokens} tokens read"
+
+
+def test_attach_only_changes_that_parser():
+    parser, _ = traced_parser("1")
+    other = Parser(Lexer("1"))
+    assert parser.parse_expression != other.parse_expression
+    assert other.parse_expression.__func__ is Parser.parse_expression  # type: ignore
@@ -0,0 +1,37 @@
+import io
+
+import pytest
+
+from src.repl.repl import PROMPT, monkey_repl
+
+
+def run_repl(input: str) -> list[str]:
+    out = io.StringIO()
+    monkey_repl(io.StringIO(input), out)
+    # one entry per prompt, without the banner
+    return out.getvalue().split(PROMPT)[1:]
+
+
+def test_repl_evaluates_lines():
+    assert run_repl("let x = 2;\nx * 3\n") == ["null\n", "6\n", ""]
+
+
+def test_repl_heap_command():
+    outputs = run_repl(":heap on\nlet xs = [1, 2];\n:heap\n:heap off\n")
+    assert outputs[0] == ""
+    report = outputs[2].splitlines()
+    assert report[0].split() == ["type", "live", "live_bytes", "total", "total_bytes"]
+    assert {line.split()[0]: line.split()[1] for line in report[1:]} == {"INTEGER": "2", "ARRAY": "1"}
+    assert outputs[3] == ""
+
+
+@pytest.mark.parametrize(
+    "command, expected",
+    [
+        (":heap", "heap accounting is not running; start it with :heap on\n"),
+        (":heap off", "heap accounting is not running; start it with :heap on\n"),
+        (":heap sideways", "usage: :heap [on|trace|off]\n"),
+    ],
+)
+def test_repl_heap_command_messages(command: str, expected: str):
+    assert run_repl(command + "\n")[0] == expected
@@ -0,0 +1,18 @@
+import contextlib
+from typing import AsyncIterator
+
+from src.evaluator.budget import Budget
+from src.server.client import Client
+from src.server.server import Server
+
+
+@contextlib.asynccontextmanager
+async def serving(path: str, workers: int = 2, limits: Budget | None = None, **options) -> AsyncIterator[Client]:
+    server = Server(workers, limits, **options)
+    await server.start_unix(path)
+    client = await Client.connect_unix(path)
+    try:
+        yield client
+    finally:
+        await client.close()
+        await server.close()
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from src.server.client import Client
+from tests.server.conftest import serving
+
+
+def test_concurrent_requests_get_their_own_replies(tmp_path):
+    async def scenario():
+        async with serving(str(tmp_path / "s.sock")) as client:
+            return await asyncio.gather(*(client.eval(f"{i} * {i}") for i in range(20)))
+
+    assert [reply["value"] for reply in asyncio.run(scenario())] == [i * i for i in range(20)]
+
+
+def test_pending_requests_fail_when_the_server_goes_away(tmp_path):
+    async def scenario():
+        path = str(tmp_path / "s.sock")
+
+        async def hang_up(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            await reader.readline()
+            writer.close()
+
+        server = await asyncio.start_unix_server(hang_up, path)
+        client = await Client.connect_unix(path)
+        try:
+            with pytest.raises(ConnectionError):
+                await client.eval("1")
+            with pytest.raises(ConnectionError):
+                await client.eval("1")
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(scenario())
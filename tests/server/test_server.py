@@ -0,0 +1,157 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from src.evaluator.budget import Budget
+from src.server.server import RequestError, check_request, request_budget
+from tests.server.conftest import serving
+
+LIBRARY = "let add = fn(a, b) { a + b }; let spin = fn() { while (true) { 1 } };"
+
+
+@pytest.mark.parametrize(
+    "request_, message",
+    [
+        ([], "request must be a JSON object"),
+        ({"op": "run"}, "unknown op: run"),
+        ({"op": "eval"}, "source must be a string"),
+        ({"op": "call", "source": ""}, "function must be a string"),
+        ({"op": "call", "source": "", "function": "f", "args": {}}, "args must be a list"),
+        ({"op": "eval", "source": "", "budget": {"steps": 1}}, "budget must be an object with some of max_steps, "),
+        ({"op": "eval", "source": "", "budget": {"max_steps": -1}}, "budget max_steps must be a positive number"),
+        ({"op": "eval", "source": "", "budget": {"timeout": True}}, "budget timeout must be a positive number"),
+    ],
+)
+def test_check_request(request_, message: str):
+    with pytest.raises(RequestError) as raised:
+        check_request(request_)
+    assert str(raised.value).startswith(message)
+
+
+def test_request_budget_cannot_raise_limits():
+    limits = Budget(max_steps=1000, timeout=2.0)
+    budget = request_budget(limits, {"max_steps": 10**9, "timeout": 0.5, "max_depth": 10.0})
+    assert vars(budget) == {"max_steps": 1000, "timeout": 0.5, "max_depth": 10, "max_size": None}
+
+
+def test_eval_and_call(tmp_path):
+    async def scenario():
+        async with serving(str(tmp_path / "s.sock")) as client:
+            return await asyncio.gather(
+                client.eval('puts("hi"); 6 * 7'),
+                client.call(LIBRARY, "add", ["a", "b"]),
+                client.eval("1 + true"),
+                client.call(LIBRARY, "spin", [], {"max_steps": 500}),
+            )
+
+    replies = asyncio.run(scenario())
+    assert [{key: value for key, value in reply.items() if key != "id"} for reply in replies] == [
+        {"ok": True, "value": 42, "output": "hi\n"},
+        {"ok": True, "value": "ab", "output": ""},
+        {"ok": False, "kind": "error", "error": "type mismatch: INTEGER + BOOLEAN", "output": ""},
+        {"ok": False, "kind": "budget", "error": "budget exceeded: more than 500 steps", "output": ""},
+    ]
+
+
+def test_server_limits_apply_to_every_request(tmp_path):
+    async def scenario():
+        async with serving(str(tmp_path / "s.sock"), limits=Budget(max_steps=100)) as client:
+            return await client.eval("while (true) { 1 }", {"max_steps": 10**6})
+
+    assert asyncio.run(scenario())["error"] == "budget exceeded: more than 100 steps"
+
+
+def test_replies_come_back_as_ready(tmp_path):
+    async def scenario():
+        async with serving(str(tmp_path / "s.sock")) as client:
+            order: list[str] = []
+
+            async def timed(name: str, source: str):
+                await client.eval(source)
+                order.append(name)
+
+            await asyncio.gather(timed("slow", "let i = 0; while (i < 20000) { i = i + 1 }"), timed("fast", "1"))
+            return order
+
+    assert asyncio.run(scenario()) == ["fast", "slow"]
+
+
+def test_busy_when_too_many_wait(tmp_path):
+    async def scenario():
+        async with serving(str(tmp_path / "s.sock"), workers=1, max_waiting=1) as client:
+            budget = {"max_steps": 100_000}
+            return await asyncio.gather(*(client.eval("while (true) { 1 }", budget) for _ in range(4)))
+
+    kinds = [reply["kind"] for reply in asyncio.run(scenario())]
+    assert kinds == ["budget", "budget", "busy", "busy"]
+
+
+def test_malformed_requests(tmp_path):
+    async def scenario():
+        path = str(tmp_path / "s.sock")
+        async with serving(path):
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b'not json\n{"id": 7, "op": "eval"}\n')
+            replies = [json.loads(await reader.readline()) for _ in range(2)]
+            writer.close()
+            return replies
+
+    first, second = asyncio.run(scenario())
+    assert (first["id"], first["kind"]) == (None, "request")
+    assert second == {"id": 7, "ok": False, "kind": "request", "error": "source must be a string"}
+
+
+def test_too_long_requests_close_the_connection(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.server.server.MAX_REQUEST_BYTES", 64)
+
+    async def scenario():
+        path = str(tmp_path / "s.sock")
+        async with serving(path):
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(json.dumps({"op": "eval", "source": "1" * 100}).encode() + b"\n")
+            reply = json.loads(await reader.readline())
+            closed = await reader.readline() == b""
+            writer.close()
+            return reply, closed
+
+    reply, closed = asyncio.run(scenario())
+    assert reply["error"] == "request too long"
+    assert closed
+
+
+def test_stats(tmp_path):
+    async def scenario():
+        async with serving(str(tmp_path / "s.sock")) as client:
+            for _ in range(3):
+                await client.call(LIBRARY, "add", [1, 2])
+            await client.eval("let x 1;")
+            return await client.stats()
+
+    stats = asyncio.run(scenario())
+    assert (stats["requests"], stats["completed"]) == (5, 4)
+    assert stats["outcomes"] == {"ok": 3, "parse": 1}
+    assert stats["cache_hits"] >= 1
+    assert set(stats["latency_ms"]) == {"p50", "p90", "p99", "max"}
+    assert stats["throughput"] > 0
+    assert (stats["running"], stats["waiting"], stats["connections"]) == (0, 0, 1)
+
+
+def test_pmap_runs_in_the_worker(tmp_path):
+    async def scenario():
+        async with serving(str(tmp_path / "s.sock"), workers=1) as client:
+            return await asyncio.gather(
+                client.eval("pmap([1, 2, 3], fn(x) { x * 2 })"),
+                client.eval("pmap([1], fn(x) { while (true) { x } })", {"max_steps": 500}),
+            )
+
+    replies: list = []
+    # closing the server must not wait on processes a job started
+    thread = threading.Thread(target=lambda: replies.append(asyncio.run(scenario())), daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+    assert not thread.is_alive()
+    [(doubled, spun)] = replies
+    assert doubled["value"] == [2, 4, 6]
+    assert spun["error"] == "budget exceeded: more than 500 steps"
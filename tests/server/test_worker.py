@@ -0,0 +1,70 @@
+import pytest
+
+from src.evaluator import parallel
+from src.evaluator.budget import Budget
+from src.server import worker
+
+LIBRARY = 'let add = fn(a, b) { a + b }; let hello = fn() { puts("hello") };'
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    worker.compiled_programs.clear()
+    worker.loaded_scripts.clear()
+
+
+@pytest.mark.parametrize(
+    "request_, expected",
+    [
+        ({"op": "eval", "source": "1 + 2"}, {"ok": True, "value": 3, "output": ""}),
+        ({"op": "eval", "source": 'puts("a"); [1, {"k": range(0, 2)}]'}, {"ok": True, "value": [1, {"k": [0, 1]}]}),
+        ({"op": "eval", "source": "{1: 2}"}, {"ok": True, "value": {"1": 2}}),
+        ({"op": "eval", "source": "fn(x) { x }"}, {"ok": True, "value": "fn(x) {\nx\n}"}),
+        ({"op": "call", "source": LIBRARY, "function": "add", "args": [2, 3]}, {"ok": True, "value": 5}),
+        ({"op": "call", "source": LIBRARY, "function": "hello"}, {"ok": True, "value": None, "output": "hello\n"}),
+        ({"op": "eval", "source": "let x 1;"}, {"ok": False, "kind": "parse"}),
+        ({"op": "eval", "source": "let x = ;"}, {"ok": False, "kind": "parse"}),
+        ({"op": "eval", "source": "foo("}, {"ok": False, "kind": "parse"}),
+        ({"op": "call", "source": "1 +", "function": "f"}, {"ok": False, "kind": "parse"}),
+        ({"op": "eval", "source": "1 + true"}, {"ok": False, "kind": "error"}),
+        ({"op": "eval", "source": "while (true) { 1 }"}, {"ok": False, "kind": "budget"}),
+        ({"op": "call", "source": LIBRARY, "function": "sub", "args": []}, {"ok": False, "kind": "request"}),
+        ({"op": "call", "source": LIBRARY, "function": "add", "args": [1]}, {"ok": False, "kind": "request"}),
+    ],
+)
+def test_run_job(request_: dict, expected: dict):
+    reply = worker.run_job(request_, Budget(max_steps=1000))
+    assert {key: reply[key] for key in expected} == expected
+
+
+def test_run_job_caches_programs_and_scripts():
+    budget = Budget()
+    source = "let counter = 0; counter = counter + 1; counter"
+    replies = [worker.run_job({"op": "eval", "source": source}, budget) for _ in range(2)]
+    # the parsed program is reused, but every run starts from fresh globals
+    assert [(reply["value"], reply["cached"]) for reply in replies] == [(1, False), (1, True)]
+
+    call = {"op": "call", "source": LIBRARY, "function": "add", "args": [1, 2]}
+    assert [worker.run_job(call, budget)["cached"] for _ in range(2)] == [False, True]
+
+
+def test_caches_drop_least_recently_used(monkeypatch):
+    monkeypatch.setattr(worker, "CACHE_SIZE", 2)
+    for source in ["1", "2", "1", "3"]:
+        worker.run_job({"op": "eval", "source": source}, Budget())
+    assert list(worker.compiled_programs) == ["1", "3"]
+
+
+def test_failed_scripts_are_not_cached():
+    reply = worker.run_job({"op": "call", "source": "1 + true", "function": "f"}, Budget())
+    assert reply["kind"] == "error"
+    assert not worker.loaded_scripts
+
+
+def test_prewarm_keeps_pmap_in_the_worker(monkeypatch):
+    monkeypatch.setattr(parallel, "in_process", False)
+    monkeypatch.setattr(parallel, "executors", {})
+    worker.prewarm()
+    reply = worker.run_job({"op": "eval", "source": "pmap(range(0, 4), fn(x) { x + 1 }, 2)"}, Budget())
+    assert reply["value"] == [1, 2, 3, 4]
+    assert parallel.executors == {}
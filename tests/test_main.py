@@ -0,0 +1,152 @@
+import asyncio
+import io
+import pstats
+import threading
+
+import pytest
+
+from src.lexer.lexer import Lexer
+from src.main import ReplayLexer, main, tokenize
+from src.parser.parser import Parser
+from src.server.server import Server
+
+SCRIPT = "let double = fn(x) { x * 2 }; puts(double(21)); puts(double(4));"
+
+
+def run_script(tmp_path, capsys, source: str, *flags: str, command: str = "run") -> tuple[int, str, str]:
+    path = tmp_path / "script.mk"
+    path.write_text(source)
+    code = main([command, str(path), *flags])
+    captured = capsys.readouterr()
+    return code, captured.out, captured.err
+
+
+@pytest.mark.parametrize("engine", ["tree", "optimized"])
+def test_run_file(tmp_path, capsys, engine: str):
+    code, out, err = run_script(tmp_path, capsys, SCRIPT, "--engine", engine)
+    assert code == 0
+    assert out == "42\n8\n"
+    assert err == ""
+
+
+def test_run_stdin_without_prompt(monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO(SCRIPT))
+    assert main(["run"]) == 0
+    captured = capsys.readouterr()
+    assert captured.out == "42\n8\n"
+    assert ">>" not in captured.out
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("1 + true;", "ERROR: type mismatch: INTEGER + BOOLEAN\n"),
+        ("let x 1;", "parser error: expected next token to be TokenType.ASSIGN, got TokenType.INT instead\n"),
+    ],
+)
+def test_run_reports_errors(tmp_path, capsys, source: str, expected: str):
+    code, out, err = run_script(tmp_path, capsys, source)
+    assert code == 1
+    assert out == ""
+    assert err == expected
+
+
+def test_run_time(tmp_path, capsys):
+    code, out, err = run_script(tmp_path, capsys, SCRIPT, "--time", "--engine", "optimized")
+    assert code == 0
+    phases = [line.split()[0] for line in err.splitlines()]
+    assert phases[:4] == ["lex", "parse", "optimize", "eval"]
+
+
+@pytest.mark.parametrize("flags", [[], ["--report"]])
+def test_run_type_warnings(tmp_path, capsys, flags: list[str]):
+    code, out, err = run_script(
+        tmp_path, capsys, 'puts("ran"); let f = fn() { true + 1 };', "--engine", "optimized", *flags
+    )
+    assert (code, out) == (0, "ran\n")
+    assert err.splitlines()[-1] == "type warning: type mismatch: BOOLEAN + INTEGER in (true + 1)"
+
+
+def test_run_report(tmp_path, capsys):
+    _, _, err = run_script(tmp_path, capsys, SCRIPT, "--engine", "optimized", "--report")
+    assert "optimize: specialized double(21) as __spec0_double\n" in err
+
+
+def test_run_profile(tmp_path, capsys):
+    profile = tmp_path / "eval.prof"
+    code, _, _ = run_script(tmp_path, capsys, SCRIPT, "--profile", str(profile))
+    assert code == 0
+    functions = {name for _, _, name in pstats.Stats(str(profile)).stats}  # type: ignore
+    assert "evaluate" in functions
+
+
+def test_replay_lexer_parses_like_lexer():
+    program = Parser(ReplayLexer(tokenize(SCRIPT))).parse_program()
+    assert str(program) == str(Parser(Lexer(SCRIPT)).parse_program())
+
+
+def test_run_function_profile(tmp_path, capsys):
+    stacks = tmp_path / "stacks.txt"
+    code, _, err = run_script(tmp_path, capsys, SCRIPT, "--functions", "--flamegraph", str(stacks))
+    assert code == 0
+    assert err.splitlines()[1].split()[0] == "2"
+    assert err.splitlines()[1].split()[-1] == "double@1:20"
+    assert [line.split()[0] for line in stacks.read_text().splitlines()] == ["double@1:20"]
+
+
+def test_run_line_samples(tmp_path, capsys):
+    code, _, err = run_script(tmp_path, capsys, SCRIPT, "--lines")
+    assert code == 0
+    assert err.splitlines()[0].endswith(" samples")
+    assert err.splitlines()[1].endswith("1 | " + SCRIPT)
+
+
+def test_run_parse_stats(tmp_path, capsys):
+    code, out, err = run_script(tmp_path, capsys, SCRIPT, "--parse-stats")
+    assert code == 0
+    assert out == "42\n8\n"
+    assert err.splitlines()[1].split()[-1] == "parse_program"
+
+
+def test_run_budget(tmp_path, capsys):
+    code, _, err = run_script(tmp_path, capsys, "while (true) { 1 }", "--max-steps", "100")
+    assert code == 1
+    assert err == "ERROR: budget exceeded: more than 100 steps\n"
+
+
+@pytest.fixture
+def server_socket(tmp_path):
+    # a server on its own event loop thread, since main runs the client with asyncio.run
+    path = str(tmp_path / "monkey.sock")
+    loop = asyncio.new_event_loop()
+    server = Server(1)
+    loop.run_until_complete(server.start_unix(path))
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    yield path
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.run_until_complete(server.close())
+    loop.close()
+
+
+@pytest.mark.parametrize(
+    "flags, code, expected_out, expected_err",
+    [
+        ([], 0, "42\n8\nnull\n", ""),
+        (["--call", "double", "--args", "[5]"], 0, "42\n8\n10\n", ""),
+        (["--call", "double", "--args", "[true]"], 1, "42\n8\n", "ERROR: type mismatch: BOOLEAN * INTEGER\n"),
+    ],
+)
+def test_send(tmp_path, capsys, server_socket: str, flags: list[str], code: int, expected_out: str, expected_err: str):
+    result = run_script(tmp_path, capsys, SCRIPT, "--socket", server_socket, *flags, command="send")
+    assert result == (code, expected_out, expected_err)
+
+
+def test_send_budget_and_stats(tmp_path, capsys, server_socket: str):
+    code, _, err = run_script(
+        tmp_path, capsys, "while (true) { 1 }", "--socket", server_socket, "--max-steps", "50", command="send"
+    )
+    assert (code, err) == (1, "ERROR: budget exceeded: more than 50 steps\n")
+    assert main(["send", "--stats", "--socket", server_socket]) == 0
+    assert '"outcomes": {"budget": 1}' in capsys.readouterr().out